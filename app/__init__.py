@@ -1,30 +1,73 @@
 import os
 
-from dotenv import load_dotenv
 from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 from config import config
 from .db import init_db
+from .sessions.session_backends import init_sessions
 from logging_config import init_logging
 from .exceptions.errorhandlers import init_errorhandlers
 from .auth.auth_routes import auth
+from .auth.password_service import hasher
+from .auth.user_loader import user_loader
+from .boards.board_acl import board_acl
+from .boards.board_routes import boards
+from .metrics.metrics_routes import metrics
+from .metrics.request_metrics import init_request_metrics
+from .metrics.request_profiler import request_profiler
+from .search.search_backends import card_search
+from .utils.rate_limit import limiter
+
+
+def find_dotenv():
+    # like python-dotenv's lookup: this package's directory and its parents
+    path = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        dotenv_path = os.path.join(path, ".env")
+        if os.path.isfile(dotenv_path):
+            return dotenv_path
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
 
 
 def create_app(config_name=None):
-    # Load environment variables from .env file
-    load_dotenv()
+    # Load environment variables from .env file; python-dotenv is only
+    # imported when there is one
+    dotenv_path = find_dotenv()
+    if dotenv_path:
+        from dotenv import load_dotenv
+        load_dotenv(dotenv_path)
     ENV = os.getenv("ENV")
 
     app = Flask(__name__)
     config_class = config[config_name] if config_name else config[ENV]
     app.config.from_object(config_class)
 
+    # client addresses (as rate limited) from the trusted proxies' header
+    if app.config.get("PROXY_FIX_X_FOR"):
+        app.wsgi_app = ProxyFix(
+            app.wsgi_app, x_for=app.config["PROXY_FIX_X_FOR"])
+
     # Initialize Flask extensions
     init_db(app)
+    init_sessions(app)
     init_logging(app)
     init_errorhandlers(app)
+    init_request_metrics(app)
+    request_profiler.init_app(app)
+    hasher.init_app(app)
+    user_loader.init_app(app)
+    limiter.init_app(app)
+    board_acl.init_app(app)
+    card_search.init_app(app)
 
     # Register blueprints
     app.register_blueprint(auth, url_prefix="/auth")
+    app.register_blueprint(boards, url_prefix="/boards")
+    if app.config.get("METRICS_ENABLED"):
+        app.register_blueprint(metrics)
 
     return app
@@ -1,9 +1,13 @@
 import uuid
 
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import make_transient_to_detached
 from sqlalchemy.sql import func
 
 from app.db import db
-from app.exceptions.custom_exceptions import DatabaseOperationError
+from app.exceptions.custom_exceptions import \
+    DatabaseOperationError, AlreadyExistsError
 
 
 class User(db.Model):
@@ -27,6 +31,24 @@ class User(db.Model):
         self.email = email
         self.password_hash = password_hash
 
+    def to_cache(self):
+        return {attr.key: getattr(self, attr.key)
+                for attr in self.__mapper__.column_attrs}
+
+    @classmethod
+    def from_cache(cls, values):
+        # rebuilt in the current session as if just loaded, without SQL
+        user = cls(values["username"], values["email"],
+                   values["password_hash"])
+        for key, value in values.items():
+            setattr(user, key, value)
+        make_transient_to_detached(user)
+        try:
+            return db.session.merge(user, load=False)
+        except Exception as e:
+            raise DatabaseOperationError(
+                "Error restoring cached user: " + str(e))
+
     @classmethod
     def get_by_id(cls, id):
         try:
@@ -51,13 +73,46 @@ class User(db.Model):
             raise DatabaseOperationError(
                 "Error getting user by email: " + str(e))
 
+    @classmethod
+    def get_taken_fields(cls, username, email):
+        # one indexed lookup for both unique columns, without loading rows
+        try:
+            rows = db.session.execute(
+                select(cls.username, cls.email)
+                .where(or_(cls.username == username, cls.email == email))
+                .limit(2)).all()
+        except Exception as e:
+            raise DatabaseOperationError(
+                "Error checking username and email: " + str(e))
+
+        taken = set()
+        for row in rows:
+            if row.username == username:
+                taken.add("username")
+            if row.email == email:
+                taken.add("email")
+        return taken
+
     @classmethod
     def create(cls, username, email, password_hash):
         user = cls(username, email, password_hash)
         try:
             db.session.add(user)
             db.session.commit()
+        except IntegrityError:
+            # lost a race with a concurrent signup for the same name
+            db.session.rollback()
+            raise AlreadyExistsError()
         except Exception as e:
             db.session.rollback()
             raise DatabaseOperationError(
                 "Error creating user: " + str(e))
+
+    def update_password_hash(self, password_hash):
+        self.password_hash = password_hash
+        try:
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseOperationError(
+                "Error updating password hash: " + str(e))
@@ -2,9 +2,11 @@ from flask import Blueprint, jsonify, session, g
 
 from .register_service import create_user
 from .login_service import login_user
+from .user_loader import current_user
 from app.exceptions.custom_exceptions import \
-    UserActionError, InternalServerError
+    UserActionError, UnauthorizedError, InternalServerError
 from app.utils.auth_utils import login_required
+from app.utils.rate_limit import rate_limited
 from app.utils.request_utils import require_json_content
 
 
@@ -25,6 +27,7 @@ def register():
 
 
 @auth.route("/login", methods=["POST"])
+@rate_limited("login_ip", "LOGIN_IP_RATE_LIMIT")
 @require_json_content
 def login():
     if session.get("id"):
@@ -47,3 +50,18 @@ def logout():
             "message": "You have been logged out."}), 200
     except Exception as e:
         raise InternalServerError("Error logging out: " + str(e))
+
+
+@auth.route("/me", methods=["GET"])
+@login_required
+def me():
+    # the account may have been deleted since the session was created
+    if not current_user:
+        raise UnauthorizedError("Please log in to access this resource.")
+
+    return jsonify({
+        "status": 200,
+        "user": {
+            "username": current_user.username,
+            "email": current_user.email
+        }}), 200
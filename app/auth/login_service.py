@@ -1,12 +1,31 @@
-import re
-import bcrypt
-
-from flask import session
+from flask import session, current_app
+from werkzeug.exceptions import ServiceUnavailable
 
 from app.auth.auth_models import User
-from app.utils.regexes import RE_EMAIL_VALIDATION
+from app.auth.password_service import hasher
+from app.utils.rate_limit import limiter
+from app.utils.validators import is_valid_email
 from app.exceptions.custom_exceptions import \
-    UserActionError, ValidationError, PasswordMismatchError, NotFoundError
+    UserActionError, ValidationError, PasswordMismatchError, NotFoundError, \
+    DatabaseOperationError
+
+
+def check_password(user, password):
+    if not hasher.check_password(password, user.password_hash):
+        raise PasswordMismatchError(
+            "The provided password is incorrect. Please try again.")
+
+    # upgrade hashes created with an older (cheaper) bcrypt cost
+    if hasher.needs_rehash(user.password_hash):
+        try:
+            user.update_password_hash(hasher.hash_password(password))
+        except ServiceUnavailable:
+            # the hashing pool is saturated; the password is verified, so
+            # the upgrade waits for a later login
+            pass
+        except DatabaseOperationError as e:
+            current_app.logger.warning(
+                f"Could not rehash password for user {user.id}: {e}")
 
 
 def validate_login(username=None, email=None, password=None):
@@ -19,16 +38,14 @@ def validate_login(username=None, email=None, password=None):
                 "The provided username does not exist. "
                 "Please check your spelling or consider registering.")
         # password check
-        if not bcrypt.checkpw(password.encode("utf-8"), user.password_hash):
-            raise PasswordMismatchError(
-                "The provided password is incorrect. Please try again.")
+        check_password(user, password)
 
         return user
 
     # check if user logged in with email
     elif email and password:
         # email validation
-        if not re.search(RE_EMAIL_VALIDATION, email):
+        if not is_valid_email(email):
             raise ValidationError("The provided email address is not valid. "
                                   "Please enter a valid email address.")
         # check if email exists
@@ -38,9 +55,7 @@ def validate_login(username=None, email=None, password=None):
                 "The provided email does not exist. "
                 "Please check your spelling or consider registering.")
         # password check
-        if not bcrypt.checkpw(password.encode("utf-8"), user.password_hash):
-            raise PasswordMismatchError(
-                "The provided password is incorrect. Please try again.")
+        check_password(user, password)
 
         return user
 
@@ -68,7 +83,22 @@ def login_user(req_data):
         username = login_identifier
         email = None
 
-    user = validate_login(username, email, password)
+    # throttle failed attempts per account before any lookup or hashing;
+    # the token is taken up front, so a burst of concurrent attempts
+    # cannot all pass before any is counted, and is given back unless
+    # the attempt fails
+    throttle_key = login_identifier.lower()
+    failed_limit = current_app.config["LOGIN_FAILED_RATE_LIMIT"]
+    limiter.hit("login_failed", throttle_key, failed_limit)
+    failed = False
+    try:
+        user = validate_login(username, email, password)
+    except (NotFoundError, PasswordMismatchError):
+        failed = True
+        raise
+    finally:
+        if not failed:
+            limiter.refund("login_failed", throttle_key, failed_limit)
 
     session["id"] = user.id
     session["username"] = user.username
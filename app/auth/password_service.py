@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+from concurrent.futures import BrokenExecutor
+
+import bcrypt
+from werkzeug.exceptions import ServiceUnavailable
+
+from app.metrics.request_metrics import record_phase
+from app.utils.metrics import registry
+
+
+MAX_ROUNDS = 31
+
+password_hash_seconds = registry.histogram(
+    "password_hash_seconds",
+    "Time spent hashing or verifying passwords, including pool wait.")
+password_hash_rejected = registry.counter(
+    "password_hash_rejected_total",
+    "Password hashing calls rejected because the pool was saturated.")
+
+
+# module-level so they can be pickled into the worker processes
+def _hashpw(password, salt):
+    return bcrypt.hashpw(password, salt)
+
+
+def _checkpw(password, password_hash):
+    return bcrypt.checkpw(password, password_hash)
+
+
+def _time_hash(rounds):
+    start = time.perf_counter()
+    bcrypt.hashpw(b"calibration-password", bcrypt.gensalt(rounds))
+    return time.perf_counter() - start
+
+
+def get_rounds(password_hash):
+    # bcrypt hashes look like $2b$<rounds>$<salt+digest>
+    if isinstance(password_hash, str):
+        password_hash = password_hash.encode("utf-8")
+    return int(password_hash.split(b"$")[2])
+
+
+def calibrate_rounds(target_seconds, min_rounds=4):
+    rounds = min_rounds
+    elapsed = _time_hash(rounds)
+    # every extra round doubles the cost, so stop before overshooting
+    while rounds < MAX_ROUNDS and elapsed * 2 <= target_seconds:
+        rounds += 1
+        elapsed = _time_hash(rounds)
+    if elapsed > target_seconds and rounds > min_rounds:
+        rounds -= 1
+    return rounds
+
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded process pool (inline when workers is 0)"""
+
+    def __init__(self, app=None):
+        self.workers = 0
+        self.max_pending = 0
+        self.rounds = 12
+        self._slots = threading.BoundedSemaphore(1)
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("PASSWORD_HASH_WORKERS", 0)
+        app.config.setdefault("PASSWORD_HASH_MAX_PENDING", 16)
+        app.config.setdefault("BCRYPT_ROUNDS", 12)
+        app.config.setdefault("BCRYPT_CALIBRATE", False)
+        app.config.setdefault("BCRYPT_TARGET_MS", 250)
+
+        self.shutdown()
+        self.workers = app.config["PASSWORD_HASH_WORKERS"]
+        self.max_pending = app.config["PASSWORD_HASH_MAX_PENDING"]
+        self._slots = threading.BoundedSemaphore(
+            max(self.workers, 1) + self.max_pending)
+
+        self.rounds = app.config["BCRYPT_ROUNDS"]
+        if app.config["BCRYPT_CALIBRATE"]:
+            # the configured cost acts as a floor for the calibration
+            self.rounds = calibrate_rounds(
+                app.config["BCRYPT_TARGET_MS"] / 1000, self.rounds)
+            app.logger.info(
+                f"Calibrated bcrypt cost to {self.rounds} rounds")
+        app.extensions["password_hasher"] = self
+
+    def hash_password(self, password):
+        return self._run(
+            "hash", _hashpw, password.encode("utf-8"),
+            bcrypt.gensalt(self.rounds))
+
+    def check_password(self, password, password_hash):
+        return self._run(
+            "check", _checkpw, password.encode("utf-8"), password_hash)
+
+    def needs_rehash(self, password_hash):
+        # only upgrade, so hosts calibrated to different costs
+        # do not keep rehashing each other's hashes
+        return get_rounds(password_hash) < self.rounds
+
+    def _run(self, operation, func, *args):
+        if not self._slots.acquire(blocking=False):
+            password_hash_rejected.inc(operation=operation)
+            raise ServiceUnavailable()
+
+        start = time.perf_counter()
+        try:
+            if self.workers:
+                return self._submit(func, *args)
+            return func(*args)
+        finally:
+            self._slots.release()
+            elapsed = time.perf_counter() - start
+            password_hash_seconds.observe(elapsed, operation=operation)
+            record_phase("bcrypt", elapsed)
+
+    def _submit(self, func, *args):
+        executor = self._get_executor()
+        try:
+            return executor.submit(func, *args).result()
+        except BrokenExecutor:
+            # a worker died (e.g. OOM killed), which breaks the whole
+            # pool, so it is replaced and the call retried once
+            self._discard_executor(executor)
+            return self._get_executor().submit(func, *args).result()
+
+    def _discard_executor(self, executor):
+        with self._lock:
+            # other threads may have replaced it already
+            if self._executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                self._executor_pid = None
+
+    def _get_executor(self):
+        with self._lock:
+            # a pool inherited through fork (e.g. gunicorn --preload)
+            # is unusable, so each process lazily starts its own
+            if self._executor is None or self._executor_pid != os.getpid():
+                # imported here, as multiprocessing is slow to import and
+                # only needed once the first password is hashed
+                from concurrent.futures import ProcessPoolExecutor
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers)
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def shutdown(self):
+        with self._lock:
+            if (self._executor is not None
+                    and self._executor_pid == os.getpid()):
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._executor_pid = None
+
+
+hasher = PasswordHasher()
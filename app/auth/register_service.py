@@ -1,11 +1,9 @@
-import re
-import bcrypt
-
 from app.auth.auth_models import User
+from app.auth.password_service import hasher
 from app.exceptions.custom_exceptions import \
     ValidationError, UserActionError, AlreadyExistsError
-from app.utils.regexes import \
-    RE_USERNAME_VALIDATION, RE_EMAIL_VALIDATION, RE_PASSWORD_VALIDATION
+from app.utils.validators import \
+    is_valid_username, is_valid_email, is_valid_password
 
 
 def validate_registration(username, email, password, confirm_password):
@@ -17,29 +15,15 @@ def validate_registration(username, email, password, confirm_password):
     if len(username) < 3:
         raise ValidationError(
             "The username must be at least 3 characters long.")
-    if not re.search(RE_USERNAME_VALIDATION, username):
+    if not is_valid_username(username):
         raise ValidationError(
             "The username can only include letters, "
             "numbers, underscores, and periods.")
-    # check if username exists
-    user = User.get_by_username(username)
-    if user:
-        raise AlreadyExistsError(
-            "The provided username is already in use. "
-            "Please try a different one.")
-
     # email validation
-    if not re.search(RE_EMAIL_VALIDATION, email):
+    if not is_valid_email(email):
         raise ValidationError(
             "The provided email address is not valid. "
             "Please enter a valid email address.")
-    # check if email exists
-    user = User.get_by_email(email)
-    if user:
-        raise AlreadyExistsError(
-            "The provided email is already in use. If you forgot "
-            "your password, please use the password reset function.")
-
     # password validation
     if password != confirm_password:
         raise ValidationError(
@@ -48,11 +32,22 @@ def validate_registration(username, email, password, confirm_password):
     if len(password) < 8:
         raise ValidationError(
             "The password must be at least 8 characters long.")
-    if not re.search(RE_PASSWORD_VALIDATION, password):
+    if not is_valid_password(password):
         raise ValidationError(
             "The password must contain at least one uppercase letter, "
             "one lowercase letter, and one number.")
 
+    # check if username or email exists
+    taken = User.get_taken_fields(username, email)
+    if "username" in taken:
+        raise AlreadyExistsError(
+            "The provided username is already in use. "
+            "Please try a different one.")
+    if "email" in taken:
+        raise AlreadyExistsError(
+            "The provided email is already in use. If you forgot "
+            "your password, please use the password reset function.")
+
 
 def create_user(req_data):
     if not req_data:
@@ -75,9 +70,7 @@ def create_user(req_data):
 
     validate_registration(username, email, password, confirm_password)
 
-    password_hash = bcrypt.hashpw(
-        password.encode("utf-8"),
-        bcrypt.gensalt())
+    password_hash = hasher.hash_password(password)
 
     User.create(username, email, password_hash)
 
@@ -0,0 +1,89 @@
+import time
+
+from flask import g, session
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from werkzeug.local import LocalProxy
+
+from app.auth.auth_models import User
+from app.utils.metrics import registry
+from app.utils.ttl_cache import TTLCache
+
+
+user_cache_hits = registry.counter(
+    "user_cache_hits_total",
+    "Logged in users loaded from the process cache.")
+user_cache_misses = registry.counter(
+    "user_cache_misses_total",
+    "Logged in users loaded from the database.")
+
+
+class UserLoader:
+    """Loads the logged in user once per request, optionally through a
+    short-lived process cache keyed by user id"""
+
+    def __init__(self, app=None):
+        self.ttl = 0
+        self.cache = None
+        # entries are dropped once an update to the user commits, so a
+        # request racing the update cannot cache the old row again
+        event.listen(User, "after_update", self._after_update)
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_rollback", self._after_rollback)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("USER_CACHE_SIZE", 10000)
+        # 0 disables the cache, leaving only the per-request memo
+        app.config.setdefault("USER_CACHE_TTL", 10)
+
+        self.ttl = app.config["USER_CACHE_TTL"]
+        self.cache = TTLCache(app.config["USER_CACHE_SIZE"])
+        app.extensions["user_loader"] = self
+
+    def load(self, user_id):
+        if not self.ttl:
+            return User.get_by_id(user_id)
+        values = self.cache.get(user_id)
+        if values is not None:
+            user_cache_hits.inc()
+            return User.from_cache(values)
+        user_cache_misses.inc()
+        user = User.get_by_id(user_id)
+        if user:
+            self.cache.set(user_id, user.to_cache(), time.time() + self.ttl)
+        return user
+
+    def invalidate(self, user_id):
+        if self.cache is not None:
+            self.cache.delete(user_id)
+
+    def _after_update(self, mapper, connection, target):
+        session = Session.object_session(target)
+        if session is not None:
+            session.info.setdefault("updated_user_ids", set()).add(target.id)
+
+    def _after_commit(self, session):
+        for user_id in session.info.pop("updated_user_ids", ()):
+            self.invalidate(user_id)
+
+    def _after_rollback(self, session):
+        session.info.pop("updated_user_ids", None)
+
+
+user_loader = UserLoader()
+
+
+def get_current_user():
+    """Return the logged in user, or None, loading it at most once per
+    request."""
+    user_id = session.get("id")
+    # keyed by id, as logging in or out changes the user mid-request
+    if g.get("current_user_id", False) != user_id:
+        g.current_user = user_loader.load(user_id) if user_id else None
+        g.current_user_id = user_id
+    return g.current_user
+
+
+current_user = LocalProxy(get_current_user)
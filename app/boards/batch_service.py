@@ -0,0 +1,381 @@
+import uuid
+
+from app.boards.board_models import BoardColumn, Card
+from app.boards.board_service import \
+    RANK_MAX_LENGTH, get_board_by_id, publish_board_event, validate_name
+from app.exceptions.custom_exceptions import \
+    ClientError, NotFoundError, UserActionError, ValidationError
+from app.utils.ranking import rank_after, rank_between, rank_range
+
+
+BATCH_MAX_OPERATIONS = 500
+BATCH_OPERATIONS = ("create", "update", "move", "archive")
+BATCH_CHANGE_OPS = {"update": "updated", "move": "moved",
+                    "archive": "archived"}
+
+
+def validate_description(description):
+    if not isinstance(description, str):
+        raise ValidationError("The card description must be text.")
+
+
+def is_known(id, ids):
+    # ids come from JSON, so anything but a string cannot match
+    return isinstance(id, str) and id in ids
+
+
+def validate_operation(op, column_ids, positions, seen_card_ids):
+    if not isinstance(op, dict) or op.get("op") not in BATCH_OPERATIONS:
+        raise ValidationError(
+            "Each operation must be one of create, update, move "
+            "or archive.")
+
+    if op["op"] == "create":
+        if not is_known(op.get("column_id"), column_ids):
+            raise NotFoundError("The requested column does not exist.")
+        validate_name(op.get("title"), "card title", 256)
+        validate_description(op.get("description") or "")
+        validate_neighbours(op, positions)
+        return
+
+    card_id = op.get("card_id")
+    if not is_known(card_id, positions):
+        raise NotFoundError("The requested card does not exist.")
+    if card_id in seen_card_ids:
+        raise ValidationError(
+            "A card can only appear in one operation per batch.")
+    seen_card_ids.add(card_id)
+
+    if op["op"] == "update":
+        if "title" not in op and "description" not in op:
+            raise UserActionError(
+                "Please provide a new title or description.")
+        if "title" in op:
+            validate_name(op["title"], "card title", 256)
+        if "description" in op:
+            validate_description(op["description"])
+    elif op["op"] == "move":
+        column_id = op.get("column_id") or positions[card_id].column_id
+        if not is_known(column_id, column_ids):
+            raise NotFoundError("The requested column does not exist.")
+        validate_neighbours(op, positions)
+
+
+def validate_neighbours(op, positions):
+    # whether they are in the target column is checked while planning
+    for key in ("prev_card_id", "next_card_id"):
+        if op.get(key) and not is_known(op[key], positions):
+            raise ValidationError(
+                "The cards to place this card between "
+                "must be other cards in the target column.")
+
+
+def validate_operations(board, operations):
+    if not isinstance(operations, list) or not operations:
+        raise UserActionError("Please provide a list of operations.")
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        raise ValidationError(
+            f"A batch can have at most {BATCH_MAX_OPERATIONS} operations.")
+
+    # everything the batch refers to, read in two queries
+    column_ids = {row.id for row in BoardColumn.get_rows_for_board(board.id)}
+    card_ids = list({
+        op.get(key) for op in operations if isinstance(op, dict)
+        for key in ("card_id", "prev_card_id", "next_card_id")
+        if isinstance(op.get(key), str)})
+    positions = Card.get_batch_positions(board.id, card_ids) \
+        if card_ids else {}
+
+    seen_card_ids = set()
+    for index, op in enumerate(operations):
+        try:
+            validate_operation(op, column_ids, positions, seen_card_ids)
+        except ClientError as e:
+            # same error type and status, pointing at the operation
+            e.message = f"Operation {index + 1}: {e.message}"
+            e.args = (e.message,)
+            raise
+    return positions
+
+
+# the low/high fixed rank of a card the batch has not placed yet
+UNKNOWN = object()
+
+
+class Slot:
+    """Where a card sits while a batch is planned. Cards the batch
+    places (or is about to move) also know the ranks of the cards left
+    in place around them, which bound their final rank."""
+
+    __slots__ = ("column_id", "rank", "fixed", "low", "high")
+
+    def __init__(self, column_id, rank, fixed, low=UNKNOWN, high=UNKNOWN):
+        self.column_id = column_id
+        self.rank = rank
+        self.fixed = fixed
+        self.low = low
+        self.high = high
+
+
+class RankPlanner:
+    """Places each create/move against the columns as the operations
+    before it left them, like applying them one at a time would.
+
+    Cards the batch places get a provisional rank first. Once every
+    operation is placed, the cards between each pair of cards left in
+    place are given short, evenly spread ranks in their planned order.
+    """
+
+    def __init__(self, operations, positions):
+        self.positions = positions
+        self.moved_ids = [op["card_id"] for op in operations
+                          if op["op"] == "move"]
+        self.slots = {}
+        # per column, the slots of cards placed or still to be moved
+        self.placed = {}
+        for card_id in self.moved_ids:
+            position = positions[card_id]
+            self._add(card_id, Slot(position.column_id, position.rank,
+                                    fixed=False))
+        self.last_ranks = Card.get_last_ranks(
+            {op.get("column_id") or positions[op["card_id"]].column_id
+             for op in operations if op["op"] in ("create", "move")},
+            self.moved_ids)
+        self.new_slots = {}
+        self.crowded = set()
+
+    def _add(self, card_id, slot):
+        self.slots[card_id] = slot
+        self.placed.setdefault(slot.column_id, []).append(slot)
+
+    def remove(self, card_id):
+        slot = self.get_slot(card_id)
+        if not slot.fixed:
+            self.placed[slot.column_id].remove(slot)
+        self.slots[card_id] = None
+
+    def get_slot(self, card_id):
+        if card_id not in self.slots and is_known(card_id, self.positions):
+            position = self.positions[card_id]
+            self.slots[card_id] = Slot(
+                position.column_id, position.rank, fixed=True)
+        return self.slots.get(card_id)
+
+    def _fixed_neighbour(self, slot, after):
+        # the nearest rank of a card the batch leaves where it is
+        if not slot.fixed:
+            rank = slot.high if after else slot.low
+            if rank is not UNKNOWN:
+                return rank
+        rank = Card.get_adjacent_rank(
+            slot.column_id, slot.rank, after=after,
+            exclude_ids=self.moved_ids)
+        if not slot.fixed:
+            if after:
+                slot.high = rank
+            else:
+                slot.low = rank
+        return rank
+
+    def _bounds(self, slot):
+        # the fixed ranks at or around a slot
+        if slot.fixed:
+            return slot.rank, slot.rank
+        return (self._fixed_neighbour(slot, after=False),
+                self._fixed_neighbour(slot, after=True))
+
+    def _placed_between(self, column_id, low, high):
+        return [slot.rank for slot in self.placed.get(column_id, ())
+                if (low is None or slot.rank > low)
+                and (high is None or slot.rank < high)]
+
+    def _new_slot(self, column_id, prev_rank, next_rank, low, high):
+        if prev_rank is not None and next_rank is not None \
+                and prev_rank >= next_rank:
+            # two cards share a rank (concurrent moves), so respace
+            self.crowded.add(column_id)
+            return None
+        rank = rank_between(prev_rank, next_rank) \
+            if next_rank is not None else rank_after(prev_rank)
+        return Slot(column_id, rank, fixed=False, low=low, high=high)
+
+    def _after(self, column_id, prev):
+        # right after prev, before anything placed there already
+        low = self._bounds(prev)[0]
+        high = self._fixed_neighbour(prev, after=True)
+        placed = self._placed_between(column_id, prev.rank, high)
+        return self._new_slot(column_id, prev.rank,
+                              min(placed, default=high), low, high)
+
+    def _before(self, column_id, next):
+        # right before next, after anything placed there already
+        low = self._fixed_neighbour(next, after=False)
+        high = self._bounds(next)[1]
+        placed = self._placed_between(column_id, low, next.rank)
+        return self._new_slot(column_id, max(placed, default=low),
+                              next.rank, low, high)
+
+    def _last(self, column_id):
+        low = self.last_ranks.get(column_id)
+        placed = self._placed_between(column_id, low, None)
+        return self._new_slot(
+            column_id, max(placed, default=low), None, low, None)
+
+    def _neighbour(self, op, key, column_id):
+        neighbour_id = op.get(key)
+        if not neighbour_id:
+            return None
+        slot = self.get_slot(neighbour_id) \
+            if neighbour_id != op.get("card_id") else None
+        if slot is None or slot.column_id != column_id:
+            raise ValidationError(
+                "The cards to place this card between "
+                "must be other cards in the target column.")
+        return slot
+
+    def place(self, index, op):
+        card_id = op.get("card_id")
+        column_id = op.get("column_id") or self.slots[card_id].column_id
+        prev = self._neighbour(op, "prev_card_id", column_id)
+        next = self._neighbour(op, "next_card_id", column_id)
+        if prev and next and prev.rank >= next.rank:
+            if prev.rank > next.rank:
+                raise ValidationError(
+                    "The previous card must come before the next card.")
+            # two cards share a rank (concurrent moves), so respace
+            self.crowded.add(column_id)
+            return
+        if card_id:
+            # the card no longer bounds its own new place
+            self.remove(card_id)
+
+        if next:
+            slot = self._before(column_id, next)
+        elif prev:
+            slot = self._after(column_id, prev)
+        else:
+            slot = self._last(column_id)
+        if slot is None:
+            return
+        if card_id:
+            self._add(card_id, slot)
+        else:
+            self.placed.setdefault(column_id, []).append(slot)
+        self.new_slots[index] = slot
+
+    def ranks(self):
+        # cards placed between the same two fixed cards, in planned order
+        gaps = {}
+        for index, slot in self.new_slots.items():
+            gaps.setdefault((slot.column_id, slot.low, slot.high), []) \
+                .append((slot.rank, index))
+
+        ranks = {}
+        for (column_id, low, high), members in gaps.items():
+            members.sort()
+            if low is not None and high is not None and low >= high:
+                self.crowded.add(column_id)
+                continue
+            if high is None:
+                # appends: short keys that barely grow
+                gap_ranks = [rank_after(low)]
+                while len(gap_ranks) < len(members):
+                    gap_ranks.append(rank_after(gap_ranks[-1]))
+            else:
+                gap_ranks = rank_range(low, high, len(members))
+            if len(gap_ranks[-1]) > RANK_MAX_LENGTH:
+                self.crowded.add(column_id)
+            ranks.update(zip((index for _, index in members), gap_ranks))
+        return ranks
+
+
+def plan_ranks(operations, positions):
+    """Return the new rank of every create/move, by operation index.
+
+    Operations are planned in order, each against the state the ones
+    before it left. Columns whose keys would grow too long, or that hold
+    cards sharing a rank, are returned for a rebalance.
+    """
+    planner = RankPlanner(operations, positions)
+    for index, op in enumerate(operations):
+        try:
+            if op["op"] in ("create", "move"):
+                planner.place(index, op)
+            elif op["op"] == "archive":
+                # archived cards can no longer be placed next to
+                planner.remove(op["card_id"])
+        except ClientError as e:
+            e.message = f"Operation {index + 1}: {e.message}"
+            e.args = (e.message,)
+            raise
+    return planner.ranks(), planner.crowded
+
+
+def get_card_update(op, position, ranks, index):
+    # only the columns the operation changes, so concurrent writes to the
+    # others are kept and moves leave the search index alone
+    if op["op"] == "update":
+        changed = {field: op[field] for field in ("title", "description")
+                   if field in op}
+    elif op["op"] == "move":
+        changed = {"column_id": op.get("column_id") or position.column_id,
+                   "rank": ranks[index]}
+    else:
+        changed = {"archived": True}
+    return {"id": op["card_id"], **changed}
+
+
+def apply_operations(board, operations, positions, ranks):
+    new_cards, changes, results = [], [], []
+    # one executemany per set of changed columns
+    card_updates = {}
+    for index, op in enumerate(operations):
+        if op["op"] == "create":
+            card = {"id": str(uuid.uuid4()),
+                    "column_id": op["column_id"],
+                    "title": op["title"],
+                    "description": op.get("description") or "",
+                    "rank": ranks[index]}
+            new_cards.append({"board_id": board.id, **card})
+            changes.append(("card", card["id"], "created"))
+        else:
+            card = get_card_update(
+                op, positions[op["card_id"]], ranks, index)
+            card_updates.setdefault(tuple(card), []).append(card)
+            changes.append(("card", card["id"], BATCH_CHANGE_OPS[op["op"]]))
+        results.append({"op": op["op"], "card": card})
+
+    Card.apply_batch(
+        board.id, new_cards, list(card_updates.values()), changes)
+    return results
+
+
+def batch_cards(board_id, req_data):
+    board = get_board_by_id(board_id)
+    operations = req_data.get("operations") \
+        if isinstance(req_data, dict) else None
+
+    # nothing is written unless every operation is valid
+    positions = validate_operations(board, operations)
+    ranks, crowded = plan_ranks(operations, positions)
+    if crowded:
+        # rare: renumber the crowded columns once, then plan again
+        for column_id in crowded:
+            Card.rebalance(board.id, column_id)
+            publish_board_event(
+                board, "column.rebalanced", column_id=column_id)
+        positions = validate_operations(board, operations)
+        ranks, crowded = plan_ranks(operations, positions)
+        if crowded:
+            raise ValidationError(
+                "Too many cards are placed in the same spot. "
+                "Please split the batch.")
+
+    results = apply_operations(board, operations, positions, ranks)
+    publish_board_event(board, "cards.batch", results=results)
+
+    return {
+        "status": 200,
+        "message": "Batch applied.",
+        "results": results
+    }
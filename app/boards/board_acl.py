@@ -0,0 +1,70 @@
+import time
+
+from app.boards.board_models import BoardMember
+from app.utils.metrics import registry
+from app.utils.ttl_cache import TTLCache
+
+
+# each role can do everything the roles before it can
+BOARD_ROLES = ("viewer", "editor", "owner")
+
+board_acl_cache_hits = registry.counter(
+    "board_acl_cache_hits_total",
+    "Board permission checks answered from the ACL cache.")
+board_acl_cache_misses = registry.counter(
+    "board_acl_cache_misses_total",
+    "Board permission checks that loaded the user's roles.")
+
+
+def role_allows(role, required_role):
+    return role is not None and \
+        BOARD_ROLES.index(role) >= BOARD_ROLES.index(required_role)
+
+
+class BoardAcl:
+    """Per-user board roles, cached so checks skip the database"""
+
+    def __init__(self, app=None):
+        self.ttl = None
+        self.cache = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("BOARD_ACL_CACHE_SIZE", 10000)
+        app.config.setdefault("BOARD_ACL_CACHE_TTL", 30)
+
+        self.ttl = app.config["BOARD_ACL_CACHE_TTL"]
+        self.cache = TTLCache(app.config["BOARD_ACL_CACHE_SIZE"])
+        app.extensions["board_acl"] = self
+
+    def _load_roles(self, user_id):
+        """Load and cache the user's roles by board id."""
+        board_acl_cache_misses.inc()
+        # every board of the user in one query, so checks on their other
+        # boards are hits too
+        roles = BoardMember.get_roles_for_user(user_id)
+        self.cache.set(user_id, roles, time.time() + self.ttl)
+        return roles
+
+    def get_role(self, user_id, board_id):
+        roles = self.cache.get(user_id)
+        if roles is not None and board_id in roles:
+            board_acl_cache_hits.inc()
+            return roles[board_id]
+        # a board missing from the cached roles may have been granted
+        # since, in any process, so grants apply at once and only
+        # removals wait for the TTL
+        return self._load_roles(user_id).get(board_id)
+
+    def invalidate(self, user_id):
+        """Drop the user's cached roles after their membership changed.
+
+        Only this process's cache is cleared; other processes see new
+        boards at once, but removals only within BOARD_ACL_CACHE_TTL
+        seconds.
+        """
+        self.cache.delete(user_id)
+
+
+board_acl = BoardAcl()
@@ -0,0 +1,540 @@
+import uuid
+
+from flask import current_app
+from sqlalchemy import case, delete, insert, select, update
+from sqlalchemy.sql import func
+
+from app.auth.auth_models import User
+from app.db import db
+from app.exceptions.custom_exceptions import DatabaseOperationError
+from app.utils.pagination import paginate
+from app.utils.ranking import rank_sequence
+
+
+# rank keys must compare bytewise, not with a locale-aware collation
+RankKey = db.String(64).with_variant(
+    db.String(64, collation="C"), "postgresql")
+
+
+class Board(db.Model):
+    __tablename__ = "boards"
+
+    id = db.Column(db.String(64), primary_key=True, nullable=False)
+    name = db.Column(db.String(128), nullable=False)
+    owner_id = db.Column(db.String(64), db.ForeignKey("users.id"),
+                         nullable=False)
+    # bumped by every column/card write, served as the board's ETag
+    version = db.Column(db.Integer, nullable=False, default=0)
+    # oldest version the change log can still bring a client up from
+    changes_floor = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=func.now())
+    updated_at = db.Column(db.DateTime, default=func.now(),
+                           onupdate=func.now())
+
+    def __repr__(self):
+        return f"<Board {self.name}>"
+
+    def __init__(self, name, owner_id):
+        self.id = str(uuid.uuid4())
+        self.name = name
+        self.owner_id = owner_id
+
+    def to_dict(self):
+        return {"id": self.id, "name": self.name, "version": self.version}
+
+    @classmethod
+    def record_changes(cls, board_id, changes):
+        # Runs inside the caller's transaction, so the new version and its
+        # change log entries commit (or roll back) with the change itself.
+        retention = current_app.config["BOARD_CHANGES_RETENTION"]
+        new_floor = cls.version + 1 - retention
+        db.session.execute(
+            update(cls)
+            .where(cls.id == board_id)
+            .values(version=cls.version + 1,
+                    changes_floor=case(
+                        (new_floor > cls.changes_floor, new_floor),
+                        else_=cls.changes_floor)))
+        version = select(cls.version).where(cls.id == board_id)
+        db.session.execute(
+            insert(BoardChange).values(version=version.scalar_subquery()),
+            [{"board_id": board_id, "entity": entity,
+              "entity_id": entity_id, "op": op}
+             for entity, entity_id, op in changes])
+        # compaction: entries at or below the floor are never served
+        floor = select(cls.changes_floor).where(cls.id == board_id)
+        db.session.execute(
+            delete(BoardChange)
+            .where(BoardChange.board_id == board_id,
+                   BoardChange.version <= floor.scalar_subquery()))
+
+    @classmethod
+    def get_by_id(cls, id):
+        try:
+            return db.session.get(cls, id)
+        except Exception as e:
+            raise DatabaseOperationError(
+                "Error getting board by ID: " + str(e))
+
+    @classmethod
+    def get_page_for_member(cls, user_id, cursor, limit):
+        # walks the member's boards in the (user_id, board_name, board_id)
+        # index; only the page's own boards are looked up for the version
+        return paginate(
+            select(BoardMember.board_id, BoardMember.board_name, cls.version)
+            .join(cls, cls.id == BoardMember.board_id)
+            .where(BoardMember.user_id == user_id),
+            (BoardMember.board_name, BoardMember.board_id), cursor, limit)
+
+    @classmethod
+    def create(cls, name, owner_id):
+        board = cls(name, owner_id)
+        try:
+            db.session.add(board)
+            # flushed first, as the membership references the board
+            db.session.flush()
+            db.session.add(
+                BoardMember(board.id, owner_id, "owner", board.name))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseOperationError(
+                "Error creating board: " + str(e))
+        return board
+
+
+class BoardMember(db.Model):
+    __tablename__ = "board_members"
+    __table_args__ = (
+        # a user's roles are read in one index-only scan
+        db.Index("ix_board_members_user_id_board_id_role",
+                 "user_id", "board_id", "role"),
+        # the board list pages through this without sorting
+        db.Index("ix_board_members_user_id_board_name_board_id",
+                 "user_id", "board_name", "board_id"),
+    )
+
+    board_id = db.Column(db.String(64), db.ForeignKey("boards.id"),
+                         primary_key=True, nullable=False)
+    user_id = db.Column(db.String(64), db.ForeignKey("users.id"),
+                        primary_key=True, nullable=False)
+    # viewer, editor or owner
+    role = db.Column(db.String(16), nullable=False)
+    # denormalized from the board so the board list is sorted by index
+    board_name = db.Column(db.String(128), nullable=False)
+    created_at = db.Column(db.DateTime, default=func.now())
+
+    def __repr__(self):
+        return f"<BoardMember {self.user_id} {self.role}>"
+
+    def __init__(self, board_id, user_id, role, board_name):
+        self.board_id = board_id
+        self.user_id = user_id
+        self.role = role
+        self.board_name = board_name
+
+    @classmethod
+    def get_roles_for_user(cls, user_id):
+        try:
+            return dict(db.session.execute(
+                select(cls.board_id, cls.role)
+                .where(cls.user_id == user_id)).all())
+        except Exception as e:
+            raise DatabaseOperationError(
+                "Error getting board roles: " + str(e))
+
+    @classmethod
+    def get_page_for_board(cls, board_id, cursor, limit):
+        # walks the (board_id, user_id) primary key; usernames are only
+        # looked up for the page's own members
+        return paginate(
+            select(cls.user_id, User.username, cls.role)
+            .join(User, User.id == cls.user_id)
+            .where(cls.board_id == board_id),
+            (cls.user_id,), cursor, limit)
+
+    @classmethod
+    def set_role(cls, board, user_id, role):
+        try:
+            member = db.session.get(cls, (board.id, user_id))
+            if member is None:
+                db.session.add(cls(board.id, user_id, role, board.name))
+            else:
+                member.role = role
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseOperationError(
+                "Error setting board member role: " + str(e))
+
+    @classmethod
+    def remove(cls, board_id, user_id):
+        try:
+            removed = db.session.execute(
+                delete(cls)
+                .where(cls.board_id == board_id, cls.user_id == user_id)
+            ).rowcount
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseOperationError(
+                "Error removing board member: " + str(e))
+        return removed > 0
+
+
+class BoardColumn(db.Model):
+    __tablename__ = "board_columns"
+    __table_args__ = (
+        db.Index("ix_board_columns_board_id_rank", "board_id", "rank"),
+    )
+
+    id = db.Column(db.String(64), primary_key=True, nullable=False)
+    board_id = db.Column(db.String(64), db.ForeignKey("boards.id"),
+                         nullable=False)
+    name = db.Column(db.String(128), nullable=False)
+    rank = db.Column(RankKey, nullable=False)
+    created_at = db.Column(db.DateTime, default=func.now())
+
+    def __repr__(self):
+        return f"<BoardColumn {self.name}>"
+
+    def __init__(self, board_id, name, rank):
+        self.id = str(uuid.uuid4())
+        self.board_id = board_id
+        self.name = name
+        self.rank = rank
+
+    def to_dict(self):
+        return {"id": self.id, "name": self.name, "rank": self.rank}
+
+    @classmethod
+    def get_by_id(cls, id):
+        try:
+            return db.session.get(cls, id)
+        except Exception as e:
+            raise DatabaseOperationError(
+                "Error getting column by ID: " + str(e))
+
+    @classmethod
+    def get_last_rank(cls, board_id):
+        try:
+            return db.session.execute(
+                select(cls.rank)
+                .where(cls.board_id == board_id)
+                .order_by(cls.rank.desc())
+                .limit(1)).scalar()
+        except Exception as e:
+            raise DatabaseOperationError(
+                "Error getting last column rank: " + str(e))
+
+    @classmethod
+    def get_rows_for_board(cls, board_id):
+        try:
+            return db.session.execute(
+                select(cls.id, cls.name, cls.rank)
+                .where(cls.board_id == board_id)
+                .order_by(cls.rank, cls.id)).all()
+        except Exception as e:
+            raise DatabaseOperationError(
+                "Error getting board columns: " + str(e))
+
+    @classmethod
+    def get_rows_by_ids(cls, ids):
+        try:
+            return db.session.execute(
+                select(cls.id, cls.name, cls.rank)
+                .where(cls.id.in_(ids))).all()
+        except Exception as e:
+            raise DatabaseOperationError(
+                "Error getting columns by ID: " + str(e))
+
+    @classmethod
+    def create(cls, board_id, name, rank):
+        column = cls(board_id, name, rank)
+        try:
+            db.session.add(column)
+            Board.record_changes(
+                board_id, [("column", column.id, "created")])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseOperationError(
+                "Error creating column: " + str(e))
+        return column
+
+    @classmethod
+    def rebalance(cls, board_id):
+        # respace every column rank once keys have grown too long
+        try:
+            ids = db.session.execute(
+                select(cls.id)
+                .where(cls.board_id == board_id)
+                .order_by(cls.rank, cls.id)).scalars().all()
+            if ids:
+                db.session.execute(update(cls), [
+                    {"id": id, "rank": rank}
+                    for id, rank in zip(ids, rank_sequence(len(ids)))])
+                Board.record_changes(
+                    board_id, [("column", id, "moved") for id in ids])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseOperationError(
+                "Error rebalancing columns: " + str(e))
+        return len(ids)
+
+
+class Card(db.Model):
+    __tablename__ = "cards"
+    __table_args__ = (
+        # cards are always read in rank order within a column, the id
+        # breaks ties between equal ranks for keyset pages
+        db.Index("ix_cards_column_id_rank_id", "column_id", "rank", "id"),
+        # whole-board reads walk this index without sorting
+        db.Index("ix_cards_board_id_column_id_rank",
+                 "board_id", "column_id", "rank"),
+    )
+
+    id = db.Column(db.String(64), primary_key=True, nullable=False)
+    # denormalized from the column so a whole board reads in one query
+    board_id = db.Column(db.String(64), db.ForeignKey("boards.id"),
+                         nullable=False)
+    column_id = db.Column(db.String(64), db.ForeignKey("board_columns.id"),
+                          nullable=False)
+    title = db.Column(db.String(256), nullable=False)
+    description = db.Column(db.Text, nullable=False, default="")
+    rank = db.Column(RankKey, nullable=False)
+    # archived cards keep their row but are left out of every read
+    archived = db.Column(db.Boolean, nullable=False, default=False)
+    # stable integer key of the card's SQLite full-text entry, set by the
+    # index's insert trigger; the table's own rowid may change on VACUUM
+    search_id = db.Column(db.Integer, unique=True)
+    created_at = db.Column(db.DateTime, default=func.now())
+    updated_at = db.Column(db.DateTime, default=func.now(),
+                           onupdate=func.now())
+
+    def __repr__(self):
+        return f"<Card {self.title}>"
+
+    def __init__(self, board_id, column_id, title, description, rank):
+        self.id = str(uuid.uuid4())
+        self.board_id = board_id
+        self.column_id = column_id
+        self.title = title
+        self.description = description
+        self.rank = rank
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "column_id": self.column_id,
+            "title": self.title,
+            "description": self.description,
+            "rank": self.rank
+        }
+
+    @classmethod
+    def get_by_id(cls, id):
+        try:
+            return db.session.get(cls, id)
+        except Exception as e:
+            raise DatabaseOperationError(
+                "Error getting card by ID: " + str(e))
+
+    @classmethod
+    def stream_rows_for_board(cls, board_id, batch_size=1000):
+        # Plain tuples fetched in batches, skipping ORM object hydration.
+        # The rows are read on the session's own connection when the body
+        # is, so a streamed read never holds a second connection, and a
+        # response that is never iterated (HEAD, early disconnect) runs no
+        # query. The session lives until the streamed response is closed.
+        statement = select(
+            cls.id, cls.column_id, cls.title, cls.description, cls.rank) \
+            .where(cls.board_id == board_id, cls.archived.is_(False)) \
+            .order_by(cls.column_id, cls.rank)
+
+        def rows():
+            try:
+                result = db.session.execute(
+                    statement, execution_options={"yield_per": batch_size})
+            except Exception as e:
+                raise DatabaseOperationError(
+                    "Error getting board cards: " + str(e))
+            yield from result
+        return rows()
+
+    @classmethod
+    def get_rows_by_ids(cls, ids):
+        try:
+            return db.session.execute(
+                select(cls.id, cls.column_id, cls.title, cls.description,
+                       cls.rank)
+                .where(cls.id.in_(ids), cls.archived.is_(False))).all()
+        except Exception as e:
+            raise DatabaseOperationError(
+                "Error getting cards by ID: " + str(e))
+
+    @classmethod
+    def get_page_for_column(cls, column_id, cursor, limit):
+        return paginate(
+            select(cls.id, cls.column_id, cls.title, cls.description,
+                   cls.rank)
+            .where(cls.column_id == column_id, cls.archived.is_(False)),
+            (cls.rank, cls.id), cursor, limit)
+
+    @classmethod
+    def get_positions(cls, ids):
+        # (column_id, rank) of several cards in one query
+        try:
+            rows = db.session.execute(
+                select(cls.id, cls.column_id, cls.rank)
+                .where(cls.id.in_(ids), cls.archived.is_(False))).all()
+        except Exception as e:
+            raise DatabaseOperationError(
+                "Error getting card positions: " + str(e))
+        return {row.id: (row.column_id, row.rank) for row in rows}
+
+    @classmethod
+    def get_adjacent_rank(cls, column_id, rank=None, after=False,
+                          exclude_ids=()):
+        # nearest rank after/before ``rank``; with no rank, the last one
+        query = select(cls.rank).where(cls.column_id == column_id)
+        if exclude_ids:
+            query = query.where(cls.id.not_in(exclude_ids))
+        if after:
+            query = query.where(cls.rank > rank).order_by(cls.rank)
+        else:
+            if rank is not None:
+                query = query.where(cls.rank < rank)
+            query = query.order_by(cls.rank.desc())
+        try:
+            return db.session.execute(query.limit(1)).scalar()
+        except Exception as e:
+            raise DatabaseOperationError(
+                "Error getting adjacent card rank: " + str(e))
+
+    @classmethod
+    def get_batch_positions(cls, board_id, ids):
+        # like get_positions, limited to one board's cards
+        try:
+            rows = db.session.execute(
+                select(cls.id, cls.column_id, cls.rank)
+                .where(cls.id.in_(ids), cls.board_id == board_id,
+                       cls.archived.is_(False))).all()
+        except Exception as e:
+            raise DatabaseOperationError(
+                "Error getting card positions: " + str(e))
+        return {row.id: row for row in rows}
+
+    @classmethod
+    def get_last_ranks(cls, column_ids, exclude_ids=()):
+        # the (column_id, rank) index answers each max() with one seek
+        query = select(cls.column_id, func.max(cls.rank)) \
+            .where(cls.column_id.in_(column_ids))
+        if exclude_ids:
+            query = query.where(cls.id.not_in(exclude_ids))
+        try:
+            rows = db.session.execute(query.group_by(cls.column_id)).all()
+        except Exception as e:
+            raise DatabaseOperationError(
+                "Error getting last card ranks: " + str(e))
+        return dict(rows)
+
+    @classmethod
+    def create(cls, board_id, column_id, title, description, rank):
+        card = cls(board_id, column_id, title, description, rank)
+        try:
+            db.session.add(card)
+            Board.record_changes(board_id, [("card", card.id, "created")])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseOperationError(
+                "Error creating card: " + str(e))
+        return card
+
+    @classmethod
+    def move(cls, id, board_id, column_id, rank):
+        # a move only ever rewrites the moved card's row
+        try:
+            db.session.execute(
+                update(cls)
+                .where(cls.id == id)
+                .values(column_id=column_id, rank=rank))
+            Board.record_changes(board_id, [("card", id, "moved")])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseOperationError(
+                "Error moving card: " + str(e))
+
+    @classmethod
+    def apply_batch(cls, board_id, new_cards, card_updates, changes):
+        # one transaction: a bulk INSERT, a bulk UPDATE by primary key per
+        # set of changed columns and a single board version for the batch
+        try:
+            if new_cards:
+                db.session.execute(insert(cls), new_cards)
+            for rows in card_updates:
+                db.session.execute(update(cls), rows)
+            Board.record_changes(board_id, changes)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseOperationError(
+                "Error applying card batch: " + str(e))
+
+    @classmethod
+    def rebalance(cls, board_id, column_id):
+        # respace every rank in the column once keys have grown too long
+        try:
+            ids = db.session.execute(
+                select(cls.id)
+                .where(cls.column_id == column_id)
+                .order_by(cls.rank, cls.id)).scalars().all()
+            if ids:
+                db.session.execute(update(cls), [
+                    {"id": id, "rank": rank}
+                    for id, rank in zip(ids, rank_sequence(len(ids)))])
+                Board.record_changes(
+                    board_id, [("card", id, "moved") for id in ids])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise DatabaseOperationError(
+                "Error rebalancing column: " + str(e))
+        return len(ids)
+
+
+class BoardChange(db.Model):
+    """Append-only log of column/card writes, one version per write"""
+    __tablename__ = "board_changes"
+    __table_args__ = (
+        db.Index("ix_board_changes_board_id_version", "board_id", "version"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    board_id = db.Column(db.String(64), db.ForeignKey("boards.id"),
+                         nullable=False)
+    version = db.Column(db.Integer, nullable=False)
+    entity = db.Column(db.String(16), nullable=False)  # card or column
+    entity_id = db.Column(db.String(64), nullable=False)
+    # created, updated, moved or deleted
+    op = db.Column(db.String(16), nullable=False)
+    created_at = db.Column(db.DateTime, default=func.now())
+
+    def __repr__(self):
+        return f"<BoardChange {self.board_id} v{self.version}>"
+
+    @classmethod
+    def get_rows_for_board(cls, board_id, since, until, limit):
+        try:
+            return db.session.execute(
+                select(cls.entity, cls.entity_id, cls.op)
+                .where(cls.board_id == board_id,
+                       cls.version > since, cls.version <= until)
+                .order_by(cls.version, cls.id)
+                .limit(limit)).all()
+        except Exception as e:
+            raise DatabaseOperationError(
+                "Error getting board changes: " + str(e))
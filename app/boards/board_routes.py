@@ -0,0 +1,146 @@
+from flask import \
+    Blueprint, Response, jsonify, g, request, stream_with_context
+
+from .batch_service import batch_cards
+from .board_service import \
+    create_board, create_column, create_card, move_card, get_board, \
+    get_board_changes, subscribe_board_events, list_boards, list_cards
+from .member_service import list_members, remove_member, set_member
+from app.search.search_service import search_cards
+from app.utils.auth_utils import board_access_required, login_required
+from app.utils.request_utils import require_json_content
+
+
+boards = Blueprint("boards", __name__)
+
+
+@boards.route("", methods=["POST"])
+@login_required
+@require_json_content
+def create():
+    response = create_board(g.request_json)
+
+    return jsonify(response), response["status"]
+
+
+@boards.route("", methods=["GET"])
+@login_required
+def index():
+    response = list_boards(request.args)
+
+    return jsonify(response), response["status"]
+
+
+@boards.route("/<board_id>", methods=["GET"])
+@board_access_required("viewer")
+def read(board_id):
+    etag, body = get_board(board_id, request.if_none_match)
+    if body is None:
+        response = Response(status=304)
+    else:
+        # streamed so large boards are never built up in memory
+        response = Response(
+            stream_with_context(body), mimetype="application/json")
+    response.set_etag(etag)
+    # clients may keep a copy but must revalidate it on every poll
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+@boards.route("/<board_id>/changes", methods=["GET"])
+@board_access_required("viewer")
+def changes(board_id):
+    body = get_board_changes(board_id, request.args.get("since"))
+
+    return Response(stream_with_context(body), mimetype="application/json")
+
+
+@boards.route("/<board_id>/events", methods=["GET"])
+@board_access_required("viewer")
+def events(board_id):
+    # the stream never touches the request context, so the context (and
+    # its database session) is released as soon as the headers are sent
+    response = Response(
+        subscribe_board_events(board_id), mimetype="text/event-stream")
+    response.cache_control.no_cache = True
+    # stop nginx from buffering the stream
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+@boards.route("/<board_id>/columns", methods=["POST"])
+@board_access_required("editor")
+@require_json_content
+def add_column(board_id):
+    response = create_column(board_id, g.request_json)
+
+    return jsonify(response), response["status"]
+
+
+@boards.route("/<board_id>/columns/<column_id>/cards", methods=["POST"])
+@board_access_required("editor")
+@require_json_content
+def add_card(board_id, column_id):
+    response = create_card(board_id, column_id, g.request_json)
+
+    return jsonify(response), response["status"]
+
+
+@boards.route("/<board_id>/columns/<column_id>/cards", methods=["GET"])
+@board_access_required("viewer")
+def cards(board_id, column_id):
+    response = list_cards(board_id, column_id, request.args)
+
+    return jsonify(response), response["status"]
+
+
+@boards.route("/<board_id>/cards/search", methods=["GET"])
+@board_access_required("viewer")
+def search(board_id):
+    response = search_cards(board_id, request.args)
+
+    return jsonify(response), response["status"]
+
+
+@boards.route("/<board_id>/cards/<card_id>/move", methods=["POST"])
+@board_access_required("editor")
+@require_json_content
+def move(board_id, card_id):
+    response = move_card(board_id, card_id, g.request_json)
+
+    return jsonify(response), response["status"]
+
+
+@boards.route("/<board_id>/cards:batch", methods=["POST"])
+@board_access_required("editor")
+@require_json_content
+def batch(board_id):
+    response = batch_cards(board_id, g.request_json)
+
+    return jsonify(response), response["status"]
+
+
+@boards.route("/<board_id>/members", methods=["GET"])
+@board_access_required("viewer")
+def members(board_id):
+    response = list_members(board_id, request.args)
+
+    return jsonify(response), response["status"]
+
+
+@boards.route("/<board_id>/members", methods=["POST"])
+@board_access_required("owner")
+@require_json_content
+def add_member(board_id):
+    response = set_member(board_id, g.request_json)
+
+    return jsonify(response), response["status"]
+
+
+@boards.route("/<board_id>/members/<user_id>", methods=["DELETE"])
+@board_access_required("owner")
+def delete_member(board_id, user_id):
+    response = remove_member(board_id, user_id)
+
+    return jsonify(response), response["status"]
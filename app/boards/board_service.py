@@ -0,0 +1,435 @@
+import json
+
+from flask import current_app, session
+
+from app.boards.board_acl import board_acl
+from app.boards.board_models import Board, BoardChange, BoardColumn, Card
+from app.exceptions.custom_exceptions import \
+    UserActionError, ValidationError, NotFoundError
+from app.utils.event_hub import hub
+from app.utils.pagination import get_page_size
+from app.utils.ranking import rank_after, rank_between
+
+
+# rebalance a column once a rank key grows past this many characters
+RANK_MAX_LENGTH = 32
+
+
+def get_board_by_id(board_id):
+    # access is checked by board_access_required before this runs
+    board = Board.get_by_id(board_id)
+    if not board:
+        raise NotFoundError("The requested board does not exist.")
+    return board
+
+
+def get_column_for_board(board, column_id):
+    column = BoardColumn.get_by_id(column_id)
+    if not column or column.board_id != board.id:
+        raise NotFoundError("The requested column does not exist.")
+    return column
+
+
+def get_card_for_board(board, card_id):
+    card = Card.get_by_id(card_id)
+    if not card or card.board_id != board.id or card.archived:
+        raise NotFoundError("The requested card does not exist.")
+    return card
+
+
+def validate_name(name, field, max_length):
+    if not name or not isinstance(name, str) or not name.strip():
+        raise UserActionError(f"Please provide a {field}.")
+    if len(name) > max_length:
+        raise ValidationError(
+            f"The {field} must be at most {max_length} characters long.")
+
+
+def _dumps(value):
+    return json.dumps(value, separators=(",", ":"))
+
+
+def stream_board_json(board, columns, card_rows, batch_size=500,
+                      snapshot=None):
+    # snapshot is only set for full boards sent in place of a delta
+    head = "" if snapshot is None else f'"snapshot":{_dumps(snapshot)},'
+    yield (f'{{"status":200,{head}"board":{{"id":{_dumps(board["id"])},'
+           f'"name":{_dumps(board["name"])},'
+           f'"version":{_dumps(board["version"])},"columns":')
+    yield _dumps([
+        {"id": id, "name": name, "rank": rank}
+        for id, name, rank in columns])
+    yield ',"cards":['
+
+    separator = ""
+    batch = []
+    for id, column_id, title, description, rank in card_rows:
+        batch.append(_dumps({
+            "id": id,
+            "column_id": column_id,
+            "title": title,
+            "description": description,
+            "rank": rank}))
+        if len(batch) == batch_size:
+            yield separator + ",".join(batch)
+            separator = ","
+            batch = []
+    if batch:
+        yield separator + ",".join(batch)
+    yield "]}}"
+
+
+def get_board_etag(board):
+    # Read before the columns and cards, so a concurrent write can only
+    # make the body newer than its ETag, never older.
+    return f"{board.id}.{board.version}"
+
+
+def get_board(board_id, if_none_match=None):
+    # three queries no matter how big the board is, and a single
+    # primary-key lookup when the client's copy is still current
+    board = get_board_by_id(board_id)
+    etag = get_board_etag(board)
+    # weak comparison (RFC 7232), as proxies that compress the body
+    # turn the tag into W/"..."
+    if if_none_match is not None and if_none_match.contains_weak(etag):
+        return etag, None
+
+    columns = BoardColumn.get_rows_for_board(board.id)
+    card_rows = Card.stream_rows_for_board(board.id)
+
+    return etag, stream_board_json(board.to_dict(), columns, card_rows)
+
+
+def get_since_version(since):
+    try:
+        return int(since)
+    except (TypeError, ValueError):
+        raise ValidationError("The since version must be a whole number.")
+
+
+def coalesce_changes(change_rows):
+    # one op per entity, as seen by a client that has none of the changes
+    ops = {}
+    for entity, entity_id, op in change_rows:
+        key = (entity, entity_id)
+        previous = ops.get(key)
+        if previous == "created" and op != "deleted":
+            continue
+        ops[key] = op
+    return ops
+
+
+def get_delta(board, since):
+    max_entries = current_app.config["BOARD_CHANGES_MAX_ENTRIES"]
+    change_rows = BoardChange.get_rows_for_board(
+        board.id, since, board.version, max_entries + 1)
+    if len(change_rows) > max_entries:
+        return None
+
+    ops = coalesce_changes(change_rows)
+    ids = {"column": [], "card": []}
+    for entity, entity_id in ops:
+        ids[entity].append(entity_id)
+
+    # current state of every changed entity, missing rows were deleted
+    columns = {row.id: {"id": row.id, "name": row.name, "rank": row.rank}
+               for row in (BoardColumn.get_rows_by_ids(ids["column"])
+                           if ids["column"] else ())}
+    cards = {row.id: {"id": row.id, "column_id": row.column_id,
+                      "title": row.title, "description": row.description,
+                      "rank": row.rank}
+             for row in (Card.get_rows_by_ids(ids["card"])
+                         if ids["card"] else ())}
+
+    changes = {"columns": [], "cards": []}
+    for (entity, entity_id), op in ops.items():
+        current = (columns if entity == "column" else cards).get(entity_id)
+        if current is None:
+            current, op = {"id": entity_id}, "deleted"
+        changes[entity + "s"].append({**current, "op": op})
+    return changes
+
+
+def get_board_changes(board_id, since=None):
+    board = get_board_by_id(board_id)
+
+    changes = None
+    if since is not None:
+        since = get_since_version(since)
+        if since < 0 or since > board.version:
+            raise ValidationError(
+                "The since version must be between 0 "
+                "and the current board version.")
+        # entries at or below the floor may already be compacted, and
+        # every version has at least one entry
+        if board.changes_floor <= since and board.version - since <= \
+                current_app.config["BOARD_CHANGES_MAX_ENTRIES"]:
+            changes = get_delta(board, since)
+
+    if changes is None:
+        # no usable delta, so send the whole board instead
+        columns = BoardColumn.get_rows_for_board(board.id)
+        card_rows = Card.stream_rows_for_board(board.id)
+        return stream_board_json(
+            board.to_dict(), columns, card_rows, snapshot=True)
+
+    return iter([_dumps({
+        "status": 200,
+        "snapshot": False,
+        "since": since,
+        "version": board.version,
+        **changes
+    })])
+
+
+def publish_board_event(board, event_type, **data):
+    # runs after the write committed; skip the version lookup when
+    # nobody in this process is listening
+    if not hub.has_subscribers(board.id):
+        return
+    hub.publish(board.id, (event_type, {"version": board.version, **data}))
+
+
+def format_event(event_type, data, id=None):
+    head = f"id: {id}\n" if id is not None else ""
+    return f"{head}event: {event_type}\ndata: {_dumps(data)}\n\n"
+
+
+def stream_board_events(subscription, version, heartbeat, is_member):
+    try:
+        # the version lets clients catch up through the changes endpoint
+        yield format_event("ready", {"version": version})
+        while True:
+            event = subscription.get(timeout=heartbeat)
+            if not is_member():
+                # removed from the board since subscribing
+                yield format_event("revoked", {})
+                return
+            if event is not None:
+                event_type, data = event
+                yield format_event(event_type, data, id=data["version"])
+            elif subscription.dropped:
+                # too slow to keep up, so resync and reconnect
+                yield format_event("reset", {})
+                return
+            else:
+                # comment frame, keeps proxies from closing the stream
+                yield ": heartbeat\n\n"
+    finally:
+        hub.unsubscribe(subscription)
+
+
+def subscribe_board_events(board_id):
+    board = get_board_by_id(board_id)
+    app = current_app._get_current_object()
+    user_id = session["id"]
+
+    def is_member():
+        # checked before every frame; the roles are usually cached, and
+        # removals in other processes apply within BOARD_ACL_CACHE_TTL
+        with app.app_context():
+            return board_acl.get_role(user_id, board_id) is not None
+
+    subscription = hub.subscribe(
+        board.id, current_app.config["BOARD_EVENTS_QUEUE_SIZE"])
+
+    return stream_board_events(
+        subscription, board.version,
+        current_app.config["BOARD_EVENTS_HEARTBEAT"], is_member)
+
+
+def list_boards(args):
+    rows, next_cursor = Board.get_page_for_member(
+        session["id"], args.get("cursor"), get_page_size(args.get("limit")))
+
+    return {
+        "status": 200,
+        "boards": [{"id": row.board_id, "name": row.board_name,
+                    "version": row.version} for row in rows],
+        "next_cursor": next_cursor
+    }
+
+
+def list_cards(board_id, column_id, args):
+    board = get_board_by_id(board_id)
+    column = get_column_for_board(board, column_id)
+    rows, next_cursor = Card.get_page_for_column(
+        column.id, args.get("cursor"), get_page_size(args.get("limit")))
+
+    return {
+        "status": 200,
+        "cards": [{"id": row.id, "column_id": row.column_id,
+                   "title": row.title, "description": row.description,
+                   "rank": row.rank} for row in rows],
+        "next_cursor": next_cursor
+    }
+
+
+def create_board(req_data):
+    if not req_data or "name" not in req_data:
+        raise UserActionError(
+            "Some required fields are missing. "
+            "Please provide all required information.")
+
+    validate_name(req_data["name"], "board name", 128)
+
+    board = Board.create(req_data["name"], session["id"])
+    # the creator's cached roles do not include the new board yet
+    board_acl.invalidate(session["id"])
+
+    return {
+        "status": 201,
+        "message": "Board created.",
+        "board": board.to_dict()
+    }
+
+
+def create_column(board_id, req_data):
+    board = get_board_by_id(board_id)
+
+    if not req_data or "name" not in req_data:
+        raise UserActionError(
+            "Some required fields are missing. "
+            "Please provide all required information.")
+
+    validate_name(req_data["name"], "column name", 128)
+
+    # new columns go to the right of the existing ones
+    rank = rank_after(BoardColumn.get_last_rank(board.id))
+    if len(rank) > RANK_MAX_LENGTH:
+        BoardColumn.rebalance(board.id)
+        publish_board_event(board, "columns.rebalanced")
+        rank = rank_after(BoardColumn.get_last_rank(board.id))
+    column = BoardColumn.create(board.id, req_data["name"], rank)
+    publish_board_event(board, "column.created", column=column.to_dict())
+
+    return {
+        "status": 201,
+        "message": "Column created.",
+        "column": column.to_dict()
+    }
+
+
+def create_card(board_id, column_id, req_data):
+    board = get_board_by_id(board_id)
+    column = get_column_for_board(board, column_id)
+
+    if not req_data or "title" not in req_data:
+        raise UserActionError(
+            "Some required fields are missing. "
+            "Please provide all required information.")
+
+    validate_name(req_data["title"], "card title", 256)
+    description = req_data.get("description") or ""
+    if not isinstance(description, str):
+        raise ValidationError("The card description must be text.")
+
+    # new cards go to the bottom of the column
+    rank = get_append_rank(board, column.id)
+    card = Card.create(
+        board.id, column.id, req_data["title"], description, rank)
+    publish_board_event(board, "card.created", card=card.to_dict())
+
+    return {
+        "status": 201,
+        "message": "Card created.",
+        "card": card.to_dict()
+    }
+
+
+def get_neighbour_ranks(column_id, card_id, prev_card_id, next_card_id):
+    neighbour_ids = [id for id in (prev_card_id, next_card_id) if id]
+    positions = Card.get_positions(neighbour_ids) if neighbour_ids else {}
+    for neighbour_id in neighbour_ids:
+        position = positions.get(neighbour_id)
+        if neighbour_id == card_id or not position \
+                or position[0] != column_id:
+            raise ValidationError(
+                "The cards to place this card between "
+                "must be other cards in the target column.")
+
+    prev_rank = positions[prev_card_id][1] if prev_card_id else None
+    next_rank = positions[next_card_id][1] if next_card_id else None
+
+    # fill in a missing neighbour with one indexed lookup
+    if prev_card_id and not next_card_id:
+        next_rank = Card.get_adjacent_rank(
+            column_id, prev_rank, after=True, exclude_ids=[card_id])
+    elif next_card_id and not prev_card_id:
+        prev_rank = Card.get_adjacent_rank(
+            column_id, next_rank, exclude_ids=[card_id])
+    elif not prev_card_id and not next_card_id:
+        prev_rank = Card.get_adjacent_rank(
+            column_id, exclude_ids=[card_id])
+
+    if prev_rank is not None and next_rank is not None \
+            and prev_rank >= next_rank:
+        if prev_card_id and next_card_id and prev_rank > next_rank:
+            raise ValidationError(
+                "The previous card must come before the next card.")
+        # two cards share a rank (concurrent moves), so respace
+        return None
+    return prev_rank, next_rank
+
+
+def rebalance_column(board, column_id):
+    # rare: renumber the column once, then place the card again
+    Card.rebalance(board.id, column_id)
+    # every rank in the column changed, so clients reload it
+    publish_board_event(board, "column.rebalanced", column_id=column_id)
+
+
+def get_append_rank(board, column_id):
+    rank = rank_after(Card.get_adjacent_rank(column_id))
+    if len(rank) > RANK_MAX_LENGTH:
+        rebalance_column(board, column_id)
+        rank = rank_after(Card.get_adjacent_rank(column_id))
+    return rank
+
+
+def get_move_rank(board, column_id, card_id, prev_card_id, next_card_id):
+    neighbours = get_neighbour_ranks(
+        column_id, card_id, prev_card_id, next_card_id)
+    rank = rank_between(*neighbours) if neighbours else None
+    if rank is None or len(rank) > RANK_MAX_LENGTH:
+        rebalance_column(board, column_id)
+        neighbours = get_neighbour_ranks(
+            column_id, card_id, prev_card_id, next_card_id)
+        rank = rank_between(*neighbours)
+    return rank
+
+
+def move_card(board_id, card_id, req_data):
+    board = get_board_by_id(board_id)
+    card = get_card_for_board(board, card_id)
+
+    if not req_data or not isinstance(req_data, dict):
+        raise UserActionError(
+            "No move data received. "
+            "Please provide the required information.")
+    # ids come from JSON, so anything but a string is rejected up front
+    for key in ("prev_card_id", "next_card_id"):
+        if req_data.get(key) and not isinstance(req_data[key], str):
+            raise ValidationError(
+                "The cards to place this card between "
+                "must be other cards in the target column.")
+
+    column_id = req_data.get("column_id") or card.column_id
+    if not isinstance(column_id, str):
+        raise NotFoundError("The requested column does not exist.")
+    if column_id != card.column_id:
+        get_column_for_board(board, column_id)
+
+    rank = get_move_rank(
+        board, column_id, card.id,
+        req_data.get("prev_card_id"), req_data.get("next_card_id"))
+    Card.move(card.id, board.id, column_id, rank)
+    publish_board_event(board, "card.moved", card={
+        "id": card.id, "column_id": column_id, "rank": rank})
+
+    return {
+        "status": 200,
+        "message": "Card moved.",
+        "card": {"id": card.id, "column_id": column_id, "rank": rank}
+    }
@@ -0,0 +1,64 @@
+from app.auth.auth_models import User
+from app.boards.board_acl import board_acl
+from app.boards.board_models import BoardMember
+from app.boards.board_service import get_board_by_id
+from app.exceptions.custom_exceptions import \
+    NotFoundError, UserActionError, ValidationError
+from app.utils.pagination import get_page_size
+
+
+# the owner role stays with the board's creator
+MEMBER_ROLES = ("viewer", "editor")
+
+
+def list_members(board_id, args):
+    rows, next_cursor = BoardMember.get_page_for_board(
+        board_id, args.get("cursor"), get_page_size(args.get("limit")))
+
+    return {
+        "status": 200,
+        "members": [{"user_id": row.user_id, "username": row.username,
+                     "role": row.role} for row in rows],
+        "next_cursor": next_cursor
+    }
+
+
+def set_member(board_id, req_data):
+    if not req_data or "username" not in req_data or "role" not in req_data:
+        raise UserActionError(
+            "Some required fields are missing. "
+            "Please provide all required information.")
+    if req_data["role"] not in MEMBER_ROLES:
+        raise ValidationError("The role must be viewer or editor.")
+
+    board = get_board_by_id(board_id)
+    user = User.get_by_username(req_data["username"]) \
+        if isinstance(req_data["username"], str) else None
+    if not user:
+        raise NotFoundError("The requested user does not exist.")
+    if user.id == board.owner_id:
+        raise UserActionError("The board owner's role cannot be changed.")
+
+    BoardMember.set_role(board, user.id, req_data["role"])
+    board_acl.invalidate(user.id)
+
+    return {
+        "status": 200,
+        "message": "Board member saved.",
+        "member": {"user_id": user.id, "username": user.username,
+                   "role": req_data["role"]}
+    }
+
+
+def remove_member(board_id, user_id):
+    board = get_board_by_id(board_id)
+    if user_id == board.owner_id:
+        raise UserActionError("The board owner cannot be removed.")
+    if not BoardMember.remove(board.id, user_id):
+        raise NotFoundError("The requested member does not exist.")
+    board_acl.invalidate(user_id)
+
+    return {
+        "status": 200,
+        "message": "Board member removed."
+    }
@@ -1,6 +1,15 @@
+import os
+import time
+
+import click
+from flask.cli import AppGroup
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import DeclarativeBase
-from flask_session import Session
+from sqlalchemy.pool import QueuePool
+
+from app.utils.metrics import registry
 
 
 class Base(DeclarativeBase):
@@ -8,12 +17,177 @@ class Base(DeclarativeBase):
 
 
 db = SQLAlchemy(model_class=Base)
-sess = Session()
+
+db_cli = AppGroup("db", help="Manage the database schema.")
+
+pool_checkout_seconds = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool.")
+pool_checked_out = registry.gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.")
+pool_overflow = registry.counter(
+    "db_pool_overflow_total",
+    "Connections opened beyond pool_size.")
+pool_timeouts = registry.counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout.")
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkout waits and overflow in metrics,
+    labelled with the engine's bind key"""
+
+    engine_label = "default"
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool, which keeps the label
+        pool = super().recreate()
+        pool.engine_label = self.engine_label
+        return pool
+
+    def _do_get(self):
+        overflow = self.overflow()
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_timeouts.inc(engine=self.engine_label)
+            raise
+        finally:
+            pool_checkout_seconds.observe(
+                time.perf_counter() - start, engine=self.engine_label)
+            if self.overflow() > max(overflow, 0):
+                pool_overflow.inc(engine=self.engine_label)
+        # counted up and down rather than set, so pools of several apps
+        # on one bind add up instead of overwriting each other
+        pool_checked_out.inc(engine=self.engine_label)
+        return connection
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        pool_checked_out.dec(engine=self.engine_label)
+
+
+def get_pool_options(config):
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+        "pool_recycle": config["DB_POOL_RECYCLE"],
+        "pool_pre_ping": config["DB_POOL_PRE_PING"],
+    }
+
+
+def get_engine_options(config):
+    # SQLite keeps SQLAlchemy's own pool choice; servers get a sized pool
+    options = dict(config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    uri = config.get("SQLALCHEMY_DATABASE_URI") or ""
+    if uri.startswith("sqlite"):
+        return options
+    return {**get_pool_options(config), **options}
+
+
+def get_sqlite_pragmas(config):
+    return {
+        "journal_mode": config["SQLITE_JOURNAL_MODE"],
+        "synchronous": config["SQLITE_SYNCHRONOUS"],
+        "busy_timeout": config["SQLITE_BUSY_TIMEOUT"],
+        "cache_size": config["SQLITE_CACHE_SIZE"],
+        "mmap_size": config["SQLITE_MMAP_SIZE"],
+    }
+
+
+def set_sqlite_pragmas(pragmas):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            if value is not None:
+                cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+    return on_connect
+
+
+def create_sqlite_dir(uri):
+    # SQLite creates the database file, but not the directory it is in
+    url = make_url(uri)
+    if url.get_backend_name() == "sqlite" and url.database \
+            and url.database != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(url.database)),
+                    exist_ok=True)
 
 
 def init_db(app):
+    app.config.setdefault("SQLITE_JOURNAL_MODE", "WAL")
+    app.config.setdefault("SQLITE_SYNCHRONOUS", "NORMAL")
+    app.config.setdefault("SQLITE_BUSY_TIMEOUT", 5000)
+    app.config.setdefault("SQLITE_CACHE_SIZE", -20000)
+    app.config.setdefault("SQLITE_MMAP_SIZE", 134217728)
+    app.config.setdefault("DB_POOL_SIZE", 5)
+    app.config.setdefault("DB_MAX_OVERFLOW", 10)
+    app.config.setdefault("DB_POOL_TIMEOUT", 30)
+    app.config.setdefault("DB_POOL_RECYCLE", 1800)
+    app.config.setdefault("DB_POOL_PRE_PING", True)
+    app.config.setdefault("DB_CREATE_ALL", True)
+
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = get_engine_options(app.config)
+
+    if app.config.get("SQLALCHEMY_DATABASE_URI"):
+        create_sqlite_dir(app.config["SQLALCHEMY_DATABASE_URI"])
+
     db.init_app(app)
-    sess.init_app(app)
+    app.cli.add_command(db_cli)
     with app.app_context():
-        db.create_all()
+        # pragmas are per connection, so apply them as each one opens
+        pragmas = get_sqlite_pragmas(app.config)
+        for bind_key, engine in db.engines.items():
+            if isinstance(engine.pool, InstrumentedQueuePool):
+                engine.pool.engine_label = bind_key or "default"
+            if engine.dialect.name == "sqlite":
+                event.listen(engine, "connect", set_sqlite_pragmas(pragmas))
+        # checks every table on each start, so production creates the
+        # schema once with "flask db create" instead
+        if app.config["DB_CREATE_ALL"]:
+            db.create_all()
     return db
+
+
+def get_missing_columns(connection):
+    """Return "table.column" for each model column an existing table
+    lacks; create_all never alters a table that already exists."""
+    inspector = inspect(connection)
+    tables = set(inspector.get_table_names())
+    missing = []
+    for table in db.metadata.sorted_tables:
+        if table.name in tables:
+            names = {column["name"]
+                     for column in inspector.get_columns(table.name)}
+            missing += [f"{table.name}.{column.name}"
+                        for column in table.columns
+                        if column.name not in names]
+    return missing
+
+
+@db_cli.command("create")
+def create_command():
+    """Create missing tables, indexes and search schema.
+
+    Also the upgrade step for an existing database: run it once before
+    starting workers with DB_CREATE_ALL off. Columns added to existing
+    tables are reported, as they have to be added by hand.
+    """
+    start = time.perf_counter()
+    db.create_all()
+    with db.engine.begin() as connection:
+        missing = get_missing_columns(connection)
+        if missing:
+            raise click.ClickException(
+                "These columns are missing from existing tables and must "
+                "be added by hand: " + ", ".join(missing))
+        # create_all skips the indexes of tables that already existed
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+    click.echo(f"Created the database schema in "
+               f"{time.perf_counter() - start:.3f}s")
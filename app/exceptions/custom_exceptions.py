@@ -69,6 +69,15 @@ class ForbiddenError(ClientError):
         super().__init__(message, status_code)
 
 
+class TooManyRequestsError(ClientError):
+    """Raised when the client has exceeded a rate limit"""
+    def __init__(
+            self,
+            message="Too many requests. Please try again later",
+            status_code=429):
+        super().__init__(message, status_code)
+
+
 class InternalServerError(Exception):
     """Raised when the server encounters an internal error"""
     def __init__(self, message="Internal server error", status_code=500):
@@ -0,0 +1,22 @@
+from flask import Blueprint, Response, current_app, request
+
+from app.exceptions.custom_exceptions import UnauthorizedError
+from app.utils.metrics import registry
+from app.utils.request_utils import tokens_match
+
+
+metrics = Blueprint("metrics", __name__)
+
+
+@metrics.before_request
+def check_metrics_token():
+    token = current_app.config.get("METRICS_TOKEN")
+    if token and not tokens_match(
+            request.headers.get("Authorization", ""), f"Bearer {token}"):
+        raise UnauthorizedError("A valid metrics token is required.")
+
+
+@metrics.route("/metrics", methods=["GET"])
+def export_metrics():
+    return Response(
+        registry.render(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,186 @@
+import time
+
+from flask import current_app, has_request_context, request
+from sqlalchemy import event
+
+from app.db import db
+from app.metrics.slow_log import log_slow_query, log_slow_request
+from app.utils.metrics import registry
+
+
+SQL_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+http_requests = registry.counter(
+    "http_requests_total",
+    "Requests handled, by endpoint, method and status.")
+http_request_seconds = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to handle a request, including any streamed body.")
+http_request_sql_queries = registry.histogram(
+    "http_request_sql_queries",
+    "SQL statements executed per request.", SQL_QUERY_BUCKETS)
+http_request_sql_seconds = registry.histogram(
+    "http_request_sql_seconds",
+    "Time spent executing SQL per request.")
+
+
+class RequestStats:
+    """Where a single request spent its time"""
+
+    __slots__ = ("start", "mark", "endpoint", "method", "path", "status",
+                 "sql_count", "sql_seconds", "phases", "statements",
+                 "max_statements")
+
+    def __init__(self, max_statements=0):
+        self.start = self.mark = time.perf_counter()
+        self.endpoint = "unmatched"
+        self.method = None
+        self.path = None
+        self.status = "500"
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        # seconds by phase, e.g. "bcrypt"
+        self.phases = {}
+        # (statement, seconds), kept for the slow request log
+        self.statements = []
+        self.max_statements = max_statements
+
+    def add_phase(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def end_phase(self, phase):
+        """Close the phase running since the last mark."""
+        now = time.perf_counter()
+        self.add_phase(phase, now - self.mark)
+        self.mark = now
+
+    def add_statement(self, statement, seconds):
+        self.sql_count += 1
+        self.sql_seconds += seconds
+        if len(self.statements) < self.max_statements:
+            self.statements.append((statement, seconds))
+
+
+def get_request_stats():
+    """Return the current request's stats, or None outside a request."""
+    if not has_request_context():
+        return None
+    # kept in the environ rather than g, as the session is opened (and
+    # timed) before the request has run any hooks
+    stats = request.environ.get("request_stats")
+    if stats is None:
+        stats = request.environ["request_stats"] = RequestStats(
+            current_app.config["SLOW_REQUEST_MAX_STATEMENTS"]
+            if current_app.config["SLOW_REQUEST_THRESHOLD"] else 0)
+    return stats
+
+
+def record_phase(phase, seconds):
+    stats = get_request_stats()
+    if stats is not None:
+        stats.add_phase(phase, seconds)
+
+
+def _timed_session_method(method, phase):
+    def timed(*args, **kwargs):
+        stats = get_request_stats()
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            if stats is not None:
+                stats.add_phase(phase, time.perf_counter() - start)
+                stats.mark = time.perf_counter()
+    timed.timed = True
+    return timed
+
+
+def _time_session_interface(interface):
+    # wrapped on the instance, so the interface keeps its type
+    for name, phase in (("open_session", "session_open"),
+                        ("save_session", "session_save")):
+        method = getattr(interface, name)
+        if not getattr(method, "timed", False):
+            setattr(interface, name, _timed_session_method(method, phase))
+
+
+def _before_request():
+    stats = get_request_stats()
+    stats.endpoint = request.endpoint or "unmatched"
+    stats.method = request.method
+    stats.path = request.path
+    stats.end_phase("before_dispatch")
+
+
+def _after_request(response):
+    stats = get_request_stats()
+    stats.status = str(response.status_code)
+    stats.end_phase("dispatch")
+    return response
+
+
+def _record_request(app):
+    def teardown(exc):
+        stats = request.environ.get("request_stats")
+        if stats is None:
+            return
+        # runs once the session is saved and, for responses streamed
+        # with their request context, once the body is sent; event
+        # streams release the context early, so they end at the headers
+        stats.end_phase("response")
+        duration = time.perf_counter() - stats.start
+        http_requests.inc(endpoint=stats.endpoint, method=stats.method,
+                          status=stats.status)
+        http_request_seconds.observe(duration, endpoint=stats.endpoint)
+        http_request_sql_queries.observe(
+            stats.sql_count, endpoint=stats.endpoint)
+        http_request_sql_seconds.observe(
+            stats.sql_seconds, endpoint=stats.endpoint)
+
+        threshold = app.config["SLOW_REQUEST_THRESHOLD"]
+        if threshold and duration >= threshold:
+            log_slow_request(app.logger, stats, duration)
+    return teardown
+
+
+def _record_queries(app):
+    def before_cursor_execute(conn, cursor, statement, parameters, context,
+                              executemany):
+        if context is not None:
+            context._query_start = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context,
+                             executemany):
+        start = getattr(context, "_query_start", None)
+        if start is None:
+            return
+        seconds = time.perf_counter() - start
+        stats = get_request_stats()
+        if stats is not None:
+            stats.add_statement(statement, seconds)
+
+        threshold = app.config["SLOW_QUERY_THRESHOLD"]
+        if threshold and seconds >= threshold:
+            log_slow_query(app.logger, stats.endpoint if stats else None,
+                           statement, seconds)
+    return before_cursor_execute, after_cursor_execute
+
+
+def init_request_metrics(app):
+    # seconds; None disables the log
+    app.config.setdefault("SLOW_REQUEST_THRESHOLD", None)
+    app.config.setdefault("SLOW_QUERY_THRESHOLD", None)
+    app.config.setdefault("SLOW_REQUEST_MAX_STATEMENTS", 50)
+
+    _time_session_interface(app.session_interface)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_record_request(app))
+
+    before_cursor_execute, after_cursor_execute = _record_queries(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(
+                engine, "before_cursor_execute", before_cursor_execute)
+            event.listen(
+                engine, "after_cursor_execute", after_cursor_execute)
@@ -0,0 +1,241 @@
+import cProfile
+import glob
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+import click
+from flask import current_app, g, request
+from flask.cli import AppGroup
+
+from app.utils.metrics import registry
+from app.utils.request_utils import tokens_match
+
+
+profile_cli = AppGroup("profile", help="Inspect profiled requests.")
+
+PROFILE_MODES = {"sampling": "collapsed", "cprofile": "pstats"}
+
+profiled_requests = registry.counter(
+    "profiled_requests_total",
+    "Requests run under the profiler.")
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def collapse_stack(frame):
+    """Return the frame's stack, outermost first, as "a;b;c"."""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """Samples one thread's stack from a background thread, counting
+    identical stacks (the collapsed format flamegraph tools read)"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[collapse_stack(frame)] += 1
+
+
+def write_collapsed(path, stacks):
+    with open(path, "w") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+
+def read_collapsed(path):
+    stacks = Counter()
+    with open(path) as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack and count.isdigit():
+                stacks[stack] += int(count)
+    return stacks
+
+
+class RequestProfiler:
+    """Opt-in profiling of a fraction of requests, or of requests sent
+    with the PROFILE_HEADER set to PROFILE_TOKEN.
+
+    Each profile is written to PROFILE_DIR, which keeps only the newest
+    PROFILE_MAX_FILES files.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("PROFILE_ENABLED", False)
+        app.config.setdefault("PROFILE_SAMPLE_RATE", 0.01)
+        app.config.setdefault("PROFILE_MODE", "sampling")
+        app.config.setdefault("PROFILE_INTERVAL", 0.005)
+        app.config.setdefault("PROFILE_HEADER", "X-Profile")
+        app.config.setdefault("PROFILE_TOKEN", None)
+        app.config.setdefault("PROFILE_DIR", os.path.join(
+            os.path.dirname(app.root_path), "data", "profiles"))
+        app.config.setdefault("PROFILE_MAX_FILES", 100)
+
+        if app.config["PROFILE_MODE"] not in PROFILE_MODES:
+            raise ValueError(
+                f"Unknown PROFILE_MODE {app.config['PROFILE_MODE']!r}")
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.cli.add_command(profile_cli)
+        app.extensions["request_profiler"] = self
+
+    def should_profile(self):
+        config = current_app.config
+        token = config["PROFILE_TOKEN"]
+        header = request.headers.get(config["PROFILE_HEADER"])
+        if token and header and tokens_match(header, token):
+            return True
+        return config["PROFILE_ENABLED"] and \
+            random.random() < config["PROFILE_SAMPLE_RATE"]
+
+    def _before_request(self):
+        if not self.should_profile():
+            return
+        mode = current_app.config["PROFILE_MODE"]
+        name = (f"{time.time_ns()}-{os.getpid()}-"
+                f"{request.endpoint or 'unmatched'}.{PROFILE_MODES[mode]}")
+        if mode == "sampling":
+            profiler = StackSampler(
+                threading.get_ident(), current_app.config["PROFILE_INTERVAL"])
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # another thread's request is already under cProfile
+                return
+        g.request_profile = (name, profiler)
+        profiled_requests.inc(mode=mode)
+
+    def _after_request(self, response):
+        if "request_profile" in g:
+            # tells a caller using the header which file to look at
+            response.headers["X-Profile-Id"] = g.request_profile[0]
+        return response
+
+    def _teardown_request(self, exc):
+        # after the session is saved and any streamed body is sent
+        name, profiler = g.pop("request_profile", (None, None))
+        if profiler is None:
+            return
+        try:
+            self.write(name, profiler)
+        except OSError as e:
+            current_app.logger.warning(f"Could not write profile {name}: {e}")
+
+    def write(self, name, profiler):
+        # stopped before any file I/O, so a failed write never leaves the
+        # sampler thread or cProfile running
+        if isinstance(profiler, StackSampler):
+            stacks = profiler.stop()
+        else:
+            profiler.disable()
+        directory = current_app.config["PROFILE_DIR"]
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, name)
+        # written aside and renamed, so readers never see partial files
+        partial = path + ".tmp"
+        if isinstance(profiler, StackSampler):
+            write_collapsed(partial, stacks)
+        else:
+            profiler.dump_stats(partial)
+        os.replace(partial, path)
+        self.trim(directory, current_app.config["PROFILE_MAX_FILES"])
+        return path
+
+    def trim(self, directory, max_files):
+        # names start with a timestamp, so they sort oldest first
+        paths = sorted(list_profiles(directory))
+        for path in paths[:max(len(paths) - max_files, 0)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+request_profiler = RequestProfiler()
+
+
+def list_profiles(directory, endpoint=None, extension=None):
+    extensions = (extension,) if extension else PROFILE_MODES.values()
+    paths = []
+    for ext in extensions:
+        paths += glob.glob(os.path.join(directory, f"*.{ext}"))
+    if endpoint:
+        # <time>-<pid>-<endpoint>.<extension>
+        paths = [path for path in paths
+                 if os.path.basename(path).split("-", 2)[2]
+                 .rsplit(".", 1)[0].startswith(endpoint)]
+    return sorted(paths)
+
+
+@profile_cli.command("aggregate")
+@click.option("--endpoint", help="Only profiles of endpoints starting "
+              "with this, e.g. boards.read.")
+@click.option("--output", type=click.Path(dir_okay=False),
+              help="Write here instead of stdout (pstats: required).")
+@click.option("--pstats", "use_pstats", is_flag=True,
+              help="Merge cProfile files instead of sampled stacks.")
+def aggregate_command(endpoint, output, use_pstats):
+    """Merge profiles into one file.
+
+    Sampled stacks come out in the collapsed format read by flamegraph.pl
+    and speedscope; cProfile files merge into one pstats file.
+    """
+    directory = current_app.config["PROFILE_DIR"]
+    extension = PROFILE_MODES["cprofile" if use_pstats else "sampling"]
+    paths = list_profiles(directory, endpoint, extension)
+    if not paths:
+        raise click.ClickException(f"No {extension} profiles in {directory}")
+
+    if use_pstats:
+        import pstats
+        if not output:
+            raise click.UsageError("--pstats needs an --output file.")
+        pstats.Stats(*paths).dump_stats(output)
+    else:
+        stacks = Counter()
+        for path in paths:
+            stacks.update(read_collapsed(path))
+        if output:
+            write_collapsed(output, stacks)
+        else:
+            for stack, count in stacks.most_common():
+                click.echo(f"{stack} {count}")
+    click.echo(f"Aggregated {len(paths)} profiles.", err=True)
@@ -0,0 +1,52 @@
+import json
+
+from app.utils.regexes import RE_SQL_STRING_LITERAL, RE_WHITESPACE
+
+
+def scrub_statement(statement):
+    """Return the statement on one line with inlined string literals
+    masked; bound parameters are never part of the text."""
+    statement = RE_SQL_STRING_LITERAL.sub("'?'", statement)
+    return RE_WHITESPACE.sub(" ", statement).strip()
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def get_slow_request_record(stats, duration):
+    return {
+        "endpoint": stats.endpoint,
+        "method": stats.method,
+        "path": stats.path,
+        "status": stats.status,
+        "duration_ms": _ms(duration),
+        "sql_count": stats.sql_count,
+        "sql_ms": _ms(stats.sql_seconds),
+        "phases_ms": {phase: _ms(seconds)
+                      for phase, seconds in stats.phases.items()},
+        "statements": [{"statement": scrub_statement(statement),
+                        "duration_ms": _ms(seconds)}
+                       for statement, seconds in stats.statements],
+        # statements past SLOW_REQUEST_MAX_STATEMENTS are only counted
+        "statements_dropped": stats.sql_count - len(stats.statements),
+    }
+
+
+def log_slow_request(logger, stats, duration):
+    record = get_slow_request_record(stats, duration)
+    logger.warning(
+        f"Slow request {stats.method} {stats.endpoint} took "
+        f"{record['duration_ms']} ms: "
+        f"{json.dumps(record, separators=(',', ':'))}",
+        extra={"slow_request": record})
+
+
+def log_slow_query(logger, endpoint, statement, seconds):
+    record = {"endpoint": endpoint,
+              "statement": scrub_statement(statement),
+              "duration_ms": _ms(seconds)}
+    logger.warning(
+        f"Slow query took {record['duration_ms']} ms: "
+        f"{json.dumps(record, separators=(',', ':'))}",
+        extra={"slow_query": record})
@@ -0,0 +1,231 @@
+import time
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import \
+    and_, case, column, event, func, literal_column, select, table, text
+from werkzeug.utils import import_string
+
+from app.boards.board_models import Card
+from app.db import db
+
+
+search_cli = AppGroup("search", help="Manage the card search index.")
+
+cards_fts = table("cards_fts", column("rowid"))
+
+
+class SqliteFtsSearchBackend:
+    """FTS5 index over card titles and descriptions, kept in sync by
+    triggers on the cards table"""
+
+    SCHEMA = (
+        # external content: the index stores no copy of the text; the
+        # prefix indexes make short prefix queries cheap. Entries are keyed
+        # by cards.search_id, as the rowid of a table with a string primary
+        # key is renumbered by VACUUM
+        "CREATE VIRTUAL TABLE IF NOT EXISTS cards_fts USING fts5("
+        "title, description, content='cards', content_rowid='search_id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        # the key only ever grows, so no entry is handed a deleted card's
+        "CREATE TRIGGER IF NOT EXISTS cards_fts_insert "
+        "AFTER INSERT ON cards BEGIN "
+        "UPDATE cards SET search_id = "
+        "(SELECT coalesce(max(search_id), 0) + 1 FROM cards) "
+        "WHERE id = new.id AND search_id IS NULL; "
+        "INSERT INTO cards_fts(rowid, title, description) "
+        "SELECT search_id, title, description FROM cards "
+        "WHERE id = new.id AND NOT archived; END",
+        "CREATE TRIGGER IF NOT EXISTS cards_fts_delete "
+        "AFTER DELETE ON cards WHEN NOT old.archived BEGIN "
+        "INSERT INTO cards_fts(cards_fts, rowid, title, description) "
+        "VALUES ('delete', old.search_id, old.title, old.description); END",
+        # moves only rewrite column_id and rank, so they never fire this;
+        # one trigger, as the old entry must go before the new one is added
+        "CREATE TRIGGER IF NOT EXISTS cards_fts_update "
+        "AFTER UPDATE OF title, description, archived ON cards BEGIN "
+        "INSERT INTO cards_fts(cards_fts, rowid, title, description) "
+        "SELECT 'delete', old.search_id, old.title, old.description "
+        "WHERE NOT old.archived; "
+        "INSERT INTO cards_fts(rowid, title, description) "
+        "SELECT new.search_id, new.title, new.description "
+        "WHERE NOT new.archived; END",
+    )
+
+    def create_schema(self, connection):
+        for statement in self.SCHEMA:
+            connection.execute(text(statement))
+
+    def drop_schema(self, connection):
+        connection.execute(text("DROP TABLE IF EXISTS cards_fts"))
+
+    def rebuild(self, connection):
+        # cards from before the index have no key yet; every new key is
+        # above the current largest, and rowids are unique
+        connection.execute(text(
+            "UPDATE cards SET search_id = "
+            "(SELECT coalesce(max(search_id), 0) FROM cards) + rowid "
+            "WHERE search_id IS NULL"))
+        connection.execute(text(
+            "INSERT INTO cards_fts(cards_fts) VALUES ('delete-all')"))
+        return connection.execute(text(
+            "INSERT INTO cards_fts(rowid, title, description) "
+            "SELECT search_id, title, description FROM cards "
+            "WHERE NOT archived")).rowcount
+
+    def search_query(self, board_id, terms):
+        match = " ".join(
+            f'"{term}"' + ("*" if prefix else "") for term, prefix in terms)
+        fts = literal_column("cards_fts")
+        # MATCH is only allowed as a filter, so the title-only match is a
+        # separate, uncorrelated lookup of the index
+        title_matches = (
+            select(cards_fts.c.rowid).select_from(cards_fts)
+            .where(fts.op("MATCH")(f"title : ({match})")).correlate(None))
+        relevance = case(
+            (Card.search_id.in_(title_matches), 0), else_=1).label("relevance")
+        query = (
+            select(Card.id, Card.column_id, Card.title, Card.description,
+                   Card.rank, relevance)
+            .select_from(cards_fts)
+            .join(Card, Card.search_id == cards_fts.c.rowid)
+            .where(fts.op("MATCH")(match), Card.board_id == board_id))
+        return query, relevance
+
+
+class PostgresSearchBackend:
+    """tsvector search over an expression GIN index, which Postgres keeps
+    up to date by itself"""
+
+    INDEX_NAME = "ix_cards_search"
+
+    def _document(self):
+        # inlined literals, so the expression matches the index's
+        simple = literal_column("'simple'")
+        return func.setweight(
+            func.to_tsvector(simple, Card.title),
+            literal_column("'A'")).op("||")(
+            func.setweight(
+                func.to_tsvector(simple, Card.description),
+                literal_column("'B'")))
+
+    def create_schema(self, connection):
+        # the query has to repeat this exact expression to use the index
+        connection.execute(text(
+            f"CREATE INDEX IF NOT EXISTS {self.INDEX_NAME} ON cards "
+            "USING gin ((setweight(to_tsvector('simple', title), 'A') || "
+            "setweight(to_tsvector('simple', description), 'B'))) "
+            "WHERE NOT archived"))
+
+    def drop_schema(self, connection):
+        connection.execute(text(f"DROP INDEX IF EXISTS {self.INDEX_NAME}"))
+
+    def rebuild(self, connection):
+        connection.execute(text(f"REINDEX INDEX {self.INDEX_NAME}"))
+        return connection.execute(
+            select(func.count()).select_from(Card)
+            .where(Card.archived.is_(False))).scalar()
+
+    def search_query(self, board_id, terms):
+        tsquery = func.to_tsquery(literal_column("'simple'"), " & ".join(
+            term + (":*" if prefix else "") for term, prefix in terms))
+        document = self._document()
+        relevance = case(
+            (func.to_tsvector(literal_column("'simple'"), Card.title)
+             .op("@@")(tsquery), 0), else_=1).label("relevance")
+        query = (
+            select(Card.id, Card.column_id, Card.title, Card.description,
+                   Card.rank, relevance)
+            .where(document.op("@@")(tsquery),
+                   Card.archived.is_(False),
+                   Card.board_id == board_id))
+        return query, relevance
+
+
+class LikeSearchBackend:
+    """Unindexed fallback for other databases, scanning the board's cards"""
+
+    def create_schema(self, connection):
+        pass
+
+    def drop_schema(self, connection):
+        pass
+
+    def rebuild(self, connection):
+        return 0
+
+    def search_query(self, board_id, terms):
+        in_title = [Card.title.icontains(term, autoescape=True)
+                    for term, _ in terms]
+        conditions = [
+            title | Card.description.icontains(term, autoescape=True)
+            for title, (term, _) in zip(in_title, terms)]
+        relevance = case((and_(*in_title), 0), else_=1).label("relevance")
+        query = (
+            select(Card.id, Card.column_id, Card.title, Card.description,
+                   Card.rank, relevance)
+            .where(and_(*conditions), Card.archived.is_(False),
+                   Card.board_id == board_id))
+        return query, relevance
+
+
+SEARCH_BACKENDS = {
+    "sqlite": SqliteFtsSearchBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+class CardSearch:
+    """Picks the search backend for the configured database"""
+
+    def __init__(self, app=None):
+        self.backend = None
+        # keep the search schema alongside the tables, so that
+        # create_all/drop_all (as used by the tests and "flask db create")
+        # manage it too; the schema statements are idempotent, so it is
+        # also added to a database whose tables already exist
+        event.listen(db.metadata, "after_create", self._after_create)
+        event.listen(db.metadata, "before_drop", self._before_drop)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("SEARCH_BACKEND", None)
+        app.cli.add_command(search_cli)
+
+        with app.app_context():
+            backend = app.config["SEARCH_BACKEND"]
+            if backend:
+                self.backend = import_string(backend)()
+            else:
+                self.backend = SEARCH_BACKENDS.get(
+                    db.engine.dialect.name, LikeSearchBackend)()
+            # for databases created before search existed; existing
+            # cards are indexed with "flask search rebuild"
+            if app.config.get("DB_CREATE_ALL", True):
+                with db.engine.begin() as connection:
+                    self.backend.create_schema(connection)
+        app.extensions["card_search"] = self
+
+    def _after_create(self, target, connection, **kwargs):
+        if self.backend is not None:
+            self.backend.create_schema(connection)
+
+    def _before_drop(self, target, connection, **kwargs):
+        if self.backend is not None:
+            self.backend.drop_schema(connection)
+
+
+card_search = CardSearch()
+
+
+@search_cli.command("rebuild")
+def rebuild_command():
+    """Index every card again, e.g. after a backfill."""
+    backend = current_app.extensions["card_search"].backend
+    start = time.perf_counter()
+    with db.engine.begin() as connection:
+        indexed = backend.rebuild(connection)
+    click.echo(f"Indexed {indexed} cards in "
+               f"{time.perf_counter() - start:.3f}s")
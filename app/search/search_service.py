@@ -0,0 +1,45 @@
+from app.boards.board_models import Card
+from app.boards.board_service import get_board_by_id
+from app.exceptions.custom_exceptions import UserActionError, ValidationError
+from app.search.search_backends import card_search
+from app.utils.pagination import get_page_size, paginate
+from app.utils.regexes import RE_SEARCH_TERM
+
+
+SEARCH_MAX_TERMS = 8
+
+
+def parse_search_terms(query):
+    # words only, so no query syntax reaches the backend; a trailing *
+    # asks for a prefix match
+    if not isinstance(query, str) or not query.strip():
+        raise UserActionError("Please provide a search query.")
+    terms = [(match.group(1), bool(match.group(2)))
+             for match in RE_SEARCH_TERM.finditer(query)]
+    if not terms:
+        raise ValidationError("The search query must contain a word.")
+    if len(terms) > SEARCH_MAX_TERMS:
+        raise ValidationError(
+            f"The search query can have at most {SEARCH_MAX_TERMS} words.")
+    return terms
+
+
+def search_cards(board_id, args):
+    board = get_board_by_id(board_id)
+    terms = parse_search_terms(args.get("q"))
+
+    query, relevance = card_search.backend.search_query(board.id, terms)
+    # title matches first, then by card id. Scores such as bm25 depend on
+    # every other indexed card and shift whenever one is written, so they
+    # cannot key a cursor; a card's relevance only changes with its own text
+    rows, next_cursor = paginate(
+        query, (relevance, Card.id), args.get("cursor"),
+        get_page_size(args.get("limit")))
+
+    return {
+        "status": 200,
+        "cards": [{"id": row.id, "column_id": row.column_id,
+                   "title": row.title, "description": row.description,
+                   "rank": row.rank} for row in rows],
+        "next_cursor": next_cursor
+    }
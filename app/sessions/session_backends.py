@@ -0,0 +1,237 @@
+import os
+import pickle
+import threading
+import time
+
+from flask import current_app
+from flask.sessions import SecureCookieSessionInterface
+from flask_session import Session
+from flask_session.sessions import \
+    ServerSideSession, ServerSideSessionInterface, SqlAlchemySessionInterface
+from itsdangerous import want_bytes
+from sqlalchemy import bindparam
+
+from app.sessions.session_sweeper import init_session_sweeper, utcnow
+from app.utils.ttl_cache import TTLCache as MemorySessionStore
+
+
+sess = Session()
+
+
+class MemorySession(ServerSideSession):
+    pass
+
+
+class MemorySessionInterface(ServerSideSessionInterface):
+    """Keeps sessions in process memory, for single-node deployments"""
+    session_class = MemorySession
+
+    def __init__(self, maxsize, key_prefix, use_signer, permanent,
+                 sid_length):
+        self.store = MemorySessionStore(maxsize)
+        super().__init__(
+            self.store, key_prefix, use_signer, permanent, sid_length)
+
+    def fetch_session(self, sid):
+        data = self.store.get(self.key_prefix + sid)
+        if data is None:
+            return self.session_class(sid=sid, permanent=self.permanent)
+        return self.session_class(dict(data), sid=sid)
+
+    def save_session(self, app, session, response):
+        if not self.should_set_cookie(app, session):
+            return
+
+        store_id = self.key_prefix + session.sid
+
+        # If the session was emptied, drop it and delete the cookie
+        if not session:
+            if session.modified:
+                self.store.delete(store_id)
+                response.delete_cookie(
+                    app.config["SESSION_COOKIE_NAME"],
+                    domain=self.get_cookie_domain(app),
+                    path=self.get_cookie_path(app))
+            return
+
+        expiration_datetime = self.get_expiration_time(app, session)
+        if expiration_datetime is not None:
+            expires_at = expiration_datetime.timestamp()
+        else:
+            # browser sessions still need a server-side lifetime
+            expires_at = time.time() + \
+                app.permanent_session_lifetime.total_seconds()
+        self.store.set(store_id, dict(session), expires_at)
+
+        self.set_cookie_to_response(
+            app, session, response, expiration_datetime)
+
+
+class BufferedSqlAlchemySessionInterface(SqlAlchemySessionInterface):
+    """SQLAlchemy sessions whose expiry refreshes are written behind.
+
+    An unmodified session only has its expiry refreshed once
+    ``touch_fraction`` of its lifetime has elapsed, and the refreshes are
+    written by a background thread in one bulk UPDATE every
+    ``flush_interval`` seconds, so no request waits on the batch.
+    """
+
+    def __init__(self, app, *args, touch_fraction, flush_interval,
+                 **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self.app = app
+        self.touch_fraction = touch_fraction
+        self.flush_interval = flush_interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flusher_pid = None
+
+    def fetch_session(self, sid):
+        store_id = self.key_prefix + sid
+        record = self.sql_session_model.query.filter_by(
+            session_id=store_id).first()
+        if record is None:
+            return self.session_class(sid=sid, permanent=self.permanent)
+
+        expiry = record.expiry
+        with self._lock:
+            pending_expiry = self._pending.get(store_id)
+        if pending_expiry is not None and expiry is not None:
+            expiry = max(expiry, pending_expiry)
+
+        if expiry is None or expiry <= utcnow():
+            self.db.session.delete(record)
+            self.db.session.commit()
+            return self.session_class(sid=sid, permanent=self.permanent)
+
+        try:
+            session_data = self.serializer.loads(want_bytes(record.data))
+        except pickle.UnpicklingError:
+            return self.session_class(sid=sid, permanent=self.permanent)
+        session = self.session_class(session_data, sid=sid)
+        session.stored_expiry = expiry
+        return session
+
+    def save_session(self, app, session, response):
+        stored_expiry = getattr(session, "stored_expiry", None)
+        if session.modified or not session or stored_expiry is None:
+            # data changed, so write through; it also sets the expiry
+            with self._lock:
+                self._pending.pop(self.key_prefix + session.sid, None)
+            super().save_session(app, session, response)
+        elif self.should_set_cookie(app, session):
+            lifetime = app.permanent_session_lifetime
+            elapsed = lifetime - (stored_expiry - utcnow())
+            expiration_datetime = self.get_expiration_time(app, session)
+            if expiration_datetime is None:
+                # a browser session has no expiry to refresh, so it is
+                # saved the way the parent interface saves it
+                super().save_session(app, session, response)
+            elif elapsed >= lifetime * self.touch_fraction:
+                with self._lock:
+                    self._pending[self.key_prefix + session.sid] = \
+                        expiration_datetime.replace(tzinfo=None)
+                self.set_cookie_to_response(
+                    app, session, response, expiration_datetime)
+                self._start_flusher()
+
+    def _start_flusher(self):
+        # one thread per process; a forked worker starts its own
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+        threading.Thread(target=self._run_flusher,
+                         name="session-touch-flusher", daemon=True).start()
+
+    def _run_flusher(self):
+        while True:
+            time.sleep(self.flush_interval)
+            with self.app.app_context():
+                self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        table = self.sql_session_model.__table__
+        statement = table.update() \
+            .where(table.c.session_id == bindparam("store_id")) \
+            .values(expiry=bindparam("new_expiry"))
+        try:
+            self.db.session.execute(statement, [
+                {"store_id": store_id, "new_expiry": expiry}
+                for store_id, expiry in pending.items()])
+            self.db.session.commit()
+        except Exception as e:
+            self.db.session.rollback()
+            current_app.logger.error(
+                f"Error flushing {len(pending)} session touches: {e}")
+            return 0
+        return len(pending)
+
+
+class SchemaManagedDb:
+    """The app's db for Flask-Session, minus the create_all its SQLAlchemy
+    interface runs on every start; the sessions table is then created
+    with the rest of the schema by "flask db create"."""
+
+    def __init__(self, db):
+        self._db = db
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+    def create_all(self, *args, **kwargs):
+        pass
+
+
+def _common_params(app):
+    return {
+        "key_prefix": app.config.get("SESSION_KEY_PREFIX", "session:"),
+        "use_signer": app.config.get("SESSION_USE_SIGNER", False),
+        "permanent": app.config.get("SESSION_PERMANENT", True),
+        "sid_length": app.config.get("SESSION_ID_LENGTH", 32),
+    }
+
+
+def init_sessions(app):
+    app.config.setdefault("SESSION_TYPE", "sqlalchemy")
+    app.config.setdefault("SESSION_MEMORY_MAXSIZE", 10000)
+    app.config.setdefault("SESSION_TOUCH_FRACTION", 0)
+    app.config.setdefault("SESSION_TOUCH_FLUSH_INTERVAL", 5)
+
+    session_type = app.config["SESSION_TYPE"]
+    if session_type == "memory":
+        app.session_interface = MemorySessionInterface(
+            app.config["SESSION_MEMORY_MAXSIZE"], **_common_params(app))
+    elif session_type == "cookie":
+        # Flask's signed cookie session: no server-side state at all
+        app.session_interface = SecureCookieSessionInterface()
+    elif session_type == "sqlalchemy" and (
+            app.config["SESSION_TOUCH_FRACTION"]
+            or not app.config.get("DB_CREATE_ALL", True)):
+        params = _common_params(app)
+        interface_class = SqlAlchemySessionInterface
+        if app.config["SESSION_TOUCH_FRACTION"]:
+            interface_class = BufferedSqlAlchemySessionInterface
+            params.update(
+                touch_fraction=app.config["SESSION_TOUCH_FRACTION"],
+                flush_interval=app.config["SESSION_TOUCH_FLUSH_INTERVAL"])
+        session_db = app.config["SESSION_SQLALCHEMY"]
+        if not app.config.get("DB_CREATE_ALL", True):
+            session_db = SchemaManagedDb(session_db)
+        app.session_interface = interface_class(
+            app,
+            session_db,
+            app.config.get("SESSION_SQLALCHEMY_TABLE", "sessions"),
+            app.config.get("SESSION_SQLALCHEMY_SEQUENCE"),
+            app.config.get("SESSION_SQLALCHEMY_SCHEMA"),
+            app.config.get("SESSION_SQLALCHEMY_BIND_KEY"),
+            **params)
+    else:
+        sess.init_app(app)
+
+    init_session_sweeper(app)
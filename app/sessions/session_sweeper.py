@@ -0,0 +1,145 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import Index, delete, or_, select
+
+from app.db import db
+from app.utils.metrics import registry
+
+
+sessions_swept = registry.counter(
+    "sessions_swept_total",
+    "Expired rows deleted from the sessions table.")
+
+sessions_cli = AppGroup("sessions", help="Manage server-side sessions.")
+
+
+def utcnow():
+    # the sessions table stores naive UTC datetimes
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def get_session_table(app):
+    # only the SQLAlchemy backend keeps sessions in the database
+    session_model = getattr(app.session_interface, "sql_session_model", None)
+    return session_model.__table__ if session_model is not None else None
+
+
+def sweep_expired_sessions(table, batch_size, grace=0):
+    removed = 0
+    start = time.perf_counter()
+    while True:
+        # small batches keep each write transaction (and lock) short
+        expired_ids = select(table.c.id).where(or_(
+            table.c.expiry.is_(None),
+            table.c.expiry <= utcnow() - timedelta(seconds=grace))) \
+            .limit(batch_size)
+        result = db.session.execute(
+            delete(table).where(table.c.id.in_(expired_ids.scalar_subquery())))
+        db.session.commit()
+        removed += result.rowcount
+        if result.rowcount < batch_size:
+            break
+
+    sessions_swept.inc(removed)
+    return removed, time.perf_counter() - start
+
+
+def sweep_sessions(app, table, batch_size):
+    """Sweep expired sessions without losing buffered expiry refreshes."""
+    interface = app.session_interface
+    grace = 0
+    if hasattr(interface, "flush"):
+        # this process's refreshes are written first; those still
+        # buffered in other processes land within one flush interval
+        interface.flush()
+        grace = interface.flush_interval
+    return sweep_expired_sessions(table, batch_size, grace)
+
+
+class SessionSweeper:
+    """Background thread that periodically deletes expired sessions.
+
+    Off by default, as every process would start one; enable it in a
+    single process or run "flask sessions sweep" on a schedule instead.
+    """
+
+    def __init__(self, app, table, interval, batch_size):
+        self.app = app
+        self.table = table
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="session-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            with self.app.app_context():
+                try:
+                    removed, elapsed = sweep_sessions(
+                        self.app, self.table, self.batch_size)
+                    if removed:
+                        self.app.logger.info(
+                            f"Removed {removed} expired sessions "
+                            f"in {elapsed:.3f}s")
+                except Exception as e:
+                    db.session.rollback()
+                    self.app.logger.error(
+                        f"Error sweeping expired sessions: {e}")
+
+
+@sessions_cli.command("sweep")
+@click.option("--batch-size", type=int, default=None,
+              help="Rows deleted per transaction.")
+def sweep_command(batch_size):
+    """Delete expired sessions from the sessions table."""
+    table = get_session_table(current_app)
+    if table is None:
+        click.echo("The configured session backend has no sessions table.")
+        return
+    removed, elapsed = sweep_sessions(
+        current_app, table,
+        batch_size or current_app.config["SESSION_SWEEP_BATCH_SIZE"])
+    click.echo(f"Removed {removed} expired sessions in {elapsed:.3f}s")
+
+
+def init_session_sweeper(app):
+    app.config.setdefault("SESSION_SWEEP_INTERVAL", 0)
+    app.config.setdefault("SESSION_SWEEP_BATCH_SIZE", 500)
+    app.cli.add_command(sessions_cli)
+
+    table = get_session_table(app)
+    if table is None:
+        return None
+
+    # lets each sweep batch find expired rows without a full scan
+    index_name = f"ix_{table.name}_expiry"
+    index = next((i for i in table.indexes if i.name == index_name), None)
+    if index is None:
+        index = Index(index_name, table.c.expiry)
+    # otherwise created along with the table by "flask db create"
+    if app.config.get("DB_CREATE_ALL", True):
+        with app.app_context():
+            index.create(db.engine, checkfirst=True)
+
+    if not app.config["SESSION_SWEEP_INTERVAL"]:
+        return None
+    sweeper = SessionSweeper(
+        app, table,
+        app.config["SESSION_SWEEP_INTERVAL"],
+        app.config["SESSION_SWEEP_BATCH_SIZE"])
+    sweeper.start()
+    app.extensions["session_sweeper"] = sweeper
+    return sweeper
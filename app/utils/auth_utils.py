@@ -1,7 +1,9 @@
 from flask import session
 from functools import wraps
 
-from app.exceptions.custom_exceptions import UnauthorizedError
+from app.boards.board_acl import board_acl, role_allows
+from app.exceptions.custom_exceptions import \
+    ForbiddenError, NotFoundError, UnauthorizedError
 
 
 def login_required(f):
@@ -12,3 +14,22 @@ def login_required(f):
                 "Please log in to access this resource.")
         return f(*args, **kwargs)
     return decorated_function
+
+
+def board_access_required(role):
+    """Require the logged in user to have at least ``role`` on the board
+    in the route's ``board_id``, checked against the cached ACL."""
+    def decorator(f):
+        @wraps(f)
+        @login_required
+        def decorated_function(*args, **kwargs):
+            board_role = board_acl.get_role(session["id"], kwargs["board_id"])
+            # boards of other users are reported as missing, not forbidden
+            if board_role is None:
+                raise NotFoundError("The requested board does not exist.")
+            if not role_allows(board_role, role):
+                raise ForbiddenError(
+                    f"You need {role} access to this board to do that.")
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
@@ -0,0 +1,126 @@
+import os
+import queue
+import threading
+from collections import deque
+
+from app.utils.metrics import registry
+
+
+event_hub_subscribers = registry.gauge(
+    "event_hub_subscribers",
+    "Open event stream subscriptions in this process.")
+event_hub_published = registry.counter(
+    "event_hub_published_total",
+    "Events published to the in-process hub.")
+event_hub_dropped = registry.counter(
+    "event_hub_dropped_total",
+    "Subscriptions dropped because their queue was full.")
+
+
+class Subscription:
+    """Bounded event queue of a single subscriber"""
+
+    def __init__(self, topic, maxsize):
+        self.topic = topic
+        self.maxsize = maxsize
+        self.dropped = False
+        self._events = deque()
+        self._ready = threading.Condition(threading.Lock())
+
+    def put(self, event):
+        # never blocks: a full queue drops the subscriber instead
+        with self._ready:
+            if self.dropped:
+                return False
+            if len(self._events) >= self.maxsize:
+                self.dropped = True
+                self._events.clear()
+            else:
+                self._events.append(event)
+            self._ready.notify()
+            return not self.dropped
+
+    def get(self, timeout=None):
+        # None on timeout, and from then on once the subscriber is dropped
+        with self._ready:
+            if not self._events and not self.dropped:
+                self._ready.wait(timeout)
+            return self._events.popleft() if self._events else None
+
+
+class EventHub:
+    """In-process publish/subscribe fan-out keyed by topic.
+
+    Only subscribers in the same process are reached, so with several
+    worker processes each keeps its own subscribers.
+    """
+
+    def __init__(self):
+        self._topics = {}
+        self._lock = threading.Lock()
+        self._pending = queue.SimpleQueue()
+        self._dispatcher = None
+        self._dispatcher_pid = None
+
+    def subscribe(self, topic, maxsize=100):
+        subscription = Subscription(topic, maxsize)
+        with self._lock:
+            self._topics.setdefault(topic, set()).add(subscription)
+        event_hub_subscribers.inc()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._topics.get(subscription.topic)
+            if subscriptions is None or subscription not in subscriptions:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._topics[subscription.topic]
+        event_hub_subscribers.dec()
+
+    def has_subscribers(self, topic):
+        return topic in self._topics
+
+    def publish(self, topic, event):
+        # the writer only enqueues; a single dispatcher thread does the
+        # fan-out, in publish order
+        if not self.has_subscribers(topic):
+            return False
+        self._ensure_dispatcher()
+        self._pending.put((topic, event))
+        return True
+
+    def deliver(self, topic, event):
+        # copy under the lock, deliver outside it so subscribers
+        # can come and go while a delivery is in progress
+        with self._lock:
+            subscriptions = tuple(self._topics.get(topic, ()))
+        event_hub_published.inc()
+
+        delivered = 0
+        for subscription in subscriptions:
+            if subscription.put(event):
+                delivered += 1
+            else:
+                self.unsubscribe(subscription)
+                event_hub_dropped.inc()
+        return delivered
+
+    def _ensure_dispatcher(self):
+        # threads do not survive a fork, so each process starts its own
+        if self._dispatcher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._dispatcher_pid != os.getpid():
+                self._dispatcher = threading.Thread(
+                    target=self._dispatch, name="event-hub", daemon=True)
+                self._dispatcher.start()
+                self._dispatcher_pid = os.getpid()
+
+    def _dispatch(self):
+        while True:
+            self.deliver(*self._pending.get())
+
+
+hub = EventHub()
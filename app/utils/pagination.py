@@ -0,0 +1,81 @@
+from flask import current_app
+from itsdangerous import BadData, URLSafeSerializer
+from sqlalchemy import tuple_
+
+from app.db import db
+from app.exceptions.custom_exceptions import \
+    DatabaseOperationError, ValidationError
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def _serializer():
+    return URLSafeSerializer(current_app.secret_key, salt="page-cursor")
+
+
+def _sort_name(columns, descending):
+    # a cursor is only valid for the sort order that produced it
+    return ",".join(str(column) for column in columns) + \
+        (" desc" if descending else "")
+
+
+def encode_cursor(columns, values, descending=False):
+    return _serializer().dumps([_sort_name(columns, descending), values])
+
+
+def decode_cursor(cursor, columns, descending=False):
+    try:
+        sort_name, values = _serializer().loads(cursor)
+        if sort_name != _sort_name(columns, descending) \
+                or len(values) != len(columns):
+            raise ValueError(sort_name)
+        return values
+    except (BadData, ValueError, TypeError):
+        raise ValidationError("The page cursor is invalid.")
+
+
+def get_page_size(limit):
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        limit = 0
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValidationError(
+            f"The page size must be between 1 and {MAX_PAGE_SIZE}.")
+    return limit
+
+
+def paginate(query, columns, cursor=None, limit=DEFAULT_PAGE_SIZE,
+             descending=False):
+    """Return a page of rows after the cursor and the next page's cursor.
+
+    ``columns`` is the sort key and must end with a unique column; its
+    values have to survive a JSON round trip (strings and numbers). The
+    query must select every sort column by name, and an index on them (in
+    order, after any equality filters) lets each page start with a seek
+    instead of skipping rows, so deep pages cost the same as the first.
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns, descending)
+        key = tuple_(*columns)
+        query = query.where(key < tuple_(*values) if descending
+                            else key > tuple_(*values))
+    order = [column.desc() if descending else column for column in columns]
+    try:
+        # one extra row tells whether there is a next page
+        rows = db.session.execute(
+            query.order_by(*order).limit(limit + 1)).all()
+    except Exception as e:
+        raise DatabaseOperationError("Error getting page: " + str(e))
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(
+            columns, [getattr(rows[-1], column.key) for column in columns],
+            descending)
+    return rows, next_cursor
@@ -0,0 +1,84 @@
+# Base-62 digits in ASCII order, so rank keys sort correctly as plain
+# strings (and with a binary collation in the database). Generated keys
+# never end with the lowest digit, which guarantees there is always room
+# for another key between any two neighbours.
+RANK_DIGITS = \
+    "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_BASE = len(RANK_DIGITS)
+_DIGIT_VALUES = {digit: value for value, digit in enumerate(RANK_DIGITS)}
+
+
+def rank_between(before=None, after=None):
+    """Return a rank key sorting strictly between two keys.
+
+    ``None`` stands for the start (``before``) or end (``after``) of the
+    list, so ``rank_between(last_rank, None)`` appends.
+    """
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"{before!r} does not sort before {after!r}")
+
+    before = before or ""
+    rank = []
+    i = 0
+    while True:
+        low = _DIGIT_VALUES[before[i]] if i < len(before) else 0
+        high = _DIGIT_VALUES[after[i]] \
+            if after is not None and i < len(after) else _BASE
+        if high - low > 1:
+            rank.append(RANK_DIGITS[(low + high) // 2])
+            return "".join(rank)
+        rank.append(RANK_DIGITS[low])
+        if high - low == 1:
+            # the prefix already sorts below after, so it stops bounding
+            after = None
+        i += 1
+
+
+def rank_after(before=None):
+    """Return a short rank key sorting after ``before``, for appends.
+
+    The first digit of ``before`` that is not the highest is bumped and
+    the rest dropped, so keys grow by one digit per 61 appends instead
+    of one per 6 with ``rank_between(before, None)``.
+    """
+    if not before:
+        return rank_between()
+    for i, digit in enumerate(before):
+        value = _DIGIT_VALUES[digit]
+        if value < _BASE - 1:
+            return before[:i] + RANK_DIGITS[value + 1]
+    return before + RANK_DIGITS[1]
+
+
+def _encode(value, width):
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, _BASE)
+        digits.append(RANK_DIGITS[digit])
+    # trailing zeros do not change the order of fixed-width keys
+    return "".join(reversed(digits)).rstrip(RANK_DIGITS[0])
+
+
+def rank_sequence(count):
+    """Return ``count`` short, evenly spaced, ascending rank keys."""
+    width = 1
+    while _BASE ** width <= count + 1:
+        width += 1
+    # one extra digit leaves room for inserts without growing keys
+    width += 1
+    step = _BASE ** width // (count + 1)
+    return [_encode(step * (i + 1), width) for i in range(count)]
+
+
+def rank_range(before=None, after=None, count=1):
+    """Return ``count`` ascending rank keys between two keys.
+
+    Keys are placed by bisection, so they grow by about one digit per
+    doubling of ``count`` instead of one digit per key.
+    """
+    if count <= 0:
+        return []
+    middle = count // 2
+    rank = rank_between(before, after)
+    return (rank_range(before, rank, middle) + [rank]
+            + rank_range(rank, after, count - middle - 1))
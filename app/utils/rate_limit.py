@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request
+from werkzeug.utils import import_string
+
+from app.exceptions.custom_exceptions import TooManyRequestsError
+from app.utils.metrics import registry
+
+
+rate_limit_rejected = registry.counter(
+    "rate_limit_rejected_total",
+    "Requests rejected by a rate limit.")
+
+
+class MemoryRateLimitBackend:
+    """In-process token buckets, evicting the least recently used keys"""
+
+    def __init__(self, maxsize=100000, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.clock = clock
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _tokens(self, key, capacity, refill_rate, now):
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        return min(capacity, tokens + (now - updated_at) * refill_rate)
+
+    def consume(self, key, capacity, refill_rate):
+        with self._lock:
+            now = self.clock()
+            tokens = self._tokens(key, capacity, refill_rate, now)
+            allowed = tokens >= 1
+            self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+            return allowed
+
+    def refund(self, key, capacity, refill_rate):
+        with self._lock:
+            now = self.clock()
+            tokens = self._tokens(key, capacity, refill_rate, now)
+            self._buckets[key] = (min(capacity, tokens + 1), now)
+
+    def reset(self, key):
+        with self._lock:
+            self._buckets.pop(key, None)
+
+
+class RateLimiter:
+    """Token-bucket limits of N requests per RATE_LIMIT_WINDOW seconds"""
+
+    def __init__(self, app=None):
+        self.backend = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("RATE_LIMIT_ENABLED", True)
+        app.config.setdefault("RATE_LIMIT_BACKEND", "memory")
+        app.config.setdefault("RATE_LIMIT_WINDOW", 60)
+        app.config.setdefault("LOGIN_IP_RATE_LIMIT", 30)
+        app.config.setdefault("LOGIN_FAILED_RATE_LIMIT", 5)
+
+        backend = app.config["RATE_LIMIT_BACKEND"]
+        if backend == "memory":
+            self.backend = MemoryRateLimitBackend()
+        else:
+            # any object with consume/refund/reset, e.g. a shared store
+            self.backend = import_string(backend)()
+        app.extensions["rate_limiter"] = self
+
+    def _bucket(self, scope, key, limit):
+        window = current_app.config["RATE_LIMIT_WINDOW"]
+        return f"{scope}:{key}", limit, limit / window
+
+    def _reject(self, scope):
+        rate_limit_rejected.inc(scope=scope)
+        raise TooManyRequestsError(
+            "Too many requests. Please wait a moment and try again.")
+
+    def _enabled(self, limit):
+        return current_app.config["RATE_LIMIT_ENABLED"] and limit
+
+    def hit(self, scope, key, limit):
+        """Consume a token, rejecting the request if none is left."""
+        if self._enabled(limit) and not self.backend.consume(
+                *self._bucket(scope, key, limit)):
+            self._reject(scope)
+
+    def refund(self, scope, key, limit):
+        """Give back a token taken by hit() for an event that, in the
+        end, should not count against the limit."""
+        if self._enabled(limit):
+            self.backend.refund(*self._bucket(scope, key, limit))
+
+
+limiter = RateLimiter()
+
+
+def rate_limited(scope, limit_config):
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            limiter.hit(scope, request.remote_addr,
+                        current_app.config[limit_config])
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
@@ -1,3 +1,22 @@
-RE_EMAIL_VALIDATION = r"^([0-9a-zA-Z]([-_\\.]*[0-9a-zA-Z]+)*)@([0-9a-zA-Z]([-_\\.]*[0-9a-zA-Z]+)*)[\\.]([a-zA-Z]{2,9})$"
-RE_USERNAME_VALIDATION = r"^[a-zA-Z0-9_.]*$"
-RE_PASSWORD_VALIDATION = r"^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)[a-zA-Z\d]{8,}$"
+import re
+
+# Compiled once at import and always used with fullmatch. Every repetition
+# in the email pattern starts with a separator, so an alphanumeric run can
+# only be split one way and matching stays linear in the input length.
+RE_EMAIL_VALIDATION = re.compile(
+    r"[0-9a-zA-Z]+(?:[-_.]+[0-9a-zA-Z]+)*"
+    r"@[0-9a-zA-Z]+(?:[-_.]+[0-9a-zA-Z]+)*"
+    r"\.[a-zA-Z]{2,9}")
+RE_USERNAME_VALIDATION = re.compile(r"[a-zA-Z0-9_.]*")
+RE_PASSWORD_VALIDATION = re.compile(
+    r"(?=.*[a-z])(?=.*[A-Z])(?=.*\d)[a-zA-Z\d]{8,}")
+
+# Search words, each optionally followed by * for a prefix match. Used
+# with finditer, so anything between words (including query syntax of the
+# search backends) is skipped.
+RE_SEARCH_TERM = re.compile(r"(\w+)(\*?)")
+
+# SQL string literals (with '' escapes) and runs of whitespace, used to
+# put logged statements on one line without any inlined values.
+RE_SQL_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+RE_WHITESPACE = re.compile(r"\s+")
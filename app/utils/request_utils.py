@@ -1,3 +1,4 @@
+import hmac
 from json import loads, JSONDecodeError
 from functools import wraps
 
@@ -17,3 +18,14 @@ def require_json_content(f):
             raise UserActionError("Invalid JSON: " + str(e))
         return f(*args, **kwargs)
     return decorated_function
+
+
+def tokens_match(given, expected):
+    """Compare a header value against a secret in constant time."""
+    # header values are latin-1 text, and compare_digest refuses str
+    # with non-ASCII characters, so both sides are compared as bytes
+    try:
+        given = given.encode("latin-1")
+    except UnicodeEncodeError:
+        return False
+    return hmac.compare_digest(given, expected.encode())
@@ -0,0 +1,19 @@
+from app.utils.regexes import \
+    RE_EMAIL_VALIDATION, RE_USERNAME_VALIDATION, RE_PASSWORD_VALIDATION
+
+
+# maximum length of an address in an SMTP path (RFC 5321)
+EMAIL_MAX_LENGTH = 254
+
+
+def is_valid_email(email):
+    return (len(email) <= EMAIL_MAX_LENGTH
+            and RE_EMAIL_VALIDATION.fullmatch(email) is not None)
+
+
+def is_valid_username(username):
+    return RE_USERNAME_VALIDATION.fullmatch(username) is not None
+
+
+def is_valid_password(password):
+    return RE_PASSWORD_VALIDATION.fullmatch(password) is not None
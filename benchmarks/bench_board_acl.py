@@ -0,0 +1,64 @@
+"""Measure what board permission checks add to a request.
+
+Times 304 board reads (a single board query) for a user with many boards,
+with the ACL cache on and with a zero TTL that loads the roles every time,
+counting board_members queries per request.
+
+Run from the project root: python -m benchmarks.bench_board_acl [reads]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("ENV", "test")
+
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.db import db  # noqa: E402
+
+
+BOARDS = 200
+
+
+def main():
+    reads = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    app = create_app("test")
+    client = app.test_client()
+    client.post("/auth/register", json={
+        "username": "bench_user", "email": "bench@example.com",
+        "password": "Password123", "confirm_password": "Password123"})
+    client.post("/auth/login", json={
+        "login_identifier": "bench_user", "password": "Password123"})
+    boards = [client.post("/boards", json={"name": f"Board {i}"})
+              .json["board"] for i in range(BOARDS)]
+    url = f"/boards/{boards[0]['id']}"
+    etag = client.get(url).headers["ETag"]
+    user_id = client.get(f"{url}/members").json["members"][0]["user_id"]
+
+    queries = []
+    with app.app_context():
+        event.listen(
+            db.engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args:
+            "board_members" in statement and queries.append(1))
+
+    acl = app.extensions["board_acl"]
+    print(f"{'acl':>8}{'us/read':>10}{'acl queries/read':>18}")
+    for name, ttl in (("cached", 30), ("uncached", 0)):
+        acl.ttl = ttl
+        acl.invalidate(user_id)
+        queries.clear()
+        start = time.perf_counter()
+        for _ in range(reads):
+            client.get(url, headers={"If-None-Match": etag})
+        elapsed = time.perf_counter() - start
+        print(f"{name:>8}{elapsed / reads * 1e6:>10.0f}"
+              f"{len(queries) / reads:>18.2f}")
+
+    with app.app_context():
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Fan one board's card moves out to thousands of event subscribers.
+
+Subscribers are attached straight to the hub, as open event streams
+would be, and never read: their queues fill up and they get dropped
+while the writer keeps its pace. Fan-out runs on the hub's dispatcher
+thread, so its cost is reported separately from the move latency.
+
+Run from the project root: python -m benchmarks.bench_board_events [moves]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("ENV", "test")
+
+from app import create_app  # noqa: E402
+from app.db import db  # noqa: E402
+from app.utils.event_hub import event_hub_dropped, hub  # noqa: E402
+
+
+def main():
+    moves = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    app = create_app("test")
+    client = app.test_client()
+    client.post("/auth/register", json={
+        "username": "bench_user", "email": "bench@example.com",
+        "password": "Password123", "confirm_password": "Password123"})
+    client.post("/auth/login", json={
+        "login_identifier": "bench_user", "password": "Password123"})
+
+    published = []
+    publish = hub.publish
+
+    def counted_publish(topic, event):
+        queued = publish(topic, event)
+        published.append(queued)
+        return queued
+
+    deliver_seconds = []
+    deliver = hub.deliver
+
+    def timed_deliver(topic, event):
+        start = time.perf_counter()
+        try:
+            return deliver(topic, event)
+        finally:
+            deliver_seconds.append(time.perf_counter() - start)
+
+    hub.publish = counted_publish
+    hub.deliver = timed_deliver
+    queue_size = app.config["BOARD_EVENTS_QUEUE_SIZE"]
+
+    print(f"{'subscribers':>12}{'ms/move':>10}{'ms/fan-out':>12}"
+          f"{'max ms':>9}{'dropped':>9}")
+    for subscribers in (0, 1000, 5000, 10000):
+        board = client.post("/boards", json={"name": "Bench"}).json["board"]
+        url = f"/boards/{board['id']}"
+        columns = [client.post(f"{url}/columns", json={"name": name})
+                   .json["column"] for name in ("To do", "Done")]
+        card = client.post(f"{url}/columns/{columns[0]['id']}/cards",
+                           json={"title": "Card"}).json["card"]
+        subscriptions = [hub.subscribe(board["id"], queue_size)
+                         for _ in range(subscribers)]
+
+        published.clear()
+        deliver_seconds.clear()
+        dropped_before = event_hub_dropped.value()
+        start = time.perf_counter()
+        for i in range(moves):
+            client.post(f"{url}/cards/{card['id']}/move",
+                        json={"column_id": columns[i % 2]["id"]})
+        elapsed = time.perf_counter() - start
+        # wait for the dispatcher to finish fanning out
+        while len(deliver_seconds) < sum(published):
+            time.sleep(0.01)
+
+        per_deliver = sum(deliver_seconds) / max(len(deliver_seconds), 1)
+        print(f"{subscribers:>12}{elapsed / moves * 1000:>10.2f}"
+              f"{per_deliver * 1000:>12.3f}"
+              f"{max(deliver_seconds, default=0) * 1000:>9.2f}"
+              f"{event_hub_dropped.value() - dropped_before:>9.0f}")
+        for subscription in subscriptions:
+            hub.unsubscribe(subscription)
+
+    with app.app_context():
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
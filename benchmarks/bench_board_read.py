@@ -0,0 +1,81 @@
+"""Time full and conditional (304) board reads for growing boards.
+
+Run from the project root: python -m benchmarks.bench_board_read [reads]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("ENV", "test")
+
+from sqlalchemy import event, insert  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.boards.board_models import Card  # noqa: E402
+from app.db import db  # noqa: E402
+from app.utils.ranking import rank_sequence  # noqa: E402
+
+
+COLUMNS = 5
+
+
+def setup_board(client, app, size):
+    board = client.post("/boards", json={"name": "Bench"}).json["board"]
+    columns = [client.post(f"/boards/{board['id']}/columns",
+                           json={"name": f"Column {i}"}).json["column"]
+               for i in range(COLUMNS)]
+    per_column = size // COLUMNS
+    with app.app_context():
+        for column in columns:
+            db.session.execute(insert(Card), [
+                {"id": f"{column['id']}-{i}", "board_id": board["id"],
+                 "column_id": column["id"], "title": f"Card {i}",
+                 "description": "A short description of the work.",
+                 "rank": rank}
+                for i, rank in enumerate(rank_sequence(per_column))])
+        db.session.commit()
+    return board["id"]
+
+
+def main():
+    reads = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    app = create_app("test")
+    client = app.test_client()
+    client.post("/auth/register", json={
+        "username": "bench_user", "email": "bench@example.com",
+        "password": "Password123", "confirm_password": "Password123"})
+    client.post("/auth/login", json={
+        "login_identifier": "bench_user", "password": "Password123"})
+
+    queries = []
+
+    def count_queries(conn, cursor, statement, *args):
+        if "sessions" not in statement:
+            queries.append(statement)
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", count_queries)
+
+    print(f"{'cards':>8}{'read':>6}{'ms/read':>10}{'KB':>10}"
+          f"{'queries':>9}")
+    for size in (10, 1000, 50000):
+        board_id = setup_board(client, app, size)
+        etag = client.get(f"/boards/{board_id}").headers["ETag"]
+        for name, headers in (("full", {}),
+                              ("304", {"If-None-Match": etag})):
+            queries.clear()
+            start = time.perf_counter()
+            for _ in range(reads):
+                body = client.get(
+                    f"/boards/{board_id}", headers=headers).get_data()
+            elapsed = time.perf_counter() - start
+            print(f"{size:>8}{name:>6}{elapsed / reads * 1000:>10.2f}"
+                  f"{len(body) / 1024:>10.1f}"
+                  f"{len(queries) / reads:>9.0f}")
+
+    with app.app_context():
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
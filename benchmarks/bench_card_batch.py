@@ -0,0 +1,76 @@
+"""Compare one-card-per-request writes with the batch endpoint.
+
+Creates and then moves a sprint's worth of cards, once through the
+single-card endpoints and once through /cards:batch, counting commits.
+
+Run from the project root: python -m benchmarks.bench_card_batch
+"""
+import os
+import time
+
+os.environ.setdefault("ENV", "test")
+
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.db import db  # noqa: E402
+
+
+def setup_board(client):
+    board = client.post("/boards", json={"name": "Bench"}).json["board"]
+    url = f"/boards/{board['id']}"
+    columns = [client.post(f"{url}/columns", json={"name": name})
+               .json["column"] for name in ("Sprint", "Done")]
+    return url, columns
+
+
+def one_at_a_time(client, count):
+    url, (sprint, done) = setup_board(client)
+    cards = [client.post(f"{url}/columns/{sprint['id']}/cards",
+                         json={"title": f"Card {i}"}).json["card"]
+             for i in range(count)]
+    for card in cards:
+        client.post(f"{url}/cards/{card['id']}/move",
+                    json={"column_id": done["id"]})
+
+
+def batched(client, count):
+    url, (sprint, done) = setup_board(client)
+    results = client.post(f"{url}/cards:batch", json={"operations": [
+        {"op": "create", "column_id": sprint["id"], "title": f"Card {i}"}
+        for i in range(count)]}).json["results"]
+    client.post(f"{url}/cards:batch", json={"operations": [
+        {"op": "move", "card_id": result["card"]["id"],
+         "column_id": done["id"]} for result in results]})
+
+
+def main():
+    app = create_app("test")
+    client = app.test_client()
+    client.post("/auth/register", json={
+        "username": "bench_user", "email": "bench@example.com",
+        "password": "Password123", "confirm_password": "Password123"})
+    client.post("/auth/login", json={
+        "login_identifier": "bench_user", "password": "Password123"})
+
+    commits = []
+    with app.app_context():
+        event.listen(db.engine, "commit", lambda conn: commits.append(1))
+
+    print(f"{'cards':>6}{'path':>9}{'ms':>10}{'ops/s':>9}{'commits':>9}")
+    for count in (50, 500):
+        for name, run in (("single", one_at_a_time), ("batch", batched)):
+            commits.clear()
+            start = time.perf_counter()
+            run(client, count)
+            elapsed = time.perf_counter() - start
+            # each card is created and then moved
+            print(f"{count:>6}{name:>9}{elapsed * 1000:>10.1f}"
+                  f"{count * 2 / elapsed:>9.0f}{len(commits):>9}")
+
+    with app.app_context():
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Show that moving a card costs the same regardless of column size.
+
+Each move drops a random card between two adjacent cards through the HTTP
+API and counts the card rows rewritten.
+
+Run from the project root: python -m benchmarks.bench_card_moves [moves]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("ENV", "test")
+
+from sqlalchemy import event, insert  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.boards.board_models import Card  # noqa: E402
+from app.db import db  # noqa: E402
+from app.utils.ranking import rank_sequence  # noqa: E402
+
+
+def setup_column(client, app, size):
+    board = client.post("/boards", json={"name": "Bench"}).json["board"]
+    column = client.post(f"/boards/{board['id']}/columns",
+                         json={"name": "Backlog"}).json["column"]
+    cards = [Card(board["id"], column["id"], f"Card {i}", "", rank)
+             for i, rank in enumerate(rank_sequence(size))]
+    with app.app_context():
+        db.session.execute(insert(Card), [
+            {"id": card.id, "board_id": card.board_id,
+             "column_id": card.column_id, "title": card.title,
+             "description": "", "rank": card.rank} for card in cards])
+        db.session.commit()
+    return board["id"], [card.id for card in cards]
+
+
+def main():
+    moves = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    app = create_app("test")
+    client = app.test_client()
+    client.post("/auth/register", json={
+        "username": "bench_user", "email": "bench@example.com",
+        "password": "Password123", "confirm_password": "Password123"})
+    client.post("/auth/login", json={
+        "login_identifier": "bench_user", "password": "Password123"})
+
+    rows_updated = []
+
+    def count_rows(conn, cursor, statement, *args):
+        if statement.startswith("UPDATE cards"):
+            rows_updated.append(cursor.rowcount)
+
+    with app.app_context():
+        event.listen(db.engine, "after_cursor_execute", count_rows)
+
+    rng = random.Random(0)
+    print(f"{'cards':>8}{'ms/move':>10}{'rows/move':>11}")
+    for size in (100, 1000, 10000, 50000):
+        board_id, card_ids = setup_column(client, app, size)
+        rows_updated.clear()
+        start = time.perf_counter()
+        for _ in range(moves):
+            # drop a random card between two adjacent cards
+            card_id = card_ids.pop(rng.randrange(size))
+            i = rng.randrange(size - 2)
+            response = client.post(
+                f"/boards/{board_id}/cards/{card_id}/move",
+                json={"prev_card_id": card_ids[i],
+                      "next_card_id": card_ids[i + 1]})
+            assert response.status_code == 200, response.json
+            card_ids.insert(i + 1, card_id)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>8}{elapsed / moves * 1000:>10.2f}"
+              f"{sum(rows_updated) / moves:>11.2f}")
+
+    with app.app_context():
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
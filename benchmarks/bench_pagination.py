@@ -0,0 +1,100 @@
+"""Compare keyset pages with OFFSET pages deep into a large column.
+
+Walks the card listing of a 100k card column to page 1000 through the
+HTTP API, then times fetching page 1 and page 1000 with their cursors,
+both over HTTP and as bare queries, next to the same pages read with
+LIMIT/OFFSET.
+
+Run from the project root: python -m benchmarks.bench_pagination [reads]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("ENV", "test")
+
+from sqlalchemy import insert, select, text  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.boards.board_models import Card  # noqa: E402
+from app.db import db  # noqa: E402
+from app.utils.ranking import rank_sequence  # noqa: E402
+
+
+CARDS = 100000
+PAGE_SIZE = 50
+DEEP_PAGE = 1000
+
+
+def setup_column(client, app):
+    board = client.post("/boards", json={"name": "Bench"}).json["board"]
+    column = client.post(f"/boards/{board['id']}/columns",
+                         json={"name": "Backlog"}).json["column"]
+    with app.app_context():
+        db.session.execute(insert(Card), [
+            {"id": f"card-{i:06d}", "board_id": board["id"],
+             "column_id": column["id"], "title": f"Card {i}",
+             "description": "", "rank": rank}
+            for i, rank in enumerate(rank_sequence(CARDS))])
+        db.session.commit()
+    return f"/boards/{board['id']}/columns/{column['id']}/cards", column
+
+
+def time_reads(reads, read):
+    start = time.perf_counter()
+    for _ in range(reads):
+        read()
+    return (time.perf_counter() - start) / reads * 1000
+
+
+def main():
+    reads = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    app = create_app("test")
+    client = app.test_client()
+    client.post("/auth/register", json={
+        "username": "bench_user", "email": "bench@example.com",
+        "password": "Password123", "confirm_password": "Password123"})
+    client.post("/auth/login", json={
+        "login_identifier": "bench_user", "password": "Password123"})
+    url, column = setup_column(client, app)
+
+    cursors = [None]
+    while len(cursors) < DEEP_PAGE:
+        page = client.get(
+            f"{url}?limit={PAGE_SIZE}&cursor={cursors[-1]}"
+            if cursors[-1] else f"{url}?limit={PAGE_SIZE}").json
+        cursors.append(page["next_cursor"])
+
+    def keyset_page(cursor):
+        with app.app_context():
+            Card.get_page_for_column(column["id"], cursor, PAGE_SIZE)
+
+    def offset_page(number):
+        with app.app_context():
+            db.session.execute(
+                select(Card.id, Card.title, Card.rank)
+                .where(Card.column_id == column["id"])
+                .order_by(Card.rank, Card.id)
+                .limit(PAGE_SIZE)
+                .offset((number - 1) * PAGE_SIZE)).all()
+
+    print(f"{'page':>6}{'http ms':>9}{'keyset ms':>11}{'offset ms':>11}")
+    for number, cursor in ((1, None), (DEEP_PAGE, cursors[-1])):
+        query = f"?limit={PAGE_SIZE}" + (f"&cursor={cursor}" if cursor else "")
+        http = time_reads(reads, lambda: client.get(url + query))
+        keyset = time_reads(reads, lambda: keyset_page(cursor))
+        offset = time_reads(reads, lambda: offset_page(number))
+        print(f"{number:>6}{http:>9.2f}{keyset:>11.2f}{offset:>11.2f}")
+
+    with app.app_context():
+        plan = db.session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM cards "
+            "WHERE column_id = :column_id AND (rank, id) > ('V', 'x') "
+            "ORDER BY rank, id LIMIT 51"),
+            {"column_id": column["id"]}).all()
+        print("keyset plan:", "; ".join(row[-1] for row in plan))
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
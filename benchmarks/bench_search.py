@@ -0,0 +1,79 @@
+"""Compare FTS5 card search with a LIKE scan on a large board.
+
+Run from the project root: python -m benchmarks.bench_search [queries]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("ENV", "test")
+
+from sqlalchemy import insert  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.boards.board_models import Card  # noqa: E402
+from app.db import db  # noqa: E402
+from app.search.search_backends import \
+    LikeSearchBackend, card_search  # noqa: E402
+from app.utils.ranking import rank_sequence  # noqa: E402
+
+
+CARDS = 100000
+WORDS = ("login", "deploy", "invoice", "search", "board", "billing",
+         "release", "cache", "report", "export", "import", "profile",
+         "session", "payment", "upload", "webhook", "email", "signup")
+
+
+def setup_board(client, app):
+    board = client.post("/boards", json={"name": "Bench"}).json["board"]
+    column = client.post(f"/boards/{board['id']}/columns",
+                         json={"name": "Backlog"}).json["column"]
+    rng = random.Random(0)
+    with app.app_context():
+        db.session.execute(insert(Card), [
+            {"id": f"card-{i:06d}", "board_id": board["id"],
+             "column_id": column["id"],
+             "title": " ".join(rng.sample(WORDS, 3)) + f" {i}",
+             "description": " ".join(rng.sample(WORDS, 8)),
+             "rank": rank}
+            for i, rank in enumerate(rank_sequence(CARDS))])
+        db.session.commit()
+    return board["id"]
+
+
+def main():
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    app = create_app("test")
+    client = app.test_client()
+    client.post("/auth/register", json={
+        "username": "bench_user", "email": "bench@example.com",
+        "password": "Password123", "confirm_password": "Password123"})
+    client.post("/auth/login", json={
+        "login_identifier": "bench_user", "password": "Password123"})
+    board_id = setup_board(client, app)
+
+    print(f"{'query':>22}{'backend':>9}{'ms/query':>10}{'matches':>9}")
+    for terms in ([("login", False), ("payment", False)],
+                  [("webh", True)], [("12345", False)]):
+        label = " ".join(term + ("*" if prefix else "")
+                         for term, prefix in terms)
+        for name, backend in (("fts5", card_search.backend),
+                              ("like", LikeSearchBackend())):
+            with app.app_context():
+                query, score = backend.search_query(board_id, terms)
+                # the first page, as the search endpoint reads it
+                page = query.order_by(score, Card.id).limit(50)
+                start = time.perf_counter()
+                for _ in range(queries):
+                    rows = db.session.execute(page).all()
+                elapsed = time.perf_counter() - start
+            print(f"{label:>22}{name:>9}{elapsed / queries * 1000:>10.2f}"
+                  f"{len(rows):>9}")
+
+    with app.app_context():
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compare login and logout throughput across session backends.
+
+Run from the project root: python -m benchmarks.bench_sessions [iterations]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("ENV", "test")
+
+from app import create_app  # noqa: E402
+from app.db import db  # noqa: E402
+from app.sessions.session_backends import init_sessions  # noqa: E402
+
+
+USER = {
+    "username": "bench_user",
+    "email": "bench@example.com",
+    "password": "Password123",
+    "confirm_password": "Password123"
+}
+LOGIN = {"login_identifier": "bench_user", "password": "Password123"}
+
+
+def bench(session_type, iterations):
+    app = create_app("test")
+    app.secret_key = "benchmark-secret-key"
+    app.config["SESSION_TYPE"] = session_type
+    init_sessions(app)
+
+    client = app.test_client()
+    client.post("/auth/register", json=USER)
+
+    login_time = logout_time = 0.0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        client.post("/auth/login", json=LOGIN)
+        login_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        client.get("/auth/logout")
+        logout_time += time.perf_counter() - start
+
+    with app.app_context():
+        db.drop_all()
+    return iterations / login_time, iterations / logout_time
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    print(f"{'backend':<12}{'login req/s':>14}{'logout req/s':>14}")
+    for session_type in ("sqlalchemy", "memory", "cookie"):
+        login_rps, logout_rps = bench(session_type, iterations)
+        print(f"{session_type:<12}{login_rps:>14.0f}{logout_rps:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
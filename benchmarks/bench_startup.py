@@ -0,0 +1,69 @@
+"""Time how long a fresh worker process takes to become ready.
+
+Starts new interpreters that import the app and call create_app("prod")
+against an existing SQLite database, once with DB_CREATE_ALL (schema
+checked on every start) and once without, and reports the median import,
+create_app and total process time.
+
+Run from the project root: python -m benchmarks.bench_startup [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+WORKER = """
+import json, time
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+create_app("prod")
+created = time.perf_counter()
+print(json.dumps({"import": imported - start,
+                  "create_app": created - imported}))
+"""
+
+
+def run_worker(env):
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", WORKER], env=env, check=True,
+        capture_output=True, text=True)
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["process"] = time.perf_counter() - start
+    return timings
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    with tempfile.TemporaryDirectory() as directory:
+        env = {**os.environ,
+               "ENV": "prod",
+               "PYTHONPATH": os.getcwd(),
+               "SECRET_KEY": "bench-secret-key",
+               "DATABASE_URI": f"sqlite:///{directory}/startup.db",
+               "LOG_DIR": directory,
+               "SESSION_SWEEP_INTERVAL": "0"}
+        # the schema exists, as it would for any worker but the first
+        subprocess.run(
+            [sys.executable, "-m", "flask", "--app", "app:create_app('prod')",
+             "db", "create"],
+            env=env, check=True, capture_output=True)
+
+        print(f"{'create_all':>11}{'import ms':>11}{'create_app ms':>15}"
+              f"{'process ms':>12}")
+        for create_all in ("true", "false"):
+            samples = [run_worker({**env, "DB_CREATE_ALL": create_all})
+                       for _ in range(runs)]
+            median = {key: statistics.median(s[key] for s in samples) * 1000
+                      for key in ("import", "create_app", "process")}
+            print(f"{create_all:>11}{median['import']:>11.1f}"
+                  f"{median['create_app']:>15.1f}{median['process']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
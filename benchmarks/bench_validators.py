@@ -0,0 +1,39 @@
+"""Time the email validator on normal and adversarial input.
+
+The previous pattern is included for comparison; its nested quantifiers
+backtrack exponentially on a run of alphanumerics with no '@'.
+
+Run from the project root: python -m benchmarks.bench_validators
+"""
+import re
+import timeit
+
+from app.utils.validators import is_valid_email
+
+
+OLD_EMAIL_PATTERN = (r"^([0-9a-zA-Z]([-_\\.]*[0-9a-zA-Z]+)*)@"
+                     r"([0-9a-zA-Z]([-_\\.]*[0-9a-zA-Z]+)*)[\\.]"
+                     r"([a-zA-Z]{2,9})$")
+
+
+def best_of(func, number=5):
+    return min(timeit.repeat(func, number=1, repeat=number))
+
+
+def main():
+    print(f"{'input':<28}{'old (ms)':>12}{'new (ms)':>12}")
+    cases = [("valid address", "first.last@example.com")]
+    cases += [(f"{n} alnum + '!'", "a" * n + "!") for n in (16, 20, 24)]
+    cases += [("254 alnum + '!'", "a" * 254 + "!")]
+    for label, email in cases:
+        if len(email) <= 25:
+            old = best_of(lambda: re.search(OLD_EMAIL_PATTERN, email))
+            old = f"{old * 1000:.3f}"
+        else:
+            old = "(too slow)"
+        new = best_of(lambda: is_valid_email(email))
+        print(f"{label:<28}{old:>12}{new * 1000:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
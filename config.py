@@ -2,8 +2,8 @@ import os
 from app.db import db
 
 basedir = os.path.abspath(os.path.dirname(__file__))
+# created on first use by init_db and the profiler, not at import
 data_dir = os.path.join(basedir, 'data')
-os.makedirs(data_dir, exist_ok=True)
 
 
 class Config:
@@ -11,18 +11,113 @@ class Config:
     TESTING = False
     SECRET_KEY = os.getenv('SECRET_KEY')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SESSION_TYPE = 'sqlalchemy'
+    # applied to every new SQLite connection (None skips a pragma)
+    SQLITE_JOURNAL_MODE = 'WAL'
+    SQLITE_SYNCHRONOUS = 'NORMAL'
+    SQLITE_BUSY_TIMEOUT = 5000  # milliseconds
+    SQLITE_CACHE_SIZE = -20000  # negative means KiB, so about 20MB
+    SQLITE_MMAP_SIZE = 134217728  # bytes
+    # connection pool for non-SQLite DATABASE_URI
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))  # seconds
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))  # seconds
+    # create missing tables on every start; without it the schema is
+    # created once with "flask db create" and workers start faster. Run
+    # that command after every upgrade too: it adds new tables and
+    # indexes, and lists new columns of existing tables to add by hand
+    DB_CREATE_ALL = os.getenv('DB_CREATE_ALL', 'true') == 'true'
+    DB_POOL_PRE_PING = True
+    # /metrics shows endpoints, traffic and pool state; when
+    # METRICS_TOKEN is set scrapers must send "Bearer <token>"
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true') == 'true'
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+    # log lines go through a queue to a writer thread; "json" writes one
+    # object per line with any extra fields
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+    LOG_DIR = os.getenv('LOG_DIR')  # defaults to logs/ in the project
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 10))
+    # records waiting for the log writer; more are dropped, not buffered
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+    # seconds past which a request (with its statements and phases) or a
+    # single query is logged as a warning; None disables either log
+    SLOW_REQUEST_THRESHOLD = 1.0
+    SLOW_QUERY_THRESHOLD = 0.25
+    SLOW_REQUEST_MAX_STATEMENTS = 50
+    # opt-in profiling of a fraction of requests, or of any request sent
+    # with PROFILE_HEADER set to PROFILE_TOKEN; "sampling" writes
+    # collapsed stacks, "cprofile" pstats files, into a ring of files
+    PROFILE_ENABLED = os.getenv('PROFILE_ENABLED', 'false') == 'true'
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0.01))
+    PROFILE_MODE = os.getenv('PROFILE_MODE', 'sampling')
+    PROFILE_INTERVAL = 0.005  # seconds between stack samples
+    PROFILE_HEADER = 'X-Profile'
+    PROFILE_TOKEN = os.getenv('PROFILE_TOKEN')
+    PROFILE_DIR = os.path.join(data_dir, 'profiles')
+    PROFILE_MAX_FILES = 100
+    # versions of card/column changes kept for delta sync; clients further
+    # behind, or with more than the max entries to catch up on, get a
+    # full board snapshot instead
+    BOARD_CHANGES_RETENTION = 1000
+    BOARD_CHANGES_MAX_ENTRIES = 500
+    # card search backend import path; by default FTS5 on SQLite,
+    # tsvector on Postgres and an unindexed LIKE scan elsewhere
+    SEARCH_BACKEND = os.getenv('SEARCH_BACKEND')
+    # live board events: queued events per subscriber before it is
+    # dropped as too slow, and seconds between heartbeat frames
+    BOARD_EVENTS_QUEUE_SIZE = 100
+    BOARD_EVENTS_HEARTBEAT = 15
+    # users whose board roles are cached per process, and for how many
+    # seconds; other processes see membership changes within the TTL
+    BOARD_ACL_CACHE_SIZE = 10000
+    BOARD_ACL_CACHE_TTL = 30
+    # logged in users cached per process between requests; 0 disables
+    USER_CACHE_SIZE = 10000
+    USER_CACHE_TTL = 10
+    # token buckets allowing N requests per RATE_LIMIT_WINDOW seconds
+    RATE_LIMIT_ENABLED = True
+    RATE_LIMIT_BACKEND = 'memory'  # or an import path to a backend class
+    RATE_LIMIT_WINDOW = 60
+    # per client address: behind a reverse proxy (e.g. nginx), set
+    # PROXY_FIX_X_FOR to the number of proxies that append to
+    # X-Forwarded-For, or every client shares the proxy's bucket
+    LOGIN_IP_RATE_LIMIT = 30
+    LOGIN_FAILED_RATE_LIMIT = 5
+    # only trust as many X-Forwarded-For entries as there are proxies,
+    # as clients can send the header themselves; 0 when not proxied
+    PROXY_FIX_X_FOR = int(os.getenv('PROXY_FIX_X_FOR', 0))
+    # sqlalchemy, memory (in-process LRU) or cookie (signed, stateless)
+    SESSION_TYPE = os.getenv('SESSION_TYPE', 'sqlalchemy')
     SESSION_SQLALCHEMY = db
     SESSION_SQLALCHEMY_TABLE = 'sessions'
     SESSION_PERMANENT = True
+    SESSION_MEMORY_MAXSIZE = 10000
+    # refresh an unmodified session's expiry only after this fraction of
+    # its lifetime has elapsed, batching the writes (0 disables)
+    SESSION_TOUCH_FRACTION = float(os.getenv('SESSION_TOUCH_FRACTION', 0))
+    SESSION_TOUCH_FLUSH_INTERVAL = 5  # seconds
+    # background deletion of expired sessions; every process that sets
+    # it runs a sweeper, so by default (0) sweeping is left to a
+    # scheduled "flask sessions sweep" or to one designated process
+    SESSION_SWEEP_INTERVAL = int(os.getenv('SESSION_SWEEP_INTERVAL', 0))
+    SESSION_SWEEP_BATCH_SIZE = 500
     SESSION_COOKIE_SECURE = True
     SESSION_COOKIE_HTTPONLY = True
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_PENDING = int(
+        os.getenv('PASSWORD_HASH_MAX_PENDING', 16))
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+    BCRYPT_CALIBRATE = os.getenv('BCRYPT_CALIBRATE', 'false') == 'true'
+    BCRYPT_TARGET_MS = int(os.getenv('BCRYPT_TARGET_MS', 250))
 
 
 class DevConfig(Config):
     ENV = 'dev'
     DEBUG = True
     TESTING = True
+    SECRET_KEY = os.getenv('SECRET_KEY') or 'dev-secret-key'
     SQLALCHEMY_DATABASE_URI = \
         'sqlite:///' + os.path.join(basedir, 'data/dev.db')
     PERMANENT_SESSION_LIFETIME = 100  # seconds (default is 31 days)
@@ -34,14 +129,21 @@ class ProdConfig(Config):
     TESTING = False
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URI')\
         or 'sqlite:///' + os.path.join(basedir, 'data/app.db')
+    DB_CREATE_ALL = os.getenv('DB_CREATE_ALL', 'false') == 'true'
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'false') == 'true'
 
 
 class TestConfig(Config):
     ENV = 'test'
     DEBUG = True
     TESTING = True
+    SECRET_KEY = 'test-secret-key'
     SQLALCHEMY_DATABASE_URI = \
         'sqlite:///' + os.path.join(basedir, 'data/test.db')
+    PASSWORD_HASH_WORKERS = 0
+    BCRYPT_ROUNDS = 4
+    SESSION_SWEEP_INTERVAL = 0
+    RATE_LIMIT_ENABLED = False
 
 
 config = {
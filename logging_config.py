@@ -1,29 +1,170 @@
+import atexit
+import copy
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
+import queue
+import threading
+
+
+TEXT_FORMAT = ('%(asctime)s %(levelname)s: %(message)s '
+               '[in %(pathname)s:%(lineno)d]')
+
+# attributes every LogRecord has; anything else was passed as extra
+RESERVED_ATTRS = frozenset(vars(logging.LogRecord(
+    "", 0, "", 0, "", None, None)).keys()) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any extra fields"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc)
+            .isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "path": record.pathname,
+            "line": record.lineno,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        for key, value in vars(record).items():
+            if key not in RESERVED_ATTRS:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class BlockingSentinelListener(QueueListener):
+    """A listener whose stop waits for room in a full queue"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class BackgroundQueueHandler(QueueHandler):
+    """Hands records to a writer thread, so logging never waits on I/O.
+
+    The queue holds at most ``maxsize`` records; while it is full, new
+    records are dropped and counted in ``dropped`` rather than blocking
+    the caller or growing without bound.
+    """
+
+    def __init__(self, handlers, maxsize=10000):
+        self.target_handlers = handlers
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._pid = None
+        self._closed = False
+        self.listener = None
+        super().__init__(queue.Queue(maxsize))
+        atexit.register(self.stop)
+        self.start()
+
+    def start(self):
+        with self._lock:
+            # a listener inherited through fork has no thread, so each
+            # process starts its own
+            if self._closed or self._pid == os.getpid():
+                return
+            self.queue = queue.Queue(self.maxsize)
+            self.listener = BlockingSentinelListener(
+                self.queue, *self.target_handlers, respect_handler_level=True)
+            self.listener.start()
+            self._pid = os.getpid()
+
+    def stop(self):
+        with self._lock:
+            # records emitted after this are dropped, never queued for a
+            # new listener during shutdown
+            self._closed = True
+            if self.listener is not None and self._pid == os.getpid():
+                # writes out whatever is still queued
+                self.listener.stop()
+                self.listener = None
+                self._pid = None
+
+    def close(self):
+        self.stop()
+        atexit.unregister(self.stop)
+        for handler in self.target_handlers:
+            handler.close()
+        super().close()
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def prepare(self, record):
+        # the queue stays in this process, so the record needs no
+        # pickling; only the message is merged now, while the arguments
+        # are current, and tracebacks are formatted by the writer thread
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+    def emit(self, record):
+        if self._closed:
+            with self._lock:
+                self.dropped += 1
+            return
+        if self._pid != os.getpid():
+            self.start()
+        super().emit(record)
+
+
+def get_formatter(log_format):
+    if log_format == "json":
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def get_log_handlers(app, log_folder):
+    formatter = get_formatter(app.config.get("LOG_FORMAT", "text"))
+
+    log_file = os.path.join(log_folder, 'app.log')
+    file_handler = RotatingFileHandler(
+        log_file,
+        maxBytes=app.config.get("LOG_MAX_BYTES", 10 * 1024 * 1024),
+        backupCount=app.config.get("LOG_BACKUP_COUNT", 10))
+    file_handler.setFormatter(formatter)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    return [file_handler, stream_handler]
 
 
 def init_logging(app):
     if not os.getenv('ENV') == 'test':
         # Ensure log folder exists
-        log_folder = os.path.join(os.path.dirname(app.root_path), 'logs')
+        log_folder = app.config.get("LOG_DIR") or \
+            os.path.join(os.path.dirname(app.root_path), 'logs')
         os.makedirs(log_folder, exist_ok=True)
 
-        # Set up rotating file handler
-        log_file = os.path.join(log_folder, 'app.log')
-        # 10KB per file, 10 files max
-        file_handler = RotatingFileHandler(
-            log_file, maxBytes=10240, backupCount=10)
-        file_handler.setFormatter(logging.Formatter(
-            '%(asctime)s %(levelname)s: %(message)s '
-            '[in %(pathname)s:%(lineno)d]'))
-        file_handler.setLevel(logging.INFO)
-        app.logger.addHandler(file_handler)
-
-        # Set up console handler
-        stream_handler = logging.StreamHandler()
-        stream_handler.setLevel(logging.INFO)
-        app.logger.addHandler(stream_handler)
-
-        app.logger.setLevel(logging.INFO)
+        level = app.config.get("LOG_LEVEL", logging.INFO)
+        # app.logger is shared by every app of this name, so replace the
+        # pipeline of an earlier create_app instead of adding another
+        for handler in list(app.logger.handlers):
+            if isinstance(handler, BackgroundQueueHandler):
+                app.logger.removeHandler(handler)
+                handler.close()
+
+        queue_handler = BackgroundQueueHandler(
+            get_log_handlers(app, log_folder),
+            app.config.get("LOG_QUEUE_SIZE", 10000))
+        queue_handler.setLevel(level)
+        app.logger.addHandler(queue_handler)
+
+        app.logger.setLevel(level)
         app.logger.info('Application startup')
@@ -40,3 +40,40 @@ def user_created(test_client):
 
     with test_client.session_transaction() as sess:
         sess.clear()
+
+
+@pytest.fixture(scope='module')
+def logged_in(user_created):
+    user_created.post('/auth/login', json={
+        'login_identifier': 'test_user',
+        'password': 'Password123'
+    })
+
+    yield user_created  # this is where the testing happens!
+
+    with user_created.session_transaction() as sess:
+        sess.clear()
+
+
+@pytest.fixture(scope='module')
+def create_board(logged_in):
+    # cards maps a column's name to its cards, each a title or a dict of
+    # card fields; the columns are all created before any card
+    def create(name, columns=('To do',), cards=None):
+        board_id = logged_in.post(
+            '/boards', json={'name': name}).json['board']['id']
+        board = {'id': board_id, 'columns': [], 'cards': []}
+        for column_name in columns:
+            board['columns'].append(logged_in.post(
+                f'/boards/{board_id}/columns',
+                json={'name': column_name}).json['column'])
+        for column in board['columns']:
+            for card in (cards or {}).get(column['name'], ()):
+                if isinstance(card, str):
+                    card = {'title': card}
+                board['cards'].append(logged_in.post(
+                    f"/boards/{board_id}/columns/{column['id']}/cards",
+                    json=card).json['card'])
+        return board
+
+    return create
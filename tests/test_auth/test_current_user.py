@@ -0,0 +1,77 @@
+import pytest
+from flask import session
+from sqlalchemy import event
+
+from app.auth.auth_models import User
+from app.auth.user_loader import current_user, get_current_user, \
+    user_cache_hits, user_cache_misses, user_loader
+from app.db import db
+
+
+@pytest.fixture
+def user_queries(test_client):
+    statements = []
+
+    def record_query(conn, cursor, statement, *args):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record_query)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", record_query)
+
+
+def load_in_request(app, user_id, times=3):
+    # a fresh app context, as the fixture's one would share g
+    with app.app_context(), app.test_request_context():
+        session["id"] = user_id
+        return [current_user.username for _ in range(times)]
+
+
+# Test case 1: Valid current user
+def test_valid_get_me(logged_in):
+    response = logged_in.get("/auth/me")
+    assert response.json == {
+        "status": 200,
+        "user": {"username": "test_user", "email": "test@example.com"}
+    }
+
+
+# Test case 2: The user is loaded once per request, then from the cache
+def test_valid_current_user_memoized(logged_in, user_queries):
+    app = logged_in.application
+    user_id = User.get_by_username("test_user").id
+    user_loader.invalidate(user_id)
+    user_queries.clear()
+    misses = user_cache_misses.value()
+    hits = user_cache_hits.value()
+
+    assert load_in_request(app, user_id) == ["test_user"] * 3
+    assert len(user_queries) == 1
+    assert user_cache_misses.value() == misses + 1
+
+    assert load_in_request(app, user_id) == ["test_user"] * 3
+    assert len(user_queries) == 1
+    assert user_cache_hits.value() == hits + 1
+
+
+# Test case 3: Updating the user drops the cached copy
+def test_valid_current_user_invalidated(logged_in, user_queries):
+    app = logged_in.application
+    user = User.get_by_username("test_user")
+    load_in_request(app, user.id)
+    assert user_loader.cache.get(user.id) is not None
+
+    user.update_password_hash(user.password_hash)
+    assert user_loader.cache.get(user.id) is None
+
+    user_queries.clear()
+    load_in_request(app, user.id)
+    assert len(user_queries) == 1
+
+
+# Test case 4: No current user without a login
+def test_invalid_current_user_logged_out(test_client):
+    with test_client.application.test_request_context():
+        assert get_current_user() is None
+        assert not current_user
@@ -1,3 +1,9 @@
+from werkzeug.exceptions import ServiceUnavailable
+
+from app.auth.auth_models import User
+from app.auth.password_service import hasher, get_rounds
+
+
 # Test case 1: Valid user login with email
 def test_valid_user_login_with_email(user_created):
     with user_created as c:
@@ -267,3 +273,46 @@ def test_valid_user_logout(user_created):
             assert "username" not in sess
             assert "email" not in sess
             sess.clear()
+
+
+# Test case 15: Valid user login rehashes a password with a stale cost
+def test_valid_user_login_rehashes_stale_password(user_created):
+    with user_created as c:
+        stored_rounds = get_rounds(
+            User.get_by_username("test_user").password_hash)
+        hasher.rounds = stored_rounds + 1
+        try:
+            response = c.post("/auth/login", json={
+                "login_identifier": "test_user",
+                "password": "Password123"
+            })
+        finally:
+            hasher.rounds = stored_rounds
+        assert response.status_code == 200
+
+        user = User.get_by_username("test_user")
+        assert get_rounds(user.password_hash) == stored_rounds + 1
+        assert hasher.check_password("Password123", user.password_hash)
+        with c.session_transaction() as sess:
+            sess.clear()
+
+
+# Test case 16: A saturated hashing pool skips the rehash, not the login
+def test_valid_user_login_skips_rehash_when_saturated(user_created,
+                                                      monkeypatch):
+    def saturated(password):
+        raise ServiceUnavailable()
+
+    with user_created as c:
+        stored_hash = User.get_by_username("test_user").password_hash
+        monkeypatch.setattr(hasher, "rounds", get_rounds(stored_hash) + 1)
+        monkeypatch.setattr(hasher, "hash_password", saturated)
+        response = c.post("/auth/login", json={
+            "login_identifier": "test_user",
+            "password": "Password123"
+        })
+        assert response.status_code == 200
+        assert User.get_by_username("test_user").password_hash == \
+            stored_hash
+        with c.session_transaction() as sess:
+            sess.clear()
@@ -0,0 +1,164 @@
+import threading
+import time
+
+import pytest
+
+from app import create_app
+from app.auth import login_service
+from app.auth.auth_models import User
+from app.exceptions.custom_exceptions import PasswordMismatchError
+from app.utils.rate_limit import \
+    MemoryRateLimitBackend, limiter, rate_limit_rejected
+from config import TestConfig, config
+
+
+@pytest.fixture
+def rate_limited_client(user_created):
+    app = user_created.application
+    app.config.update(
+        RATE_LIMIT_ENABLED=True,
+        LOGIN_IP_RATE_LIMIT=3,
+        LOGIN_FAILED_RATE_LIMIT=2)
+    limiter.backend = MemoryRateLimitBackend()
+
+    yield user_created
+
+    app.config["RATE_LIMIT_ENABLED"] = False
+    limiter.backend = MemoryRateLimitBackend()
+
+
+# Test case 1: Token buckets refill over time
+def test_memory_backend_refills():
+    now = [0.0]
+    backend = MemoryRateLimitBackend(clock=lambda: now[0])
+    assert backend.consume("key", 2, 1)
+    assert backend.consume("key", 2, 1)
+    assert not backend.consume("key", 2, 1)
+    now[0] = 1.0
+    assert backend.consume("key", 2, 1)
+    assert not backend.consume("key", 2, 1)
+    # refunds never fill the bucket past its capacity
+    backend.refund("key", 2, 1)
+    backend.refund("key", 2, 1)
+    backend.refund("key", 2, 1)
+    assert backend.consume("key", 2, 1)
+    assert backend.consume("key", 2, 1)
+    assert not backend.consume("key", 2, 1)
+
+
+# Test case 2: Too many login attempts from one IP are rejected
+def test_login_rate_limited_by_ip(rate_limited_client):
+    with rate_limited_client as c:
+        rejected_before = rate_limit_rejected.value(scope="login_ip")
+        for _ in range(3):
+            response = c.post("/auth/login", json={})
+            assert response.status_code == 400
+
+        response = c.post("/auth/login", json={})
+        assert response.json == {
+            "status": 429,
+            "error": "Too Many Requests",
+            "message": ("Too many requests. "
+                        "Please wait a moment and try again.")
+        }
+        assert response.status_code == 429
+        assert rate_limit_rejected.value(scope="login_ip") == \
+            rejected_before + 1
+
+
+# Test case 3: Failed attempts throttle the account before any lookup
+def test_login_throttled_after_failed_attempts(
+        rate_limited_client, monkeypatch):
+    with rate_limited_client as c:
+        wrong_password = {
+            "login_identifier": "test_user",
+            "password": "Password1234"
+        }
+        for _ in range(2):
+            response = c.post("/auth/login", json=wrong_password)
+            assert response.status_code == 400
+
+        def fail_lookup(username):
+            raise AssertionError("throttled logins must not query users")
+        monkeypatch.setattr(User, "get_by_username", fail_lookup)
+
+        response = c.post("/auth/login", json={
+            "login_identifier": "TEST_USER",
+            "password": "Password123"
+        })
+        assert response.status_code == 429
+        with c.session_transaction() as sess:
+            assert "id" not in sess
+
+
+# Test case 4: Successful logins do not use up the failed attempt budget
+def test_successful_logins_not_throttled(rate_limited_client):
+    app = rate_limited_client.application
+    app.config["LOGIN_IP_RATE_LIMIT"] = 0
+    with rate_limited_client as c:
+        for _ in range(3):
+            response = c.post("/auth/login", json={
+                "login_identifier": "test_user",
+                "password": "Password123"
+            })
+            assert response.status_code == 200
+            c.get("/auth/logout")
+        response = c.post("/auth/login", json={
+            "login_identifier": "test_user",
+            "password": "Password1234"
+        })
+        assert response.status_code == 400
+
+
+# Test case 5: Concurrent failed attempts cannot all get past the limit
+def test_concurrent_failed_logins_throttled(
+        rate_limited_client, monkeypatch):
+    app = rate_limited_client.application
+    app.config["LOGIN_IP_RATE_LIMIT"] = 0
+    attempts = []
+
+    def slow_failed_login(username, email, password):
+        attempts.append(username)
+        time.sleep(0.2)
+        raise PasswordMismatchError("The provided password is incorrect.")
+    monkeypatch.setattr(login_service, "validate_login", slow_failed_login)
+
+    statuses = []
+
+    def attempt():
+        response = app.test_client().post("/auth/login", json={
+            "login_identifier": "test_user",
+            "password": "Password1234"
+        })
+        statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=attempt) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(attempts) == 2
+    assert sorted(statuses) == [400, 400, 429, 429]
+
+
+# Test case 6: Behind a trusted proxy, clients get their own buckets
+def test_login_rate_limited_behind_proxy(monkeypatch, tmp_path):
+    class ProxiedConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path}/proxied.db"
+        RATE_LIMIT_ENABLED = True
+        LOGIN_IP_RATE_LIMIT = 1
+        PROXY_FIX_X_FOR = 1
+
+    monkeypatch.setitem(config, "proxied", ProxiedConfig)
+    client = create_app("proxied").test_client()
+    try:
+        def login(address):
+            return client.post("/auth/login", json={},
+                               headers={"X-Forwarded-For": address})
+
+        assert login("203.0.113.1").status_code == 400
+        assert login("203.0.113.1").status_code == 429
+        assert login("203.0.113.2").status_code == 400
+    finally:
+        limiter.backend = MemoryRateLimitBackend()
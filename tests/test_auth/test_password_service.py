@@ -0,0 +1,87 @@
+import os
+import signal
+
+import bcrypt
+from flask import Flask
+
+from app.auth.password_service import \
+    PasswordHasher, hasher, password_hash_rejected, password_hash_seconds, \
+    calibrate_rounds, get_rounds
+
+
+# Test case 1: Hashing and verification through the process pool
+def test_password_hasher_process_pool():
+    app = Flask(__name__)
+    app.config.update(PASSWORD_HASH_WORKERS=1)
+    pool_hasher = PasswordHasher(app)
+    try:
+        password_hash = pool_hasher.hash_password("Password123")
+        assert pool_hasher.check_password("Password123", password_hash)
+        assert not pool_hasher.check_password("Password1234", password_hash)
+    finally:
+        pool_hasher.shutdown()
+
+
+# Test case 2: Hashing latency is recorded per operation
+def test_password_hasher_records_latency(test_client):
+    hashed_before = password_hash_seconds.count(operation="hash")
+    password_hash = hasher.hash_password("Password123")
+    hasher.check_password("Password123", password_hash)
+    assert password_hash_seconds.count(operation="hash") == hashed_before + 1
+    assert password_hash_seconds.count(operation="check") >= 1
+
+
+# Test case 3: Saturated hashing pool returns 503
+def test_password_hasher_saturated(test_client):
+    with test_client as c:
+        new_user = {
+            "username": "saturated_user",
+            "email": "saturated@example.com",
+            "password": "Password123",
+            "confirm_password": "Password123"
+        }
+        rejected_before = password_hash_rejected.value(operation="hash")
+        capacity = max(hasher.workers, 1) + hasher.max_pending
+        for _ in range(capacity):
+            hasher._slots.acquire()
+        try:
+            response = c.post("/auth/register", json=new_user)
+        finally:
+            for _ in range(capacity):
+                hasher._slots.release()
+
+        assert response.status_code == 503
+        assert response.json["error"] == "Service Unavailable"
+        assert password_hash_rejected.value(operation="hash") == \
+            rejected_before + 1
+
+
+# Test case 4: Configured cost is used and calibration never goes below it
+def test_password_hasher_rounds():
+    app = Flask(__name__)
+    app.config.update(BCRYPT_ROUNDS=5, BCRYPT_CALIBRATE=True,
+                      BCRYPT_TARGET_MS=0)
+    calibrated_hasher = PasswordHasher(app)
+    assert calibrated_hasher.rounds == 5
+    assert get_rounds(calibrated_hasher.hash_password("Password123")) == 5
+    assert calibrated_hasher.needs_rehash(
+        bcrypt.hashpw(b"Password123", bcrypt.gensalt(4)))
+    assert calibrate_rounds(0.05, min_rounds=4) > 4
+
+
+# Test case 5: A pool whose worker died is replaced
+def test_password_hasher_broken_pool():
+    app = Flask(__name__)
+    app.config.update(PASSWORD_HASH_WORKERS=1)
+    pool_hasher = PasswordHasher(app)
+    try:
+        password_hash = pool_hasher.hash_password("Password123")
+        executor = pool_hasher._executor
+        for process in list(executor._processes.values()):
+            os.kill(process.pid, signal.SIGKILL)
+            process.join()
+
+        assert pool_hasher.check_password("Password123", password_hash)
+        assert pool_hasher._executor is not executor
+    finally:
+        pool_hasher.shutdown()
@@ -1,6 +1,8 @@
 import bcrypt
+import pytest
 
 from app.auth.auth_models import User
+from app.exceptions.custom_exceptions import AlreadyExistsError
 
 
 # Test case 1: Valid user registration
@@ -279,3 +281,15 @@ def test_invalid_create_user_invalid_password(user_created):
                 "one lowercase letter, and one number.")
         }
         assert response.status_code == 400
+
+
+# Test case 15: Invalid user registration (concurrent signup race)
+def test_invalid_create_user_unique_constraint(user_created):
+    assert User.get_taken_fields("test_user", "test@example.com") == {
+        "username", "email"}
+    assert User.get_taken_fields("test_user15", "test@example.com") == {
+        "email"}
+    # the pre-check passed but another request inserted first
+    with pytest.raises(AlreadyExistsError):
+        User.create("test_user", "test15@example.com", b"hash")
+    assert User.get_by_email("test15@example.com") is None
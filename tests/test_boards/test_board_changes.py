@@ -0,0 +1,120 @@
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from app.boards.board_models import BoardChange
+from app.db import db
+
+
+@pytest.fixture(scope='module')
+def board(create_board):
+    yield create_board("Sync", ("To do", "Done"), {
+        "To do": [f"Card {i}" for i in range(3)]})
+
+
+def get_version(client, board_id):
+    data = json.loads(client.get(f"/boards/{board_id}").data)
+    return data["board"]["version"]
+
+
+def get_changes(client, board_id, since=None):
+    query = "" if since is None else f"?since={since}"
+    response = client.get(f"/boards/{board_id}/changes{query}")
+    return response, json.loads(response.data)
+
+
+# Test case 1: Valid delta only contains cards changed since the version
+def test_valid_changes_since_version(logged_in, board):
+    since = get_version(logged_in, board["id"])
+    card = board["cards"][0]
+    logged_in.post(f"/boards/{board['id']}/cards/{card['id']}/move",
+                   json={"column_id": board["columns"][1]["id"]})
+
+    response, data = get_changes(logged_in, board["id"], since)
+    assert response.status_code == 200
+    assert data["snapshot"] is False
+    assert data["since"] == since
+    assert data["version"] == since + 1
+    assert data["columns"] == []
+    assert len(data["cards"]) == 1
+    assert data["cards"][0]["id"] == card["id"]
+    assert data["cards"][0]["op"] == "moved"
+    assert data["cards"][0]["column_id"] == board["columns"][1]["id"]
+
+
+# Test case 2: Valid delta for an up-to-date client is empty
+def test_valid_changes_up_to_date(logged_in, board):
+    version = get_version(logged_in, board["id"])
+    response, data = get_changes(logged_in, board["id"], version)
+    assert response.status_code == 200
+    assert data["cards"] == [] and data["columns"] == []
+    assert data["version"] == version
+
+
+# Test case 3: Created then moved cards are reported as created
+def test_valid_changes_coalesced(logged_in, board):
+    since = get_version(logged_in, board["id"])
+    column = board["columns"][0]
+    card = logged_in.post(
+        f"/boards/{board['id']}/columns/{column['id']}/cards",
+        json={"title": "New"}).json["card"]
+    logged_in.post(f"/boards/{board['id']}/cards/{card['id']}/move",
+                   json={"column_id": board["columns"][1]["id"]})
+    new_column = logged_in.post(f"/boards/{board['id']}/columns",
+                                json={"name": "Later"}).json["column"]
+
+    _, data = get_changes(logged_in, board["id"], since)
+    assert data["version"] == since + 3
+    assert [(c["id"], c["op"], c["title"]) for c in data["cards"]] == [
+        (card["id"], "created", "New")]
+    assert [(c["id"], c["op"]) for c in data["columns"]] == [
+        (new_column["id"], "created")]
+
+
+# Test case 4: Clients without a version get a full snapshot
+def test_valid_changes_snapshot_without_version(logged_in, board):
+    response, data = get_changes(logged_in, board["id"])
+    assert response.status_code == 200
+    assert data["snapshot"] is True
+    assert len(data["board"]["columns"]) >= 2
+    assert len(data["board"]["cards"]) >= 3
+
+
+# Test case 5: Compacted history falls back to a full snapshot
+def test_valid_changes_snapshot_after_compaction(logged_in, board):
+    app = logged_in.application
+    app.config["BOARD_CHANGES_RETENTION"] = 2
+    try:
+        since = get_version(logged_in, board["id"])
+        card = board["cards"][1]
+        for column in board["columns"] * 2:
+            logged_in.post(
+                f"/boards/{board['id']}/cards/{card['id']}/move",
+                json={"column_id": column["id"]})
+    finally:
+        app.config["BOARD_CHANGES_RETENTION"] = 1000
+
+    entries = db.session.execute(
+        select(func.count()).select_from(BoardChange)
+        .where(BoardChange.board_id == board["id"])).scalar()
+    assert entries == 2
+
+    _, data = get_changes(logged_in, board["id"], since)
+    assert data["snapshot"] is True
+    assert data["board"]["version"] == since + 4
+
+    _, data = get_changes(logged_in, board["id"], since + 3)
+    assert data["snapshot"] is False
+    assert [c["id"] for c in data["cards"]] == [card["id"]]
+
+
+# Test case 6: Invalid since version
+def test_invalid_changes_since(logged_in, board):
+    response, data = get_changes(logged_in, board["id"], "abc")
+    assert response.status_code == 400
+    assert data["message"] == "The since version must be a whole number."
+
+    version = get_version(logged_in, board["id"])
+    response, _ = get_changes(logged_in, board["id"], version + 1)
+    assert response.status_code == 400
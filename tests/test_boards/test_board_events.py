@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from app.utils.event_hub import EventHub, event_hub_dropped, hub
+
+
+@pytest.fixture(scope='module')
+def board(create_board):
+    yield create_board("Live")
+
+
+def parse_frame(frame):
+    fields = dict(line.split(": ", 1)
+                  for line in frame.decode().strip().split("\n"))
+    return fields.get("event"), json.loads(fields.get("data", "null"))
+
+
+# Test case 1: Events fan out to every subscriber of a topic
+def test_valid_hub_fan_out():
+    local_hub = EventHub()
+    subscriptions = [local_hub.subscribe("board", maxsize=10)
+                     for _ in range(3)]
+    other = local_hub.subscribe("other", maxsize=10)
+
+    assert local_hub.deliver("board", "moved") == 3
+    assert [s.get(timeout=0) for s in subscriptions] == ["moved"] * 3
+    assert other.get(timeout=0) is None
+
+    for subscription in subscriptions + [other]:
+        local_hub.unsubscribe(subscription)
+    assert not local_hub.has_subscribers("board")
+
+
+# Test case 2: Slow subscribers are dropped instead of blocking delivery
+def test_valid_hub_drops_slow_subscriber():
+    local_hub = EventHub()
+    slow = local_hub.subscribe("board", maxsize=2)
+    fast = local_hub.subscribe("board", maxsize=2)
+    dropped_before = event_hub_dropped.value()
+
+    local_hub.deliver("board", 1)
+    fast.get(timeout=0)
+    local_hub.deliver("board", 2)
+    fast.get(timeout=0)
+    assert local_hub.deliver("board", 3) == 1
+
+    assert slow.dropped and not fast.dropped
+    assert slow.get(timeout=0) is None
+    assert event_hub_dropped.value() == dropped_before + 1
+    assert fast.get(timeout=0) == 3
+    local_hub.unsubscribe(fast)
+
+
+# Test case 3: Valid event stream receives board mutations
+def test_valid_board_events_stream(logged_in, board):
+    response = logged_in.get(f"/boards/{board['id']}/events",
+                             buffered=False)
+    try:
+        assert response.status_code == 200
+        assert response.mimetype == "text/event-stream"
+        assert "no-cache" in response.headers["Cache-Control"]
+        frames = iter(response.response)
+
+        event, data = parse_frame(next(frames))
+        assert event == "ready"
+        version = data["version"]
+
+        card = logged_in.post(
+            f"/boards/{board['id']}/columns/{board['columns'][0]['id']}/cards",
+            json={"title": "Live card"}).json["card"]
+        event, data = parse_frame(next(frames))
+        assert event == "card.created"
+        assert data["version"] == version + 1
+        assert data["card"]["id"] == card["id"]
+    finally:
+        response.close()
+    assert not hub.has_subscribers(board["id"])
+
+
+# Test case 4: Idle streams send heartbeat frames
+def test_valid_board_events_heartbeat(logged_in, board):
+    app = logged_in.application
+    app.config["BOARD_EVENTS_HEARTBEAT"] = 0.01
+    try:
+        response = logged_in.get(f"/boards/{board['id']}/events",
+                                 buffered=False)
+    finally:
+        app.config["BOARD_EVENTS_HEARTBEAT"] = 15
+    try:
+        frames = iter(response.response)
+        next(frames)
+        assert next(frames) == b": heartbeat\n\n"
+    finally:
+        response.close()
+
+
+# Test case 5: Invalid event stream (board does not exist)
+def test_invalid_board_events_not_found(logged_in):
+    response = logged_in.get("/boards/does-not-exist/events")
+    assert response.status_code == 404
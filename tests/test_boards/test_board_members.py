@@ -0,0 +1,196 @@
+import pytest
+from sqlalchemy import event
+
+from app.auth.auth_models import User
+from app.boards.board_acl import \
+    board_acl_cache_hits, board_acl_cache_misses
+from app.boards.board_models import Board, BoardMember
+from app.db import db
+
+
+@pytest.fixture(scope='module')
+def board(create_board):
+    yield create_board("Shared")
+
+
+@pytest.fixture(scope='module')
+def member(test_client):
+    client = test_client.application.test_client()
+    client.post("/auth/register", json={
+        "username": "member_user",
+        "email": "member@example.com",
+        "password": "Password123",
+        "confirm_password": "Password123"
+    })
+    client.post("/auth/login", json={
+        "login_identifier": "member_user",
+        "password": "Password123"
+    })
+
+    yield client
+
+
+def set_role(client, board, role):
+    return client.post(f"/boards/{board['id']}/members",
+                       json={"username": "member_user", "role": role})
+
+
+# Test case 1: Boards of other users are not found
+def test_invalid_board_access_non_member(member, board):
+    response = member.get(f"/boards/{board['id']}")
+    assert response.status_code == 404
+    assert response.json["message"] == "The requested board does not exist."
+
+
+# Test case 2: Viewers can read the board but not change it
+def test_valid_viewer_access(logged_in, member, board):
+    response = set_role(logged_in, board, "viewer")
+    assert response.status_code == 200
+    assert response.json["member"]["role"] == "viewer"
+
+    # the new role applies at once, without waiting for the cache TTL
+    assert member.get(f"/boards/{board['id']}").status_code == 200
+    assert [b["id"] for b in member.get("/boards").json["boards"]] == [
+        board["id"]]
+
+    response = member.post(f"/boards/{board['id']}/columns",
+                           json={"name": "Mine"})
+    assert response.json == {
+        "status": 403,
+        "error": "Forbidden",
+        "message": "You need editor access to this board to do that."
+    }
+
+
+# Test case 3: Editors can change the board but not its members
+def test_valid_editor_access(logged_in, member, board):
+    set_role(logged_in, board, "editor")
+
+    response = member.post(
+        f"/boards/{board['id']}/columns/{board['columns'][0]['id']}/cards",
+        json={"title": "From a member"})
+    assert response.status_code == 201
+
+    response = member.post(f"/boards/{board['id']}/members",
+                           json={"username": "test_user", "role": "viewer"})
+    assert response.status_code == 403
+
+    members = logged_in.get(f"/boards/{board['id']}/members").json
+    assert sorted((m["username"], m["role"]) for m in members["members"]) \
+        == [("member_user", "editor"), ("test_user", "owner")]
+
+
+# Test case 4: Cached permission checks skip the database
+def test_valid_access_checks_cached(member, board):
+    member.get(f"/boards/{board['id']}/changes").get_data()
+    statements = []
+
+    def record_query(conn, cursor, statement, *args):
+        if "board_members" in statement:
+            statements.append(statement)
+
+    hits = board_acl_cache_hits.value()
+    misses = board_acl_cache_misses.value()
+    event.listen(db.engine, "before_cursor_execute", record_query)
+    try:
+        for _ in range(5):
+            member.get(f"/boards/{board['id']}/changes").get_data()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record_query)
+
+    assert statements == []
+    assert board_acl_cache_hits.value() == hits + 5
+    assert board_acl_cache_misses.value() == misses
+
+
+# Test case 5: Invalid member changes
+def test_invalid_member_changes(logged_in, board):
+    url = f"/boards/{board['id']}/members"
+
+    response = logged_in.post(url, json={"username": "member_user",
+                                         "role": "owner"})
+    assert response.json["message"] == "The role must be viewer or editor."
+
+    response = logged_in.post(url, json={"username": "nobody",
+                                         "role": "viewer"})
+    assert response.status_code == 404
+    assert response.json["message"] == "The requested user does not exist."
+
+    response = logged_in.post(url, json={"username": "test_user",
+                                         "role": "viewer"})
+    assert response.json["message"] == \
+        "The board owner's role cannot be changed."
+
+    owner_id = next(m["user_id"] for m in logged_in.get(url).json["members"]
+                    if m["role"] == "owner")
+    response = logged_in.delete(f"{url}/{owner_id}")
+    assert response.json["message"] == "The board owner cannot be removed."
+
+
+# Test case 6: Removed members lose access at once
+def test_valid_remove_member(logged_in, member, board):
+    url = f"/boards/{board['id']}/members"
+    member_id = next(m["user_id"] for m in logged_in.get(url).json["members"]
+                     if m["username"] == "member_user")
+    stream = member.get(f"/boards/{board['id']}/events", buffered=False)
+    frames = iter(stream.response)
+    assert next(frames).startswith(b"event: ready")
+
+    response = logged_in.delete(f"{url}/{member_id}")
+    assert response.json == {"status": 200,
+                             "message": "Board member removed."}
+
+    # an open event stream is closed before the next event reaches it
+    logged_in.post(
+        f"/boards/{board['id']}/columns/{board['columns'][0]['id']}/cards",
+        json={"title": "After the removal"})
+    try:
+        assert list(frames) == [b"event: revoked\ndata: {}\n\n"]
+    finally:
+        stream.close()
+
+    assert member.get(f"/boards/{board['id']}").status_code == 404
+    assert member.get("/boards").json["boards"] == []
+    assert logged_in.delete(f"{url}/{member_id}").status_code == 404
+
+
+# Test case 7: Grants made by another process apply at once
+def test_valid_grant_from_other_process(logged_in, member):
+    other = logged_in.post("/boards", json={"name": "Elsewhere"}).json[
+        "board"]
+    assert member.get(f"/boards/{other['id']}").status_code == 404
+
+    # written straight to the database, as another worker would, so
+    # this process's cached roles are not invalidated
+    member_id = User.get_by_username("member_user").id
+    BoardMember.set_role(Board.get_by_id(other["id"]), member_id, "viewer")
+    assert member.get(f"/boards/{other['id']}").status_code == 200
+
+
+# Test case 8: Valid member pages cover the board once, without a sort
+def test_valid_list_members_pages(logged_in, member, board):
+    set_role(logged_in, board, "viewer")
+    url = f"/boards/{board['id']}/members"
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, many):
+        if "FROM board_members" in statement:
+            statements.append((statement, parameters))
+
+    first = logged_in.get(url + "?limit=1").json
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        second = logged_in.get(
+            url + f"?limit=1&cursor={first['next_cursor']}").json
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    assert second["next_cursor"] is None
+    assert sorted(m["username"] for m in
+                  first["members"] + second["members"]) == [
+        "member_user", "test_user"]
+    statement, parameters = statements[-1]
+    with db.engine.connect() as connection:
+        plan = " ".join(row[-1] for row in connection.exec_driver_sql(
+            "EXPLAIN QUERY PLAN " + statement, parameters))
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,82 @@
+import pytest
+from sqlalchemy import event
+
+from app.db import db
+
+
+@pytest.fixture(scope='module')
+def board(create_board):
+    yield create_board("Pages", ("Backlog",), {
+        "Backlog": [f"Card {i}" for i in range(7)]})
+
+
+def get_all_pages(client, url, key, limit):
+    items, cursor, pages = [], None, 0
+    while True:
+        query = f"?limit={limit}" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(url + query)
+        assert response.status_code == 200
+        assert len(response.json[key]) <= limit
+        items.extend(response.json[key])
+        pages += 1
+        cursor = response.json["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+
+# Test case 1: Valid card pages cover the column once, in rank order
+def test_valid_list_cards_pages(logged_in, board):
+    url = f"/boards/{board['id']}/columns/{board['columns'][0]['id']}/cards"
+    cards, pages = get_all_pages(logged_in, url, "cards", 3)
+    assert pages == 3
+    assert [card["id"] for card in cards] == \
+        [card["id"] for card in board["cards"]]
+
+
+# Test case 2: Valid board pages are sorted by name
+def test_valid_list_boards_pages(logged_in, board):
+    for name in ("Zeta", "Alpha", "Mu"):
+        logged_in.post("/boards", json={"name": name})
+    boards, _ = get_all_pages(logged_in, "/boards", "boards", 2)
+    names = [b["name"] for b in boards]
+    assert names == sorted(names)
+    assert {"Pages", "Zeta", "Alpha", "Mu"} <= set(names)
+
+
+# Test case 3: Board pages are read in index order, without a sort
+def test_valid_list_boards_plan(logged_in, board):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, many):
+        if "FROM board_members" in statement:
+            statements.append((statement, parameters))
+
+    cursor = logged_in.get("/boards?limit=1").json["next_cursor"]
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        logged_in.get(f"/boards?limit=1&cursor={cursor}")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    statement, parameters = statements[-1]
+    with db.engine.connect() as connection:
+        plan = " ".join(row[-1] for row in connection.exec_driver_sql(
+            "EXPLAIN QUERY PLAN " + statement, parameters))
+    assert "ix_board_members_user_id_board_name_board_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+# Test case 4: Invalid page cursor
+def test_invalid_list_cards_cursor(logged_in, board):
+    url = f"/boards/{board['id']}/columns/{board['columns'][0]['id']}/cards"
+    response = logged_in.get(url + "?cursor=forged")
+    assert response.json == {
+        "status": 400,
+        "error": "Bad Request",
+        "message": "The page cursor is invalid."
+    }
+
+    # a board cursor cannot be replayed against a card listing
+    board_cursor = logged_in.get("/boards?limit=1").json["next_cursor"]
+    response = logged_in.get(url + f"?cursor={board_cursor}")
+    assert response.status_code == 400
@@ -0,0 +1,145 @@
+import json
+
+import pytest
+from sqlalchemy import event, text
+
+from app.boards.board_models import Card
+from app.db import db
+
+
+@pytest.fixture(scope='module')
+def board(create_board):
+    columns = ("To do", "Doing", "Done")
+    yield create_board("Read", columns, {
+        name: [{"title": f"{name} {i}", "description": "Details"}
+               for i in range(3)]
+        for name in columns})
+
+
+# Test case 1: Valid full board read
+def test_valid_get_board(logged_in, board):
+    response = logged_in.get(f"/boards/{board['id']}")
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+
+    data = json.loads(response.data)
+    assert data["status"] == 200
+    assert data["board"]["name"] == "Read"
+    assert [c["name"] for c in data["board"]["columns"]] == [
+        "To do", "Doing", "Done"]
+
+    cards = data["board"]["cards"]
+    assert len(cards) == 9
+    todo_id = board["columns"][0]["id"]
+    assert [card["title"] for card in cards
+            if card["column_id"] == todo_id] == [
+        "To do 0", "To do 1", "To do 2"]
+    assert set(cards[0]) == {
+        "id", "column_id", "title", "description", "rank"}
+
+
+# Test case 2: Board reads use a fixed number of queries
+def test_valid_get_board_query_count(logged_in, board):
+    statements = []
+
+    def record_query(conn, cursor, statement, *args):
+        if any(table in statement
+               for table in ("boards", "board_columns", "cards")):
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record_query)
+    try:
+        response = logged_in.get(f"/boards/{board['id']}")
+        response.get_data()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record_query)
+
+    assert len(statements) == 3
+
+
+# Test case 3: Invalid board read (board does not exist)
+def test_invalid_get_board_not_found(logged_in):
+    response = logged_in.get("/boards/does-not-exist")
+    assert response.json == {
+        "status": 404,
+        "error": "Not Found",
+        "message": "The requested board does not exist."
+    }
+    assert response.status_code == 404
+
+
+# Test case 4: Unchanged board revalidates with a 304 and one query
+def test_valid_get_board_not_modified(logged_in, board):
+    response = logged_in.get(f"/boards/{board['id']}")
+    etag = response.headers["ETag"]
+    assert not response.headers["ETag"].startswith("W/")
+    assert "no-cache" in response.headers["Cache-Control"]
+
+    statements = []
+
+    def record_query(conn, cursor, statement, *args):
+        if any(table in statement
+               for table in ("boards", "board_columns", "cards")):
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record_query)
+    try:
+        response = logged_in.get(f"/boards/{board['id']}",
+                                 headers={"If-None-Match": etag})
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record_query)
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+    assert len(statements) == 1
+
+    # a proxy may have weakened the tag, e.g. after gzipping the body
+    response = logged_in.get(f"/boards/{board['id']}",
+                             headers={"If-None-Match": "W/" + etag})
+    assert response.status_code == 304
+
+
+# Test case 5: Card and column writes change the board's ETag
+def test_valid_get_board_etag_changes(logged_in, board):
+    url = f"/boards/{board['id']}"
+    todo_id = board["columns"][0]["id"]
+    etags = [logged_in.get(url).headers["ETag"]]
+
+    card = logged_in.post(f"{url}/columns/{todo_id}/cards",
+                          json={"title": "New"}).json["card"]
+    etags.append(logged_in.get(url).headers["ETag"])
+    logged_in.post(f"{url}/cards/{card['id']}/move",
+                   json={"column_id": board["columns"][1]["id"]})
+    etags.append(logged_in.get(url).headers["ETag"])
+    logged_in.post(f"{url}/columns", json={"name": "Later"})
+    etags.append(logged_in.get(url).headers["ETag"])
+    assert len(set(etags)) == 4
+
+    response = logged_in.get(url, headers={"If-None-Match": etags[0]})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == etags[-1]
+
+
+# Test case 6: The card stream reads on the session's connection, only
+# once it is read
+def test_card_stream_connection(logged_in, board):
+    pool = db.engine.pool
+    db.session.commit()
+    checked_out = pool.checkedout()
+
+    # a body that is never read (HEAD, early disconnect) runs no query
+    response = logged_in.head(f"/boards/{board['id']}")
+    assert response.status_code == 200
+    assert pool.checkedout() == checked_out
+
+    rows = Card.stream_rows_for_board(board["id"])
+    assert pool.checkedout() == checked_out
+    # the request's session already holds a connection, as it does with
+    # the memory or cookie session backends
+    db.session.execute(text("SELECT 1"))
+    next(rows)
+    assert pool.checkedout() == checked_out + 1
+    rows.close()
+    db.session.commit()
+    assert pool.checkedout() == checked_out
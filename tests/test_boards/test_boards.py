@@ -0,0 +1,195 @@
+import pytest
+from sqlalchemy import event, select
+
+from app.boards import board_service
+from app.boards.board_models import Card
+from app.db import db
+
+
+@pytest.fixture(scope='module')
+def board(create_board):
+    yield create_board("Sprint", ("To do", "Done"), {
+        "To do": [f"Card {i}" for i in range(5)]})
+
+
+def column_titles(column_id):
+    return db.session.execute(
+        select(Card.title)
+        .where(Card.column_id == column_id)
+        .order_by(Card.rank)).scalars().all()
+
+
+# Test case 1: Valid board, columns and cards creation
+def test_valid_create_board(board):
+    assert board["columns"][0]["rank"] < board["columns"][1]["rank"]
+    assert column_titles(board["columns"][0]["id"]) == [
+        "Card 0", "Card 1", "Card 2", "Card 3", "Card 4"]
+
+
+# Test case 2: Invalid board creation (missing name)
+def test_invalid_create_board_missing_name(logged_in):
+    with logged_in as c:
+        response = c.post("/boards", json={})
+        assert response.json == {
+            "status": 400,
+            "error": "Bad Request",
+            "message": ("Some required fields are missing. "
+                        "Please provide all required information.")
+        }
+        assert response.status_code == 400
+
+
+# Test case 3: Invalid board access when not logged in
+def test_invalid_create_board_when_not_logged_in(test_client):
+    with test_client.application.test_client() as c:
+        response = c.post("/boards", json={"name": "Sprint"})
+        assert response.status_code == 401
+
+
+# Test case 4: Moving a card updates exactly one row
+def test_valid_move_card_updates_one_row(logged_in, board):
+    cards = board["cards"]
+    statements = []
+
+    def record_update(conn, cursor, statement, *args):
+        if statement.startswith("UPDATE cards"):
+            statements.append(cursor.rowcount)
+
+    event.listen(db.engine, "after_cursor_execute", record_update)
+    try:
+        response = logged_in.post(
+            f"/boards/{board['id']}/cards/{cards[4]['id']}/move",
+            json={"prev_card_id": cards[0]["id"],
+                  "next_card_id": cards[1]["id"]})
+    finally:
+        event.remove(db.engine, "after_cursor_execute", record_update)
+
+    assert response.status_code == 200
+    assert statements == [1]
+    assert column_titles(board["columns"][0]["id"]) == [
+        "Card 0", "Card 4", "Card 1", "Card 2", "Card 3"]
+
+
+# Test case 5: Moving a card to another column and to the top
+def test_valid_move_card_between_columns(logged_in, board):
+    cards = board["cards"]
+    done_id = board["columns"][1]["id"]
+    logged_in.post(f"/boards/{board['id']}/cards/{cards[2]['id']}/move",
+                   json={"column_id": done_id})
+    response = logged_in.post(
+        f"/boards/{board['id']}/cards/{cards[3]['id']}/move",
+        json={"column_id": done_id, "next_card_id": cards[2]["id"]})
+
+    assert response.status_code == 200
+    assert response.json["card"]["column_id"] == done_id
+    assert column_titles(done_id) == ["Card 3", "Card 2"]
+
+
+# Test case 6: Invalid card move (neighbour in another column)
+def test_invalid_move_card_neighbour_in_other_column(logged_in, board):
+    cards = board["cards"]
+    response = logged_in.post(
+        f"/boards/{board['id']}/cards/{cards[0]['id']}/move",
+        json={"column_id": board["columns"][1]["id"],
+              "prev_card_id": cards[1]["id"]})
+    assert response.status_code == 400
+    assert response.json["message"] == (
+        "The cards to place this card between "
+        "must be other cards in the target column.")
+
+
+# Test case 7: Invalid card move (body or ids of the wrong type)
+@pytest.mark.parametrize("body, status_code, message", [
+    (["column_id"], 400, "No move data received. "
+     "Please provide the required information."),
+    ({"prev_card_id": ["a"]}, 400, "The cards to place this card between "
+     "must be other cards in the target column."),
+    ({"next_card_id": {"id": "a"}}, 400, "The cards to place this card "
+     "between must be other cards in the target column."),
+    ({"column_id": ["a"]}, 404, "The requested column does not exist."),
+])
+def test_invalid_move_card_types(logged_in, board, body, status_code,
+                                 message):
+    cards = board["cards"]
+    response = logged_in.post(
+        f"/boards/{board['id']}/cards/{cards[0]['id']}/move", json=body)
+    assert response.status_code == status_code
+    assert response.json["message"] == message
+
+
+# Test case 8: Long rank keys trigger a rebalance of the column
+def test_valid_move_card_rebalances_long_ranks(
+        logged_in, board, monkeypatch):
+    monkeypatch.setattr(board_service, "RANK_MAX_LENGTH", 3)
+    cards = board["cards"]
+    # keep squeezing cards into the same gap so keys keep growing
+    for i in range(20):
+        moving, anchor = (cards[1], cards[0]) if i % 2 else \
+            (cards[0], cards[1])
+        response = logged_in.post(
+            f"/boards/{board['id']}/cards/{moving['id']}/move",
+            json={"column_id": board["columns"][0]["id"],
+                  "next_card_id": anchor["id"]})
+        assert response.status_code == 200
+
+    ranks = db.session.execute(
+        select(Card.rank).where(Card.column_id == board["columns"][0]["id"])
+    ).scalars().all()
+    assert max(len(rank) for rank in ranks) <= 3
+
+
+# Test case 9: Appending hundreds of cards keeps rank keys short
+def test_append_cards_keeps_ranks_short(logged_in, board):
+    column = logged_in.post(f"/boards/{board['id']}/columns",
+                            json={"name": "Backlog"}).json["column"]
+    for i in range(400):
+        response = logged_in.post(
+            f"/boards/{board['id']}/columns/{column['id']}/cards",
+            json={"title": f"Item {i}"})
+        assert response.status_code == 201
+
+    ranks = db.session.execute(
+        select(Card.rank).where(Card.column_id == column["id"])
+    ).scalars().all()
+    assert max(len(rank) for rank in ranks) <= 8
+    assert column_titles(column["id"]) == [f"Item {i}" for i in range(400)]
+
+
+# Test case 10: Appends past the length limit rebalance the column
+def test_append_cards_rebalances_long_ranks(logged_in, board, monkeypatch):
+    monkeypatch.setattr(board_service, "RANK_MAX_LENGTH", 3)
+    column = logged_in.post(f"/boards/{board['id']}/columns",
+                            json={"name": "Icebox"}).json["column"]
+    for i in range(200):
+        logged_in.post(
+            f"/boards/{board['id']}/columns/{column['id']}/cards",
+            json={"title": f"Item {i}"})
+
+    ranks = db.session.execute(
+        select(Card.rank).where(Card.column_id == column["id"])
+    ).scalars().all()
+    assert max(len(rank) for rank in ranks) <= 3
+    assert column_titles(column["id"]) == [f"Item {i}" for i in range(200)]
+
+
+# Test case 11: Invalid board access by another user
+def test_invalid_board_access_other_user(test_client, board):
+    with test_client.application.test_client() as c:
+        c.post("/auth/register", json={
+            "username": "other_user",
+            "email": "other@example.com",
+            "password": "Password123",
+            "confirm_password": "Password123"
+        })
+        c.post("/auth/login", json={
+            "login_identifier": "other_user",
+            "password": "Password123"
+        })
+        response = c.post(f"/boards/{board['id']}/columns",
+                          json={"name": "Hijacked"})
+        assert response.json == {
+            "status": 404,
+            "error": "Not Found",
+            "message": "The requested board does not exist."
+        }
+        assert response.status_code == 404
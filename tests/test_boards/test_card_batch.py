@@ -0,0 +1,241 @@
+import json
+
+import pytest
+from sqlalchemy import event
+
+from app.db import db
+
+
+@pytest.fixture(scope='module')
+def board(create_board):
+    yield create_board("Batch", ("To do", "Done"), {
+        "To do": [f"Card {i}" for i in range(4)]})
+
+
+def read_board(client, board_id):
+    return json.loads(client.get(f"/boards/{board_id}").data)["board"]
+
+
+def column_titles(board_data, column_id):
+    return [card["title"] for card in board_data["cards"]
+            if card["column_id"] == column_id]
+
+
+# Test case 1: Valid batch applies every operation in one version
+def test_valid_card_batch(logged_in, board):
+    todo, done = board["columns"]
+    cards = board["cards"]
+    version = read_board(logged_in, board["id"])["version"]
+
+    response = logged_in.post(f"/boards/{board['id']}/cards:batch", json={
+        "operations": [
+            {"op": "create", "column_id": done["id"], "title": "New 0"},
+            {"op": "update", "card_id": cards[0]["id"], "title": "Renamed"},
+            {"op": "move", "card_id": cards[1]["id"],
+             "column_id": done["id"]},
+            {"op": "archive", "card_id": cards[2]["id"]},
+            {"op": "create", "column_id": done["id"], "title": "New 1",
+             "description": "Details"},
+        ]})
+    assert response.status_code == 200
+    results = response.json["results"]
+    assert [result["op"] for result in results] == [
+        "create", "update", "move", "archive", "create"]
+    assert results[3]["card"] == {"id": cards[2]["id"], "archived": True}
+
+    board_data = read_board(logged_in, board["id"])
+    assert board_data["version"] == version + 1
+    assert column_titles(board_data, todo["id"]) == ["Renamed", "Card 3"]
+    assert column_titles(board_data, done["id"]) == [
+        "New 0", "Card 1", "New 1"]
+
+    changes = logged_in.get(
+        f"/boards/{board['id']}/changes?since={version}").json
+    ops = {card["id"]: card["op"] for card in changes["cards"]}
+    assert ops[cards[2]["id"]] == "deleted"
+    assert ops[cards[1]["id"]] == "moved"
+
+
+# Test case 2: Cards sent between the same two cards keep their order
+def test_valid_card_batch_same_gap(logged_in, board):
+    todo = board["columns"][0]
+    first, last = board["cards"][0], board["cards"][3]
+    response = logged_in.post(f"/boards/{board['id']}/cards:batch", json={
+        "operations": [
+            {"op": "create", "column_id": todo["id"], "title": f"Gap {i}",
+             "prev_card_id": first["id"], "next_card_id": last["id"]}
+            for i in range(3)]})
+    assert response.status_code == 200
+
+    assert column_titles(read_board(logged_in, board["id"]), todo["id"]) \
+        == ["Renamed", "Gap 0", "Gap 1", "Gap 2", "Card 3"]
+
+    # moving them to the bottom in reverse keeps the batch order
+    response = logged_in.post(f"/boards/{board['id']}/cards:batch", json={
+        "operations": [
+            {"op": "move", "card_id": result["card"]["id"]}
+            for result in reversed(response.json["results"])]})
+    assert response.status_code == 200
+    assert column_titles(read_board(logged_in, board["id"]), todo["id"]) \
+        == ["Renamed", "Card 3", "Gap 2", "Gap 1", "Gap 0"]
+
+
+# Test case 3: Invalid operation rejects the whole batch
+def test_invalid_card_batch_operation(logged_in, board):
+    version = read_board(logged_in, board["id"])["version"]
+    response = logged_in.post(f"/boards/{board['id']}/cards:batch", json={
+        "operations": [
+            {"op": "create", "column_id": board["columns"][0]["id"],
+             "title": "Never"},
+            {"op": "update", "card_id": board["cards"][3]["id"],
+             "title": ""},
+        ]})
+    assert response.json == {
+        "status": 400,
+        "error": "Bad Request",
+        "message": "Operation 2: Please provide a card title."
+    }
+    assert read_board(logged_in, board["id"])["version"] == version
+
+
+# Test case 4: Invalid batches (unknown card, repeated card, bad shape)
+@pytest.mark.parametrize("operations, status_code, message", [
+    ([{"op": "archive", "card_id": "missing"}], 404,
+     "Operation 1: The requested card does not exist."),
+    ([{"op": "delete", "card_id": "missing"}], 400,
+     "Operation 1: Each operation must be one of create, update, move "
+     "or archive."),
+    ([], 400, "Please provide a list of operations."),
+    ("archive", 400, "Please provide a list of operations."),
+])
+def test_invalid_card_batch(logged_in, board, operations, status_code,
+                            message):
+    response = logged_in.post(f"/boards/{board['id']}/cards:batch",
+                              json={"operations": operations})
+    assert response.status_code == status_code
+    assert response.json["message"] == message
+
+
+# Test case 5: Invalid batch touching the same card twice
+def test_invalid_card_batch_repeated_card(logged_in, board):
+    card_id = board["cards"][3]["id"]
+    response = logged_in.post(f"/boards/{board['id']}/cards:batch", json={
+        "operations": [
+            {"op": "update", "card_id": card_id, "title": "Twice"},
+            {"op": "archive", "card_id": card_id},
+        ]})
+    assert response.status_code == 400
+    assert response.json["message"] == (
+        "Operation 2: A card can only appear in one operation per batch.")
+
+
+def titled_board(create_board, name, titles):
+    # the cards are looked up by title
+    board = create_board(name, ("To do", "Done"), {"To do": titles})
+    return board["id"], board["columns"], {
+        card["title"]: card for card in board["cards"]}
+
+
+# Test case 6: Each operation sees the cards placed by the ones before it
+def test_valid_card_batch_sequential(logged_in, create_board):
+    board_id, (todo, done), cards = titled_board(
+        create_board, "Sequential", ["A", "B", "C", "D"])
+
+    response = logged_in.post(f"/boards/{board_id}/cards:batch", json={
+        "operations": [
+            {"op": "move", "card_id": cards["A"]["id"],
+             "column_id": done["id"]},
+            # placed next to A where A is now, not where it was
+            {"op": "move", "card_id": cards["B"]["id"],
+             "column_id": done["id"], "prev_card_id": cards["A"]["id"]},
+            {"op": "create", "column_id": done["id"], "title": "New",
+             "next_card_id": cards["B"]["id"]},
+            {"op": "move", "card_id": cards["D"]["id"],
+             "next_card_id": cards["C"]["id"]},
+            {"op": "create", "column_id": todo["id"], "title": "Top",
+             "next_card_id": cards["D"]["id"]},
+            {"op": "create", "column_id": done["id"], "title": "Last"},
+        ]})
+    assert response.status_code == 200
+
+    board_data = read_board(logged_in, board_id)
+    assert column_titles(board_data, done["id"]) == [
+        "A", "New", "B", "Last"]
+    assert column_titles(board_data, todo["id"]) == ["Top", "D", "C"]
+    for column in (todo, done):
+        ranks = [card["rank"] for card in board_data["cards"]
+                 if card["column_id"] == column["id"]]
+        assert len(set(ranks)) == len(ranks)
+
+
+# Test case 7: Neighbours archived earlier in the batch are rejected
+def test_invalid_card_batch_archived_neighbour(logged_in, create_board):
+    board_id, (todo, _), cards = titled_board(
+        create_board, "Archived", ["A", "B"])
+    response = logged_in.post(f"/boards/{board_id}/cards:batch", json={
+        "operations": [
+            {"op": "archive", "card_id": cards["A"]["id"]},
+            {"op": "create", "column_id": todo["id"], "title": "New",
+             "prev_card_id": cards["A"]["id"]},
+        ]})
+    assert response.status_code == 400
+    assert response.json["message"] == (
+        "Operation 2: The cards to place this card between "
+        "must be other cards in the target column.")
+
+
+# Test case 8: Each kind of update writes only the columns it changes
+def test_card_batch_update_statements(logged_in, create_board):
+    board_id, (_, done), cards = titled_board(
+        create_board, "Bulk", ["A", "B", "C", "D"])
+    updates = []
+
+    def record_update(conn, cursor, statement, parameters, context,
+                      executemany):
+        if statement.startswith("UPDATE cards"):
+            updates.append(statement.split(" WHERE ")[0])
+
+    event.listen(db.engine, "before_cursor_execute", record_update)
+    try:
+        response = logged_in.post(f"/boards/{board_id}/cards:batch", json={
+            "operations": [
+                {"op": "update", "card_id": cards["A"]["id"],
+                 "title": "Renamed"},
+                {"op": "move", "card_id": cards["B"]["id"],
+                 "column_id": done["id"]},
+                {"op": "archive", "card_id": cards["C"]["id"]},
+                {"op": "update", "card_id": cards["D"]["id"],
+                 "title": "Renamed too"},
+            ]})
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record_update)
+    assert response.status_code == 200
+    assert len(updates) == 3
+    assert [statement.split(" SET ")[1].split("=")[0]
+            for statement in updates] == ["title", "column_id", "archived"]
+    move = updates[1]
+    assert "rank=" in move and "title" not in move \
+        and "description" not in move
+
+    board_data = read_board(logged_in, board_id)
+    assert sorted(card["title"] for card in board_data["cards"]) == [
+        "B", "Renamed", "Renamed too"]
+
+
+# Test case 9: Invalid neighbour ids are rejected before planning
+@pytest.mark.parametrize("key, neighbour", [
+    ("prev_card_id", ["a"]),
+    ("next_card_id", {"id": "a"}),
+    ("prev_card_id", "missing"),
+])
+def test_invalid_card_batch_neighbour(logged_in, board, key, neighbour):
+    todo, _ = board["columns"]
+    for op in ({"op": "create", "column_id": todo["id"], "title": "New"},
+               {"op": "move", "card_id": board["cards"][3]["id"]}):
+        response = logged_in.post(
+            f"/boards/{board['id']}/cards:batch",
+            json={"operations": [{**op, key: neighbour}]})
+        assert response.status_code == 400
+        assert response.json["message"] == (
+            "Operation 1: The cards to place this card between "
+            "must be other cards in the target column.")
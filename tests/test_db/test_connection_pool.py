@@ -0,0 +1,71 @@
+import sqlite3
+
+from app.db import InstrumentedQueuePool, get_engine_options, \
+    pool_checked_out, pool_checkout_seconds, pool_overflow
+
+
+# Test case 1: Pool checkouts, overflow and checked-out count are recorded
+def test_instrumented_pool_metrics():
+    pool = InstrumentedQueuePool(
+        lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=1)
+    checkouts_before = pool_checkout_seconds.count(engine="default")
+    overflow_before = pool_overflow.value(engine="default")
+
+    first = pool.connect()
+    second = pool.connect()
+    assert pool_checked_out.value(engine="default") == 2
+    assert pool_overflow.value(engine="default") == overflow_before + 1
+    assert pool_checkout_seconds.count(engine="default") == \
+        checkouts_before + 2
+
+    first.close()
+    second.close()
+    assert pool_checked_out.value(engine="default") == 0
+    pool.dispose()
+
+
+# Test case 2: Pool options come from config for non-SQLite databases
+def test_engine_options_from_config():
+    config = {
+        "SQLALCHEMY_ENGINE_OPTIONS": {"pool_size": 20},
+        "DB_POOL_SIZE": 5,
+        "DB_MAX_OVERFLOW": 0,
+        "DB_POOL_TIMEOUT": 30,
+        "DB_POOL_RECYCLE": 1800,
+        "DB_POOL_PRE_PING": True,
+    }
+
+    options = get_engine_options({
+        **config,
+        "SQLALCHEMY_DATABASE_URI": "postgresql://user@localhost/kanban"})
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 0
+    assert options["pool_pre_ping"] is True
+
+    options = get_engine_options({
+        **config, "SQLALCHEMY_DATABASE_URI": "sqlite:///data/app.db"})
+    assert options == {"pool_size": 20}
+
+
+# Test case 3: Each bind's pool reports under its own engine label
+def test_pool_metrics_per_engine():
+    pools = []
+    for label in ("default", "reports"):
+        pool = InstrumentedQueuePool(
+            lambda: sqlite3.connect(":memory:"), pool_size=2)
+        pool.engine_label = label
+        pools.append(pool)
+
+    connections = [pools[0].connect(), pools[1].connect(),
+                   pools[1].connect()]
+    assert pool_checked_out.value(engine="default") == 1
+    assert pool_checked_out.value(engine="reports") == 2
+    # a disposed engine's replacement pool keeps the label
+    assert pools[1].recreate().engine_label == "reports"
+
+    for connection in connections:
+        connection.close()
+    assert pool_checked_out.value(engine="reports") == 0
+    for pool in pools:
+        pool.dispose()
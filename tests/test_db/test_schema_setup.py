@@ -0,0 +1,101 @@
+from sqlalchemy import inspect, text
+
+from app import create_app
+from app.db import db
+from config import TestConfig, config
+
+
+def make_app(monkeypatch, tmp_path, create_all):
+    class SchemaConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = \
+            f"sqlite:///{tmp_path}/nested/schema.db"
+        DB_CREATE_ALL = create_all
+
+    monkeypatch.setitem(config, "schema", SchemaConfig)
+    return create_app("schema")
+
+
+def get_schema(app):
+    with app.app_context():
+        inspector = inspect(db.engine)
+        tables = set(inspector.get_table_names())
+        indexes = {index["name"] for index in inspector.get_indexes(
+            "sessions")} if "sessions" in tables else set()
+    return tables, indexes
+
+
+# Test case 1: Without DB_CREATE_ALL, starting the app creates nothing
+def test_startup_skips_create_all(monkeypatch, tmp_path):
+    app = make_app(monkeypatch, tmp_path, create_all=False)
+    # the directory of the database file is created on demand
+    assert (tmp_path / "nested").is_dir()
+    assert get_schema(app) == (set(), set())
+
+
+# Test case 2: "flask db create" creates the full schema once
+def test_db_create_command(monkeypatch, tmp_path):
+    app = make_app(monkeypatch, tmp_path, create_all=False)
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=["db", "create"])
+    assert result.exit_code == 0
+    assert "Created the database schema" in result.output
+
+    tables, indexes = get_schema(app)
+    assert {"users", "boards", "board_members", "cards", "cards_fts",
+            "sessions"} <= tables
+    assert "ix_sessions_expiry" in indexes
+    # running it again is harmless
+    assert runner.invoke(args=["db", "create"]).exit_code == 0
+
+    client = app.test_client()
+    client.post("/auth/register", json={
+        "username": "schema_user",
+        "email": "schema@example.com",
+        "password": "Password123",
+        "confirm_password": "Password123"
+    })
+    response = client.post("/auth/login", json={
+        "login_identifier": "schema_user",
+        "password": "Password123"
+    })
+    assert response.status_code == 200
+
+    with app.app_context():
+        db.drop_all()
+
+
+# Test case 3: "flask db create" upgrades a database with older tables
+def test_db_create_upgrades(monkeypatch, tmp_path):
+    app = make_app(monkeypatch, tmp_path, create_all=False)
+    with app.app_context():
+        # as created before the sessions expiry index existed
+        for name in ("users", "sessions"):
+            db.metadata.tables[name].create(db.engine)
+        db.session.execute(text("DROP INDEX ix_sessions_expiry"))
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["db", "create"])
+    assert result.exit_code == 0
+    tables, indexes = get_schema(app)
+    assert {"boards", "board_members", "cards", "cards_fts"} <= tables
+    assert "ix_sessions_expiry" in indexes
+
+    with app.app_context():
+        db.drop_all()
+
+
+# Test case 4: Columns missing from existing tables are reported
+def test_db_create_reports_missing_columns(monkeypatch, tmp_path):
+    app = make_app(monkeypatch, tmp_path, create_all=False)
+    with app.app_context():
+        db.session.execute(text(
+            "CREATE TABLE cards (id VARCHAR(64) PRIMARY KEY, "
+            "board_id VARCHAR(64), column_id VARCHAR(64), title TEXT, "
+            "description TEXT, rank VARCHAR(64), created_at DATETIME, "
+            "updated_at DATETIME)"))
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["db", "create"])
+    assert result.exit_code != 0
+    assert "must be added by hand: cards.archived, cards.search_id" in \
+        result.output
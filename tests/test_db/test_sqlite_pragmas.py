@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import text
+
+from app.auth.auth_models import User
+from app.db import db
+
+
+# Test case 1: Pragmas are applied to new SQLite connections
+def test_sqlite_pragmas_applied(test_client):
+    assert db.session.execute(
+        text("PRAGMA journal_mode")).scalar() == "wal"
+    assert db.session.execute(
+        text("PRAGMA busy_timeout")).scalar() == 5000
+    # NORMAL
+    assert db.session.execute(
+        text("PRAGMA synchronous")).scalar() == 1
+
+
+# Test case 2: Concurrent registrations against the file database
+def test_concurrent_registrations(test_client):
+    app = test_client.application
+
+    def register(i):
+        with app.test_client() as c:
+            response = c.post("/auth/register", json={
+                "username": f"concurrent_user{i}",
+                "email": f"concurrent{i}@example.com",
+                "password": "Password123",
+                "confirm_password": "Password123"
+            })
+            return response.status_code
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        status_codes = list(executor.map(register, range(40)))
+
+    assert status_codes == [201] * 40
+    assert User.query.filter(
+        User.username.like("concurrent_user%")).count() == 40
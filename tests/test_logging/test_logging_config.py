@@ -0,0 +1,123 @@
+import atexit
+import json
+import logging
+import threading
+import time
+
+from flask import Flask
+
+from logging_config import \
+    BackgroundQueueHandler, JsonFormatter, init_logging
+
+
+class SlowHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.unblocked = threading.Event()
+        self.messages = []
+
+    def emit(self, record):
+        self.unblocked.wait(5)
+        self.messages.append(self.format(record))
+
+
+def make_record(msg, args=None, **extra):
+    record = logging.LogRecord(
+        "app", logging.WARNING, __file__, 1, msg, args, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+# Test case 1: Logging returns before the slow handler has written
+def test_queue_handler_does_not_block():
+    target = SlowHandler()
+    handler = BackgroundQueueHandler([target])
+    try:
+        for i in range(3):
+            handler.handle(make_record("line %d", (i,)))
+        assert target.messages == []
+    finally:
+        target.unblocked.set()
+        handler.close()
+
+    # stopping writes out everything still queued, in order
+    assert target.messages == ["line 0", "line 1", "line 2"]
+
+
+# Test case 2: JSON lines carry the message and any extra fields
+def test_json_formatter():
+    line = JsonFormatter().format(
+        make_record("Slow request %s", ("auth.login",),
+                    slow_request={"duration_ms": 2000.0}))
+    entry = json.loads(line)
+
+    assert entry["level"] == "WARNING"
+    assert entry["message"] == "Slow request auth.login"
+    assert entry["slow_request"] == {"duration_ms": 2000.0}
+    assert "args" not in entry
+
+
+# Test case 3: Rotation size and format come from the config
+def test_init_logging(tmp_path, monkeypatch):
+    monkeypatch.setenv("ENV", "prod")
+    app = Flask("logging_test")
+    app.config.update(LOG_DIR=str(tmp_path), LOG_FORMAT="json",
+                      LOG_MAX_BYTES=1024, LOG_BACKUP_COUNT=2)
+    init_logging(app)
+    init_logging(app)
+    handlers = [handler for handler in app.logger.handlers
+                if isinstance(handler, BackgroundQueueHandler)]
+    assert len(handlers) == 1
+
+    file_handler = handlers[0].target_handlers[0]
+    assert file_handler.maxBytes == 1024
+    assert file_handler.backupCount == 2
+
+    app.logger.warning("Something happened", extra={"board_id": "b1"})
+    app.logger.removeHandler(handlers[0])
+    handlers[0].close()
+
+    lines = (tmp_path / "app.log").read_text().splitlines()
+    assert [json.loads(line)["message"] for line in lines] == [
+        "Application startup", "Application startup", "Something happened"]
+    assert json.loads(lines[-1])["board_id"] == "b1"
+
+
+# Test case 4: A full queue drops new records instead of growing
+def test_queue_handler_bounded():
+    target = SlowHandler()
+    handler = BackgroundQueueHandler([target], maxsize=2)
+    try:
+        handler.handle(make_record("line 0"))
+        # the writer thread holds the first record, the queue is empty
+        deadline = time.monotonic() + 5
+        while not handler.queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.001)
+        for i in range(1, 5):
+            handler.handle(make_record("line %d", (i,)))
+        assert handler.dropped == 2
+    finally:
+        target.unblocked.set()
+        handler.close()
+
+    assert target.messages == ["line 0", "line 1", "line 2"]
+
+
+# Test case 5: A closed handler stays closed and leaves no exit hook
+def test_queue_handler_closed(monkeypatch):
+    hooks = []
+    monkeypatch.setattr(atexit, "register", hooks.append)
+    monkeypatch.setattr(atexit, "unregister", hooks.remove)
+    target = SlowHandler()
+    target.unblocked.set()
+    handler = BackgroundQueueHandler([target])
+    handler.emit(make_record("before"))
+    assert hooks == [handler.stop]
+    handler.close()
+    assert hooks == []
+
+    handler.handle(make_record("too late"))
+    assert handler.listener is None
+    assert handler.dropped == 1
+    assert target.messages == ["before"]
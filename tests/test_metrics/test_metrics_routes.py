@@ -0,0 +1,57 @@
+from app import create_app
+from app.utils.metrics import MetricsRegistry
+from config import ProdConfig, TestConfig, config
+
+
+# Test case 1: Metrics are exported in Prometheus text format
+def test_metrics_endpoint(test_client):
+    with test_client as c:
+        response = c.get("/metrics")
+        assert response.status_code == 200
+        assert response.mimetype == "text/plain"
+        assert "# TYPE password_hash_seconds histogram" in response.text
+        assert "# TYPE db_pool_checked_out gauge" in response.text
+
+
+# Test case 2: Counters and histograms render with labels and buckets
+def test_metrics_render():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.")
+    latency = registry.histogram("latency_seconds", "Latency.", (0.1, 1.0))
+    requests.inc(endpoint='auth."login"')
+    latency.observe(0.5)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{endpoint="auth.\\"login\\""} 1',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 0',
+        'latency_seconds_bucket{le="1.0"} 1',
+        'latency_seconds_bucket{le="+Inf"} 1',
+        "latency_seconds_sum 0.5",
+        "latency_seconds_count 1",
+    ]
+
+
+# Test case 3: A configured token is required to read the metrics
+def test_metrics_token(monkeypatch):
+    class TokenConfig(TestConfig):
+        METRICS_TOKEN = "scrape-token"
+
+    monkeypatch.setitem(config, "metrics_token", TokenConfig)
+    client = create_app("metrics_token").test_client()
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={
+        "Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers={
+        "Authorization": "Bearer caf\u00e9"}).status_code == 401
+    assert client.get("/metrics", headers={
+        "Authorization": "Bearer scrape-token"}).status_code == 200
+
+
+# Test case 4: Production does not expose metrics unless asked to
+def test_metrics_disabled_in_prod():
+    assert ProdConfig.METRICS_ENABLED is False
@@ -0,0 +1,59 @@
+from app.metrics.request_metrics import \
+    RequestStats, http_request_seconds, http_request_sql_queries, \
+    http_request_sql_seconds, http_requests
+
+
+# Test case 1: Requests are counted and timed per endpoint
+def test_request_metrics_recorded(logged_in):
+    requests = http_requests.value(
+        endpoint="boards.index", method="GET", status="200")
+    timed = http_request_seconds.count(endpoint="boards.index")
+    queries = http_request_sql_queries.sum(endpoint="boards.index")
+
+    response = logged_in.get("/boards")
+    assert response.status_code == 200
+
+    assert http_requests.value(
+        endpoint="boards.index", method="GET", status="200") == requests + 1
+    assert http_request_seconds.count(endpoint="boards.index") == timed + 1
+    # at least the listing query itself
+    assert http_request_sql_queries.sum(endpoint="boards.index") > queries
+    assert http_request_sql_seconds.count(endpoint="boards.index") >= 1
+
+
+# Test case 2: Unknown urls share a single label
+def test_request_metrics_unmatched(test_client):
+    before = http_requests.value(
+        endpoint="unmatched", method="GET", status="404")
+    test_client.get("/no/such/page/1")
+    test_client.get("/no/such/page/2")
+    assert http_requests.value(
+        endpoint="unmatched", method="GET", status="404") == before + 2
+
+
+# Test case 3: Streamed board reads are recorded once the body is sent
+def test_request_metrics_streamed(logged_in):
+    board = logged_in.post("/boards", json={"name": "Streamed"}).json["board"]
+    timed = http_request_seconds.count(endpoint="boards.read")
+
+    response = logged_in.get(f"/boards/{board['id']}")
+    assert http_request_seconds.count(endpoint="boards.read") == timed
+    response.get_data()
+    assert http_request_seconds.count(endpoint="boards.read") == timed + 1
+
+
+# Test case 4: Request phases add up per name
+def test_request_stats_phases():
+    stats = RequestStats()
+    stats.add_phase("bcrypt", 0.25)
+    stats.add_phase("bcrypt", 0.5)
+    assert stats.phases == {"bcrypt": 0.75}
+
+
+# Test case 5: Request and bcrypt metrics are exported
+def test_request_metrics_exported(test_client):
+    text = test_client.get("/metrics").text
+    for name in ("http_requests_total", "http_request_duration_seconds",
+                 "http_request_sql_queries", "http_request_sql_seconds",
+                 "password_hash_seconds"):
+        assert f"# HELP {name} " in text
@@ -0,0 +1,122 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from app.metrics.request_profiler import StackSampler, list_profiles
+
+
+@pytest.fixture
+def profile_config(test_client, tmp_path):
+    config = test_client.application.config
+    keys = ("PROFILE_ENABLED", "PROFILE_SAMPLE_RATE", "PROFILE_MODE",
+            "PROFILE_TOKEN", "PROFILE_DIR", "PROFILE_MAX_FILES")
+    saved = {key: config[key] for key in keys}
+    config.update(PROFILE_TOKEN="secret", PROFILE_DIR=str(tmp_path))
+    yield config
+    config.update(saved)
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+# Test case 1: Requests are not profiled unless asked for
+def test_profiler_off_by_default(test_client, profile_config):
+    response = test_client.get("/metrics")
+    assert "X-Profile-Id" not in response.headers
+
+    response = test_client.get("/metrics", headers={"X-Profile": "wrong"})
+    assert "X-Profile-Id" not in response.headers
+
+    response = test_client.get("/metrics", headers={"X-Profile": "café"})
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert list_profiles(profile_config["PROFILE_DIR"]) == []
+
+
+# Test case 2: The header with the token profiles a single request
+def test_profiler_header(test_client, profile_config):
+    for mode in ("sampling", "cprofile"):
+        profile_config["PROFILE_MODE"] = mode
+        response = test_client.get(
+            "/metrics", headers={"X-Profile": "secret"})
+        name = response.headers["X-Profile-Id"]
+        assert "-metrics.export_metrics." in name
+        assert os.path.exists(
+            os.path.join(profile_config["PROFILE_DIR"], name))
+
+    assert [path.rsplit(".", 1)[1] for path in
+            list_profiles(profile_config["PROFILE_DIR"])] == [
+        "collapsed", "pstats"]
+
+
+# Test case 3: Sampled requests keep only the newest files
+def test_profiler_ring(test_client, profile_config):
+    profile_config.update(PROFILE_ENABLED=True, PROFILE_SAMPLE_RATE=1,
+                          PROFILE_MAX_FILES=2)
+    names = [test_client.get("/metrics").headers["X-Profile-Id"]
+             for _ in range(4)]
+
+    assert [os.path.basename(path) for path in
+            list_profiles(profile_config["PROFILE_DIR"])] == names[2:]
+
+
+# Test case 4: The sampler counts the stacks of the sampled thread
+def test_stack_sampler():
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_loop, args=(stop,))
+    thread.start()
+    sampler = StackSampler(thread.ident, 0.001)
+    sampler.start()
+    time.sleep(0.05)
+    stacks = sampler.stop()
+    stop.set()
+    thread.join()
+
+    assert stacks
+    assert all("test_request_profiler.busy_loop" in stack
+               for stack in stacks)
+
+
+# Test case 5: The CLI merges collapsed stacks across files
+def test_profile_aggregate_command(test_client, profile_config):
+    directory = profile_config["PROFILE_DIR"]
+    for name, lines in (("1-1-boards.read.collapsed", "a;b 2\na;c 1\n"),
+                        ("2-1-boards.read.collapsed", "a;b 3\n"),
+                        ("3-1-auth.login.collapsed", "x;y 5\n")):
+        with open(os.path.join(directory, name), "w") as f:
+            f.write(lines)
+
+    runner = test_client.application.test_cli_runner()
+    result = runner.invoke(
+        args=["profile", "aggregate", "--endpoint", "boards."])
+    assert result.exit_code == 0
+    assert result.stdout.splitlines() == ["a;b 5", "a;c 1"]
+
+    result = runner.invoke(args=["profile", "aggregate", "--pstats",
+                                 "--output", "merged.pstats"])
+    assert result.exit_code != 0
+
+
+# Test case 6: A profile that cannot be written still stops the profiler
+@pytest.mark.parametrize("mode", ["sampling", "cprofile"])
+def test_profiler_write_error(test_client, profile_config, tmp_path, mode):
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    profile_config.update(PROFILE_MODE=mode,
+                          PROFILE_DIR=str(blocker / "profiles"))
+    threads = threading.active_count()
+
+    response = test_client.get("/metrics", headers={"X-Profile": "secret"})
+    assert response.status_code == 200
+    assert sys.getprofile() is None
+    assert threading.active_count() == threads
+
+    # the next request can be profiled again
+    profile_config["PROFILE_DIR"] = str(tmp_path)
+    response = test_client.get("/metrics", headers={"X-Profile": "secret"})
+    assert "X-Profile-Id" in response.headers
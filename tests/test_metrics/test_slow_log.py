@@ -0,0 +1,92 @@
+import logging
+
+import pytest
+
+from app.metrics.slow_log import scrub_statement
+
+
+@pytest.fixture
+def slow_config(test_client):
+    config = test_client.application.config
+    saved = {key: config[key] for key in (
+        "SLOW_REQUEST_THRESHOLD", "SLOW_QUERY_THRESHOLD",
+        "SLOW_REQUEST_MAX_STATEMENTS")}
+    yield config
+    config.update(saved)
+
+
+def login(user_created):
+    # a separate client, so every call is a fresh login
+    client = user_created.application.test_client()
+    return client.post("/auth/login", json={
+        "login_identifier": "test_user",
+        "password": "Password123"
+    })
+
+
+def get_records(caplog, field):
+    return [getattr(record, field) for record in caplog.records
+            if hasattr(record, field)]
+
+
+# Test case 1: Logged statements are on one line without literals
+def test_scrub_statement():
+    assert scrub_statement(
+        "SELECT id FROM users\n  WHERE name = 'o''brien' AND id = ?") == \
+        "SELECT id FROM users WHERE name = '?' AND id = ?"
+
+
+# Test case 2: Slow requests are logged with statements and phases
+def test_slow_request_logged(user_created, slow_config, caplog):
+    slow_config["SLOW_REQUEST_THRESHOLD"] = 1e-9
+    logger = user_created.application.logger
+    with caplog.at_level(logging.WARNING, logger=logger.name):
+        assert login(user_created).status_code == 200
+
+    record = get_records(caplog, "slow_request")[-1]
+    assert record["endpoint"] == "auth.login"
+    assert record["status"] == "200"
+    assert record["sql_count"] == len(record["statements"]) >= 1
+    assert record["statements_dropped"] == 0
+    assert {"session_open", "dispatch", "session_save", "bcrypt"} <= \
+        set(record["phases_ms"])
+    # the username is a bound parameter, never part of the log
+    assert any("FROM users" in s["statement"] for s in record["statements"])
+    assert "test_user" not in str(record["statements"])
+
+
+# Test case 3: Fast requests are not logged
+def test_fast_request_not_logged(user_created, slow_config, caplog):
+    slow_config["SLOW_REQUEST_THRESHOLD"] = 60
+    slow_config["SLOW_QUERY_THRESHOLD"] = 60
+    logger = user_created.application.logger
+    with caplog.at_level(logging.WARNING, logger=logger.name):
+        login(user_created)
+
+    assert get_records(caplog, "slow_request") == []
+    assert get_records(caplog, "slow_query") == []
+
+
+# Test case 4: Captured statements are capped per request
+def test_slow_request_statements_capped(user_created, slow_config, caplog):
+    slow_config["SLOW_REQUEST_THRESHOLD"] = 1e-9
+    slow_config["SLOW_REQUEST_MAX_STATEMENTS"] = 1
+    logger = user_created.application.logger
+    with caplog.at_level(logging.WARNING, logger=logger.name):
+        login(user_created)
+
+    record = get_records(caplog, "slow_request")[-1]
+    assert len(record["statements"]) == 1
+    assert record["statements_dropped"] == record["sql_count"] - 1
+
+
+# Test case 5: Slow queries are logged one by one
+def test_slow_query_logged(user_created, slow_config, caplog):
+    slow_config["SLOW_QUERY_THRESHOLD"] = 1e-9
+    logger = user_created.application.logger
+    with caplog.at_level(logging.WARNING, logger=logger.name):
+        login(user_created)
+
+    records = get_records(caplog, "slow_query")
+    assert records
+    assert all(record["endpoint"] == "auth.login" for record in records)
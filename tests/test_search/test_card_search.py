@@ -0,0 +1,165 @@
+import pytest
+from sqlalchemy import text
+
+from app.db import db
+from app.search.search_backends import LikeSearchBackend
+
+
+@pytest.fixture(scope='module')
+def board(create_board):
+    yield create_board("Search", cards={"To do": [
+        {"title": "Write release notes",
+         "description": "Mention the login fix"},
+        {"title": "Fix login redirect",
+         "description": "Users land on a blank page"},
+        {"title": "Update logo", "description": "Use the new brand colours"},
+        {"title": "Café menu", "description": "Order lunch for the team"},
+    ]})
+
+
+def search(client, board_id, query, **params):
+    params["q"] = query
+    return client.get(f"/boards/{board_id}/cards/search",
+                      query_string=params)
+
+
+def titles(response):
+    return [card["title"] for card in response.json["cards"]]
+
+
+# Test case 1: Valid search ranks title matches above description matches
+def test_valid_search_ranked(logged_in, board):
+    response = search(logged_in, board["id"], "login")
+    assert response.status_code == 200
+    assert titles(response) == ["Fix login redirect", "Write release notes"]
+
+
+# Test case 2: Valid prefix and diacritic-insensitive search
+def test_valid_search_prefix(logged_in, board):
+    assert set(titles(search(logged_in, board["id"], "log*"))) == {
+        "Fix login redirect", "Write release notes", "Update logo"}
+    assert titles(search(logged_in, board["id"], "log")) == []
+    assert titles(search(logged_in, board["id"], "cafe")) == ["Café menu"]
+
+
+# Test case 3: The index follows card updates, archives and moves
+def test_valid_search_index_in_sync(logged_in, board):
+    cards = board["cards"]
+    logged_in.post(f"/boards/{board['id']}/cards:batch", json={
+        "operations": [
+            {"op": "update", "card_id": cards[2]["id"],
+             "title": "Update favicon"},
+            {"op": "archive", "card_id": cards[3]["id"]},
+            {"op": "move", "card_id": cards[1]["id"]},
+        ]})
+    assert titles(search(logged_in, board["id"], "logo")) == []
+    assert titles(search(logged_in, board["id"], "favicon")) == [
+        "Update favicon"]
+    assert titles(search(logged_in, board["id"], "cafe")) == []
+    assert "Fix login redirect" in titles(
+        search(logged_in, board["id"], "login"))
+    with db.engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO cards_fts(cards_fts) VALUES ('integrity-check')"))
+
+
+# Test case 4: Valid search results are paginated with cursors
+def test_valid_search_pages(logged_in, board):
+    first = search(logged_in, board["id"], "login", limit=1)
+    assert titles(first) == ["Fix login redirect"]
+    second = search(logged_in, board["id"], "login", limit=1,
+                    cursor=first.json["next_cursor"])
+    assert titles(second) == ["Write release notes"]
+    assert second.json["next_cursor"] is None
+
+
+# Test case 5: Invalid search queries
+@pytest.mark.parametrize("query, message", [
+    ("", "Please provide a search query."),
+    ("* ()", "The search query must contain a word."),
+])
+def test_invalid_search_query(logged_in, board, query, message):
+    response = search(logged_in, board["id"], query)
+    assert response.status_code == 400
+    assert response.json["message"] == message
+
+
+# Test case 6: Query syntax is never passed through to the backend
+def test_valid_search_ignores_syntax(logged_in, board):
+    response = search(logged_in, board["id"], 'login" OR NEAR(')
+    assert response.status_code == 200
+    assert titles(response) == []
+
+
+# Test case 7: The rebuild command restores a cleared index
+def test_valid_search_rebuild(logged_in, board):
+    with db.engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO cards_fts(cards_fts) VALUES ('delete-all')"))
+        # as for cards from before the index existed
+        connection.execute(text("UPDATE cards SET search_id = NULL"))
+    assert titles(search(logged_in, board["id"], "login")) == []
+
+    result = logged_in.application.test_cli_runner().invoke(
+        args=["search", "rebuild"])
+    assert result.exit_code == 0
+    assert result.output.startswith("Indexed ")
+    assert len(titles(search(logged_in, board["id"], "login"))) == 2
+
+
+# Test case 8: The LIKE fallback backend finds the same cards
+def test_valid_like_search_backend(logged_in, board):
+    query, _ = LikeSearchBackend().search_query(
+        board["id"], [("login", False)])
+    rows = db.session.execute(query).all()
+    assert {row.title for row in rows} == {
+        "Fix login redirect", "Write release notes"}
+
+
+# Test case 9: The index does not depend on the cards' rowids, which
+# VACUUM may renumber
+def test_valid_search_rowid_renumbered(logged_in, board):
+    url = f"/boards/{board['id']}/columns/{board['columns'][0]['id']}/cards"
+    card = logged_in.post(
+        url, json={"title": "Vacuum the login page"}).json["card"]
+    with db.engine.begin() as connection:
+        connection.execute(text(
+            "UPDATE cards SET rowid = rowid + 1000 WHERE id = :id"),
+            {"id": card["id"]})
+        connection.execute(text(
+            "INSERT INTO cards_fts(cards_fts) VALUES ('integrity-check')"))
+
+    assert titles(search(logged_in, board["id"], "vacuum")) == [
+        "Vacuum the login page"]
+    logged_in.post(f"/boards/{board['id']}/cards:batch", json={
+        "operations": [{"op": "update", "card_id": card["id"],
+                        "title": "Sweep the login page"}]})
+    assert titles(search(logged_in, board["id"], "vacuum")) == []
+    assert titles(search(logged_in, board["id"], "sweep")) == [
+        "Sweep the login page"]
+
+
+# Test case 10: Writes to other cards between pages neither skip nor
+# repeat results
+def test_valid_search_pages_stable(logged_in, board):
+    url = f"/boards/{board['id']}/columns/{board['columns'][0]['id']}/cards"
+    for i in range(3):
+        logged_in.post(url, json={"title": f"Login step {i}"})
+    expected = [card["id"] for card in
+                search(logged_in, board["id"], "login").json["cards"]]
+
+    seen = []
+    response = search(logged_in, board["id"], "login", limit=2)
+    # each page adds at most one card, so the pages have to run out
+    for _ in range(len(expected)):
+        seen += [card["id"] for card in response.json["cards"]]
+        if response.json["next_cursor"] is None:
+            break
+        # changes the term's frequency across the index, and so every
+        # card's bm25 score
+        logged_in.post(url, json={"title": "Other", "description": "login"})
+        response = search(logged_in, board["id"], "login", limit=2,
+                          cursor=response.json["next_cursor"])
+    assert response.json["next_cursor"] is None
+    assert [card_id for card_id in seen if card_id in expected] == expected
+    assert len(set(seen)) == len(seen)
@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from app import create_app
+from app.sessions.session_backends import \
+    MemorySessionStore, MemorySessionInterface, init_sessions
+
+
+def create_session_app(session_type):
+    app = create_app('test')
+    app.secret_key = "test-secret-key"
+    app.config["SESSION_TYPE"] = session_type
+    init_sessions(app)
+    return app
+
+
+@pytest.fixture(scope='module')
+def registered_user(test_client):
+    test_client.post('/auth/register', json={
+        'username': 'session_user',
+        'email': 'session@example.com',
+        'password': 'Password123',
+        'confirm_password': 'Password123'
+    })
+    yield
+
+
+# Test case 1: Memory store evicts the least recently used session
+def test_memory_store_evicts_least_recently_used():
+    store = MemorySessionStore(maxsize=2)
+    expires_at = time.time() + 60
+    store.set("a", {"id": "a"}, expires_at)
+    store.set("b", {"id": "b"}, expires_at)
+    store.get("a")
+    store.set("c", {"id": "c"}, expires_at)
+    assert store.get("b") is None
+    assert store.get("a") == {"id": "a"}
+    assert len(store) == 2
+
+
+# Test case 2: Memory store drops expired sessions
+def test_memory_store_expires_sessions():
+    store = MemorySessionStore(maxsize=2)
+    store.set("a", {"id": "a"}, time.time() - 1)
+    assert store.get("a") is None
+    assert len(store) == 0
+
+
+# Test case 3: Login and logout with each session backend
+@pytest.mark.parametrize("session_type", ["memory", "cookie"])
+def test_login_logout_with_session_backend(registered_user, session_type):
+    app = create_session_app(session_type)
+    if session_type == "memory":
+        assert isinstance(app.session_interface, MemorySessionInterface)
+
+    with app.test_client() as c:
+        response = c.post("/auth/login", json={
+            "login_identifier": "session_user",
+            "password": "Password123"
+        })
+        assert response.status_code == 200
+        with c.session_transaction() as sess:
+            assert "id" in sess
+
+        response = c.get("/auth/logout")
+        assert response.status_code == 200
+
+        response = c.get("/auth/logout")
+        assert response.status_code == 401
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from app import create_app
+from app.db import db
+from app.sessions.session_backends import init_sessions
+from app.sessions.session_sweeper import \
+    get_session_table, sweep_expired_sessions, sweep_sessions, utcnow
+
+
+def insert_sessions(table, expiries, prefix="sweep"):
+    db.session.execute(table.insert(), [
+        {"session_id": f"session:{prefix}{i}", "data": b"", "expiry": expiry}
+        for i, expiry in enumerate(expiries)])
+    db.session.commit()
+
+
+# Test case 1: Expired sessions are deleted in batches
+def test_sweep_expired_sessions(test_client):
+    table = get_session_table(test_client.application)
+    assert "ix_sessions_expiry" in {index.name for index in table.indexes}
+
+    now = utcnow()
+    insert_sessions(table, [
+        now - timedelta(seconds=1),
+        now - timedelta(days=1),
+        now - timedelta(days=2),
+        None,
+        now + timedelta(days=1)])
+
+    removed, elapsed = sweep_expired_sessions(table, batch_size=2)
+    assert removed == 4
+    assert elapsed >= 0
+    remaining = db.session.execute(table.select()).all()
+    assert [row.session_id for row in remaining] == ["session:sweep4"]
+
+
+# Test case 2: Sweep CLI command reports rows removed
+def test_sweep_command(test_client):
+    table = get_session_table(test_client.application)
+    insert_sessions(table, [utcnow() - timedelta(seconds=1)])
+
+    runner = test_client.application.test_cli_runner()
+    result = runner.invoke(args=["sessions", "sweep", "--batch-size", "10"])
+    assert result.exit_code == 0
+    assert "Removed 1 expired sessions" in result.output
+
+
+# Test case 3: Sessions with a buffered expiry refresh are not swept
+def test_sweep_keeps_pending_touches(test_client):
+    app = create_app('test')
+    app.config["SESSION_TOUCH_FRACTION"] = 0.5
+    app.config["SESSION_TOUCH_FLUSH_INTERVAL"] = 3600
+    init_sessions(app)
+    interface = app.session_interface
+    table = get_session_table(app)
+
+    now = utcnow()
+    with app.app_context():
+        insert_sessions(table, [
+            # refreshed here, but not yet written
+            now - timedelta(seconds=1),
+            # possibly refreshed by another process
+            now - timedelta(minutes=1),
+            now - timedelta(days=2)], prefix="touched")
+        interface._pending["session:touched0"] = now + timedelta(days=1)
+
+        removed, _ = sweep_sessions(app, table, batch_size=10)
+        assert removed == 1
+        remaining = db.session.execute(
+            table.select().where(table.c.session_id.like("session:touched%"))
+            .order_by(table.c.session_id)).all()
+    assert [row.session_id for row in remaining] == [
+        "session:touched0", "session:touched1"]
+    assert remaining[0].expiry > now
+    assert interface._pending == {}
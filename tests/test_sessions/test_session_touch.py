@@ -0,0 +1,144 @@
+import time
+from datetime import timedelta
+
+import pytest
+
+from app import create_app
+from app.sessions.session_backends import \
+    BufferedSqlAlchemySessionInterface, init_sessions, utcnow
+
+
+@pytest.fixture(scope='module')
+def touch_app(test_client):
+    app = create_app('test')
+    app.config["SESSION_TOUCH_FRACTION"] = 0.5
+    app.config["SESSION_TOUCH_FLUSH_INTERVAL"] = 3600
+    init_sessions(app)
+
+    client = app.test_client()
+    client.post('/auth/register', json={
+        'username': 'touch_user',
+        'email': 'touch@example.com',
+        'password': 'Password123',
+        'confirm_password': 'Password123'
+    })
+    client.post('/auth/login', json={
+        'login_identifier': 'touch_user',
+        'password': 'Password123'
+    })
+    yield app, client
+
+
+def get_record(app):
+    interface = app.session_interface
+    with app.app_context():
+        return interface.sql_session_model.query.one()
+
+
+def authenticated_request(client):
+    # a rejected register does not modify the session
+    response = client.post('/auth/register', json={})
+    assert response.status_code == 400
+
+
+# Test case 1: Session touch mode is selected from config
+def test_session_touch_interface(touch_app):
+    app, _ = touch_app
+    assert isinstance(
+        app.session_interface, BufferedSqlAlchemySessionInterface)
+
+
+# Test case 2: Fresh sessions are not rewritten on read-only requests
+def test_session_touch_skipped_before_fraction(touch_app):
+    app, client = touch_app
+    expiry = get_record(app).expiry
+
+    authenticated_request(client)
+
+    assert get_record(app).expiry == expiry
+    assert app.session_interface._pending == {}
+
+
+# Test case 3: Stale sessions are touched in one batched update
+def test_session_touch_batched_after_fraction(touch_app):
+    app, client = touch_app
+    interface = app.session_interface
+    lifetime = app.permanent_session_lifetime
+    with app.app_context():
+        record = interface.sql_session_model.query.one()
+        record.expiry = utcnow() + lifetime * 0.4
+        interface.db.session.commit()
+    stale_expiry = get_record(app).expiry
+
+    authenticated_request(client)
+    assert get_record(app).expiry == stale_expiry
+    assert len(interface._pending) == 1
+
+    with app.app_context():
+        assert interface.flush() == 1
+    new_expiry = get_record(app).expiry
+    assert new_expiry > stale_expiry
+    assert new_expiry > utcnow() + lifetime - timedelta(minutes=1)
+    assert interface._pending == {}
+
+
+# Test case 4: Browser sessions are saved like the parent interface does
+def test_session_touch_browser_session(touch_app):
+    app, client = touch_app
+    interface = app.session_interface
+    lifetime = app.permanent_session_lifetime
+    with app.app_context():
+        record = interface.sql_session_model.query.one()
+        data = interface.serializer.loads(record.data)
+        data.pop("_permanent", None)
+        record.data = interface.serializer.dumps(data)
+        record.expiry = utcnow() + lifetime * 0.4
+        interface.db.session.commit()
+
+    authenticated_request(client)
+    assert interface._pending == {}
+
+
+# Test case 5: Pending touches are written by a background thread
+def test_session_touch_flushed_in_background(test_client):
+    app = create_app('test')
+    app.config["SESSION_TOUCH_FRACTION"] = 0.5
+    app.config["SESSION_TOUCH_FLUSH_INTERVAL"] = 0.05
+    init_sessions(app)
+    interface = app.session_interface
+
+    client = app.test_client()
+    client.post('/auth/register', json={
+        'username': 'flush_user',
+        'email': 'flush@example.com',
+        'password': 'Password123',
+        'confirm_password': 'Password123'
+    })
+    client.post('/auth/login', json={
+        'login_identifier': 'flush_user',
+        'password': 'Password123'
+    })
+    store_id = "session:" + client.get_cookie("session").value
+
+    def get_record_for_client():
+        return interface.sql_session_model.query.filter_by(
+            session_id=store_id).one()
+
+    def get_expiry():
+        with app.app_context():
+            return get_record_for_client().expiry
+
+    lifetime = app.permanent_session_lifetime
+    with app.app_context():
+        get_record_for_client().expiry = utcnow() + lifetime * 0.4
+        interface.db.session.commit()
+
+    authenticated_request(client)
+
+    # the request itself never waits on the batched write
+    deadline = time.monotonic() + 5
+    while get_expiry() < utcnow() + lifetime * 0.5 and \
+            time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert get_expiry() > utcnow() + lifetime - timedelta(minutes=1)
+    assert interface._pending == {}
@@ -0,0 +1,44 @@
+import pytest
+from flask import Flask
+
+from app.boards.board_models import Board, Card
+from app.exceptions.custom_exceptions import ValidationError
+from app.utils.pagination import \
+    decode_cursor, encode_cursor, get_page_size, MAX_PAGE_SIZE
+
+
+@pytest.fixture
+def app_context():
+    app = Flask(__name__)
+    app.secret_key = "test-secret-key"
+    with app.app_context():
+        yield
+
+
+# Test case 1: Cursors round-trip their sort key values
+def test_cursor_round_trip(app_context):
+    columns = (Card.rank, Card.id)
+    cursor = encode_cursor(columns, ["V", "card-id"])
+    assert decode_cursor(cursor, columns) == ["V", "card-id"]
+
+
+# Test case 2: Tampered or foreign cursors are rejected
+def test_cursor_invalid(app_context):
+    cursor = encode_cursor((Card.rank, Card.id), ["V", "card-id"])
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor[:-2] + "xx", (Card.rank, Card.id))
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor, (Card.rank, Card.id), descending=True)
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor, (Board.name, Board.id))
+    with pytest.raises(ValidationError):
+        decode_cursor("not-a-cursor", (Card.rank, Card.id))
+
+
+# Test case 3: Page sizes are bounded
+def test_get_page_size():
+    assert get_page_size(None) == 50
+    assert get_page_size("10") == 10
+    for limit in ("0", "abc", str(MAX_PAGE_SIZE + 1)):
+        with pytest.raises(ValidationError):
+            get_page_size(limit)
@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from app.utils.ranking import \
+    rank_after, rank_between, rank_range, rank_sequence
+
+
+# Test case 1: Keys inserted at random positions stay ordered
+def test_rank_between_random_inserts():
+    rng = random.Random(42)
+    ranks = []
+    for _ in range(2000):
+        i = rng.randint(0, len(ranks))
+        before = ranks[i - 1] if i > 0 else None
+        after = ranks[i] if i < len(ranks) else None
+        rank = rank_between(before, after)
+        assert before is None or before < rank
+        assert after is None or rank < after
+        assert not rank.endswith("0")
+        ranks.insert(i, rank)
+    assert ranks == sorted(ranks)
+
+
+# Test case 2: Neighbours must be in order
+def test_rank_between_invalid_order():
+    with pytest.raises(ValueError):
+        rank_between("b", "a")
+    with pytest.raises(ValueError):
+        rank_between("a", "a")
+
+
+# Test case 3: Evenly spaced keys are short, unique and ascending
+@pytest.mark.parametrize("count", [0, 1, 61, 62, 1000, 50000])
+def test_rank_sequence(count):
+    ranks = rank_sequence(count)
+    assert len(set(ranks)) == count
+    assert ranks == sorted(ranks)
+    assert all(rank and not rank.endswith("0") for rank in ranks)
+    assert all(len(rank) <= 4 for rank in ranks)
+
+
+# Test case 4: Keys for many cards in one gap grow logarithmically
+def test_rank_range():
+    ranks = rank_range("V", "W", 500)
+    assert len(set(ranks)) == 500
+    assert ranks == sorted(ranks)
+    assert "V" < ranks[0] and ranks[-1] < "W"
+    assert all(len(rank) <= 5 for rank in ranks)
+    assert rank_range("V", "W", 0) == []
+
+
+# Test case 5: Appended keys grow by one digit per 61 appends
+def test_rank_after_appends():
+    ranks = [rank_after()]
+    for _ in range(1000):
+        ranks.append(rank_after(ranks[-1]))
+    assert len(set(ranks)) == len(ranks)
+    assert ranks == sorted(ranks)
+    assert all(not rank.endswith("0") for rank in ranks)
+    assert max(len(rank) for rank in ranks) <= 1 + 1000 // 61
+    assert rank_after("zz") == "zz1"
+    assert rank_after("Vzz") == "W"
@@ -0,0 +1,27 @@
+import time
+
+from app.utils.ttl_cache import TTLCache
+
+
+# Test case 1: The cache evicts the least recently used entry
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2)
+    expires_at = time.time() + 60
+    cache.set("a", 1, expires_at)
+    cache.set("b", 2, expires_at)
+    cache.get("a")
+    cache.set("c", 3, expires_at)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert len(cache) == 2
+
+
+# Test case 2: The cache drops expired and deleted entries
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1, time.time() - 1)
+    cache.set("b", 2, time.time() + 60)
+    cache.delete("b")
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert len(cache) == 0
@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+from app.utils.validators import \
+    EMAIL_MAX_LENGTH, is_valid_email, is_valid_username, is_valid_password
+
+
+# Test case 1: Valid and invalid email addresses
+@pytest.mark.parametrize("email, valid", [
+    ("test@example.com", True),
+    ("first.last-name_1@mail.example.co", True),
+    ("test@examplecom", False),
+    ("xxxx@xxxxxxx", False),
+    ("-test@example.com", False),
+    ("test@example.c", False),
+    ("test@example.com\n", False),
+    ("a" * (EMAIL_MAX_LENGTH - 12) + "@example.com", True),
+    ("a" * (EMAIL_MAX_LENGTH - 11) + "@example.com", False),
+])
+def test_is_valid_email(email, valid):
+    assert is_valid_email(email) is valid
+
+
+# Test case 2: Username and password patterns
+def test_is_valid_username_and_password():
+    assert is_valid_username("test_user.1")
+    assert not is_valid_username("test_user@")
+    assert is_valid_password("Password123")
+    assert not is_valid_password("password123")
+    assert not is_valid_password("Password 123")
+
+
+# Test case 3: Adversarial inputs are rejected in bounded time
+@pytest.mark.parametrize("email", [
+    "a" * 5000 + "!",
+    "a" * 240 + "!",
+    "a@" + "a." * 120 + "!",
+    "a-" * 120 + "@example.com!",
+    "a@" + "a-" * 120 + ".comcomcomcom",
+])
+def test_is_valid_email_adversarial(email):
+    start = time.perf_counter()
+    assert not is_valid_email(email)
+    assert time.perf_counter() - start < 0.01